@@ -0,0 +1,14 @@
+"""Fixtures for the benchmarks."""
+
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+
+@pytest.fixture
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Returns an event loop to run coroutines from synchronous benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
@@ -0,0 +1,212 @@
+"""Fleet scale scenarios driving a LinkPlayController against simulated devices.
+
+Run with: python -m benchmarks.fleet --bridges 200 --mode polling
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from linkplay.bridge import LinkPlayMultiroom
+from linkplay.controller import LinkPlayController
+from linkplay.exceptions import LinkPlayException
+from linkplay.instrumentation import (
+    LinkPlayInstrumentation,
+    LinkPlayRequestMetrics,
+    LinkPlayRequestStats,
+)
+from linkplay.simulator import LinkPlaySimulator
+from linkplay.utils import async_create_unverified_client_session
+
+MODES = ("polling", "grouping", "scenes")
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.lag = LinkPlayRequestMetrics()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag.record(max(0.0, loop.time() - start - self.interval))
+
+
+async def _gather(calls: list[Awaitable[Any]]) -> int:
+    """Runs the calls concurrently, returns the number of failed calls."""
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    return sum(isinstance(result, LinkPlayException) for result in results)
+
+
+async def poll_cycle(controller: LinkPlayController, rng: random.Random) -> int:
+    """Polls the player status of every bridge."""
+    return await _gather(
+        [bridge.player.update_status() for bridge in controller.bridges]
+    )
+
+
+async def grouping_cycle(controller: LinkPlayController, rng: random.Random) -> int:
+    """Groups random bridges, discovers the multirooms and ungroups them again."""
+    bridges = list(controller.bridges)
+    rng.shuffle(bridges)
+    leaders = bridges[: max(1, len(bridges) // 8)]
+    followers = bridges[len(leaders) :]
+    multirooms = [LinkPlayMultiroom(leader) for leader in leaders]
+    errors = await _gather(
+        [
+            multirooms[index % len(multirooms)].add_follower(follower)
+            for index, follower in enumerate(followers)
+        ]
+    )
+
+    await controller.discover_multirooms()
+    errors += await _gather(
+        [multiroom.ungroup() for multiroom in controller.multirooms]
+    )
+    await controller.discover_multirooms()
+    return errors
+
+
+async def scene_cycle(controller: LinkPlayController, rng: random.Random) -> int:
+    """Applies a scene setting the volume and playback of every bridge."""
+    volume = rng.randrange(10, 60)
+    errors = await _gather(
+        [bridge.player.set_volume(volume) for bridge in controller.bridges]
+    )
+    errors += await _gather([bridge.player.resume() for bridge in controller.bridges])
+    return errors + await poll_cycle(controller, rng)
+
+
+CYCLES: dict[str, Callable[[LinkPlayController, random.Random], Awaitable[int]]] = {
+    "polling": poll_cycle,
+    "grouping": grouping_cycle,
+    "scenes": scene_cycle,
+}
+
+
+def _percentiles(metrics: LinkPlayRequestMetrics) -> dict[str, float | None]:
+    return {
+        f"p{int(percentile * 100)}": metrics.percentile(percentile)
+        for percentile in (0.5, 0.9, 0.99)
+    } | {"max": max(metrics.latencies, default=None)}
+
+
+async def run_scenario(
+    *,
+    bridges: int,
+    mode: str,
+    cycles: int,
+    interval: float,
+    latency: float,
+    jitter: float,
+    failure_rate: float,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Runs the scenario and returns its report."""
+    rng = random.Random(seed)
+    simulator = LinkPlaySimulator(seed=seed)
+    simulator.add_devices(
+        bridges, latency=latency, jitter=jitter, failure_rate=failure_rate
+    )
+    instrumentation = LinkPlayInstrumentation()
+    stats = LinkPlayRequestStats()
+    cycle_times = LinkPlayRequestMetrics()
+    monitor = EventLoopLagMonitor()
+    errors = 0
+    overruns = 0
+
+    async with simulator:
+        session = await async_create_unverified_client_session()
+        try:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            controller = LinkPlayController(session)
+            for bridge in await simulator.bridges(
+                session, instrumentation=instrumentation
+            ):
+                await controller.add_bridge(bridge)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            memory = sum(
+                stat.size_diff for stat in after.compare_to(before, "filename")
+            )
+
+            instrumentation.add_request_end_hook(stats)
+            monitor.start()
+            start = time.perf_counter()
+            for _ in range(cycles):
+                cycle_start = time.perf_counter()
+                errors += await CYCLES[mode](controller, rng)
+                cycle_time = time.perf_counter() - cycle_start
+                cycle_times.record(cycle_time)
+                if cycle_time > interval:
+                    overruns += 1
+                else:
+                    await asyncio.sleep(interval - cycle_time)
+            duration = time.perf_counter() - start
+            await monitor.stop()
+        finally:
+            await session.close()
+
+    requests = sum(metrics.count for metrics in stats.endpoints.values())
+    return {
+        "mode": mode,
+        "bridges": bridges,
+        "cycles": cycles,
+        "requests_per_second": requests / duration,
+        "errors": errors,
+        "cycle_overruns": overruns,
+        "cycle_time": _percentiles(cycle_times),
+        "event_loop_lag": _percentiles(monitor.lag),
+        "memory_per_bridge": memory / bridges,
+        "slowest_bridges": stats.slowest_endpoints()[:5],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bridges", type=int, default=100)
+    parser.add_argument("--mode", choices=MODES, default="polling")
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.03)
+    parser.add_argument("--failure-rate", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=1)
+    arguments = parser.parse_args()
+
+    report = asyncio.run(
+        run_scenario(
+            bridges=arguments.bridges,
+            mode=arguments.mode,
+            cycles=arguments.cycles,
+            interval=arguments.interval,
+            latency=arguments.latency,
+            jitter=arguments.jitter,
+            failure_rate=arguments.failure_rate,
+            seed=arguments.seed,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
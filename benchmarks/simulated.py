@@ -0,0 +1,48 @@
+"""In process simulated bridges for the benchmarks."""
+
+import asyncio
+import json
+
+from linkplay.bridge import LinkPlayBridge
+from linkplay.endpoint import LinkPlayEndpoint
+from linkplay.exceptions import LinkPlayInvalidDataException, LinkPlayRequestException
+from linkplay.simulator import LinkPlaySimulatedDevice, LinkPlaySimulator
+
+
+class SimulatedDeviceEndpoint(LinkPlayEndpoint):
+    """Answers requests from a simulated device in process, without any I/O."""
+
+    def __init__(self, device: LinkPlaySimulatedDevice):
+        self.device = device
+
+    def to_dict(self):
+        """Return the state of the LinkPlayEndpoint"""
+        return {"endpoint": self.device.ip}
+
+    async def request(self, command: str) -> None:
+        if self.device.handle(command) != "OK":
+            raise LinkPlayRequestException(f"Didn't receive expected OK from {self}")
+
+    async def json_request(self, command: str) -> dict[str, str]:
+        response = self.device.handle(command)
+        try:
+            return json.loads(response)  # type: ignore[no-any-return]
+        except json.JSONDecodeError as exc:
+            raise LinkPlayInvalidDataException(data=response) from exc
+
+    def __str__(self) -> str:
+        return self.device.ip
+
+
+def simulated_bridges(
+    loop: asyncio.AbstractEventLoop, simulator: LinkPlaySimulator
+) -> list[LinkPlayBridge]:
+    """Returns bridges answered in process by the devices of the simulator."""
+    bridges = [
+        LinkPlayBridge(endpoint=SimulatedDeviceEndpoint(device))
+        for device in simulator.devices
+    ]
+    for bridge in bridges:
+        loop.run_until_complete(bridge.device.update_status())
+        loop.run_until_complete(bridge.player.update_status())
+    return bridges
@@ -0,0 +1,52 @@
+"""Benchmarks of exporting the state of a fleet of bridges."""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from linkplay.bridge import LinkPlayBridge
+from linkplay.consts import INTERNED_DEVICE_ATTRIBUTES, LinkPlayCommand
+from linkplay.controller import LinkPlayController
+from linkplay.simulator import LinkPlaySimulator
+from linkplay.utils import compact_properties, fixup_player_properties
+
+FIELDS = ["uuid", "name", "device.RSSI", "player.vol", "player.Title"]
+
+
+@pytest.fixture(name="controller")
+def fixture_controller() -> LinkPlayController:
+    simulator = LinkPlaySimulator(seed=1)
+    controller = LinkPlayController(MagicMock())
+    for device in simulator.add_devices(1000):
+        bridge = LinkPlayBridge(endpoint=MagicMock())
+        bridge.device.properties = compact_properties(
+            json.loads(device.handle(LinkPlayCommand.DEVICE_STATUS)),
+            INTERNED_DEVICE_ATTRIBUTES,
+        )
+        bridge.player.properties = compact_properties(
+            fixup_player_properties(
+                json.loads(device.handle(LinkPlayCommand.PLAYER_STATUS))
+            )
+        )
+        controller.bridges.append(bridge)
+    return controller
+
+
+def test_export_columns(benchmark, controller):
+    """Exporting five fields of 1,000 bridges as columns."""
+    columns = benchmark(controller.export_columns, FIELDS)
+    assert len(columns["uuid"]) == 1000
+
+
+def test_export_records(benchmark, controller):
+    """Exporting five fields of 1,000 bridges as newline-delimited JSON."""
+    count = benchmark(lambda: controller.export_records(FIELDS, io.StringIO()))
+    assert count == 1000
+
+
+def test_to_dict(benchmark, controller):
+    """Building the nested state of 1,000 bridges, for comparison."""
+    states = benchmark(lambda: [bridge.to_dict() for bridge in controller.bridges])
+    assert len(states) == 1000
@@ -0,0 +1,23 @@
+"""Smoke test of the fleet scenarios."""
+
+import pytest
+
+from .fleet import MODES, run_scenario
+
+
+@pytest.mark.parametrize("mode", MODES)
+async def test_fleet_scenario(mode):
+    """Runs a single cycle of the scenario on a small fleet."""
+    report = await run_scenario(
+        bridges=8,
+        mode=mode,
+        cycles=1,
+        interval=0,
+        latency=0,
+        jitter=0.001,
+        failure_rate=0,
+    )
+
+    assert report["errors"] == 0
+    assert report["requests_per_second"] > 0
+    assert report["cycle_time"]["p50"] is not None
@@ -0,0 +1,112 @@
+"""Benchmarks of parsing responses and building requests."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from linkplay.commands import get_command_urls
+from linkplay.consts import LinkPlayCommand
+from linkplay.simulator import LinkPlaySimulator
+from linkplay.utils import (
+    call_tcpuart,
+    decode_hexstr,
+    fixup_player_properties,
+    session_call_api_json,
+)
+
+from .simulated import simulated_bridges
+
+DEVICE = LinkPlaySimulator().add_device()
+PLAYER_STATUS = json.loads(DEVICE.handle(LinkPlayCommand.PLAYER_STATUS))
+DEVICE_STATUS = DEVICE.handle(LinkPlayCommand.DEVICE_STATUS)
+
+
+class _Response:
+    status = 200
+
+    async def text(self) -> str:
+        return DEVICE_STATUS
+
+
+class _Session:
+    async def get(self, url: str) -> _Response:
+        return _Response()
+
+
+def test_decode_hexstr(benchmark):
+    """Decoding a hex encoded title."""
+    result = benchmark(decode_hexstr, PLAYER_STATUS["Title"])
+    assert result == "Track 0"
+
+
+@pytest.mark.parametrize("decode_cache", [False, True], ids=["uncached", "cached"])
+def test_fixup_player_properties(benchmark, decode_cache):
+    """Fixing up a player status, with and without a per player decode cache."""
+    cache = {} if decode_cache else None
+    result = benchmark(lambda: fixup_player_properties(dict(PLAYER_STATUS), cache))
+    assert result["Title"] == "Track 0"
+
+
+def test_session_call_api_json(benchmark, loop):
+    """Requesting and parsing a device status through an in-memory session."""
+    session = _Session()
+    result = benchmark(
+        lambda: loop.run_until_complete(
+            session_call_api_json(
+                "http://1.2.3.4", session, LinkPlayCommand.DEVICE_STATUS
+            )
+        )
+    )
+    assert result["uuid"] == DEVICE.uuid
+
+
+def test_call_tcpuart(benchmark, loop):
+    """Building a TCPUART frame and reading the response."""
+    reader = asyncio.StreamReader(loop=loop)
+    writer = MagicMock()
+
+    def call() -> str:
+        reader.feed_data(b"OK")
+        return loop.run_until_complete(
+            call_tcpuart(reader, writer, LinkPlayCommand.PLAYER_STATUS)
+        )
+
+    assert benchmark(call) == "b'OK'"
+
+
+def test_player_properties(benchmark, loop):
+    """Reading all properties of a player."""
+    simulator = LinkPlaySimulator()
+    simulator.add_device()
+    player = simulated_bridges(loop, simulator)[0].player
+
+    def read() -> tuple:
+        return (
+            player.muted,
+            player.volume,
+            player.title,
+            player.artist,
+            player.album,
+            player.status,
+            player.equalizer_mode,
+            player.loop_mode,
+            player.play_mode,
+            player.current_position,
+            player.total_length,
+        )
+
+    assert benchmark(read)[2] == "Track 0"
+
+
+@pytest.mark.parametrize(
+    "command",
+    [LinkPlayCommand.PLAYER_STATUS, "setPlayerCmd:play:http://host/a b.mp3?x=1&y=2"],
+    ids=["constant", "parameter"],
+)
+def test_command_url(benchmark, command):
+    """Building the request URL of a command."""
+    urls = get_command_urls("http://1.2.3.4")
+    result = benchmark(urls.url, command)
+    assert result.host == "1.2.3.4"
@@ -0,0 +1,49 @@
+"""Benchmarks of polling devices and discovering multirooms."""
+
+import asyncio
+
+import pytest
+
+from linkplay.controller import LinkPlayController
+from linkplay.simulator import LinkPlaySimulator
+from linkplay.utils import async_create_unverified_client_session
+
+from .simulated import simulated_bridges
+
+
+@pytest.mark.parametrize("group_size", [1, 4, 16])
+def test_discover_multirooms(benchmark, loop, group_size):
+    """Discovering the multirooms of 64 devices grouped by group_size."""
+    simulator = LinkPlaySimulator()
+    devices = simulator.add_devices(64)
+    for index in range(0, len(devices), group_size):
+        simulator.group(devices[index], devices[index + 1 : index + group_size])
+
+    controller = LinkPlayController(session=None)
+    for bridge in simulated_bridges(loop, simulator):
+        loop.run_until_complete(controller.add_bridge(bridge))
+
+    benchmark(lambda: loop.run_until_complete(controller.discover_multirooms()))
+    assert len(controller.multirooms) == (0 if group_size == 1 else 64 // group_size)
+
+
+@pytest.mark.parametrize("count", [10, 100])
+def test_poll_simulated_devices(benchmark, loop, count):
+    """Polling the device and player status of simulated devices over HTTP."""
+    simulator = LinkPlaySimulator(seed=1)
+    simulator.add_devices(count)
+    loop.run_until_complete(simulator.start())
+    session = loop.run_until_complete(async_create_unverified_client_session())
+    bridges = loop.run_until_complete(simulator.bridges(session))
+
+    async def poll() -> None:
+        await asyncio.gather(
+            *(bridge.device.update_status() for bridge in bridges),
+            *(bridge.player.update_status() for bridge in bridges),
+        )
+
+    try:
+        benchmark(lambda: loop.run_until_complete(poll()))
+    finally:
+        loop.run_until_complete(session.close())
+        loop.run_until_complete(simulator.stop())
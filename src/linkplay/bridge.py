@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import Any, Callable
+from collections.abc import AsyncGenerator, Awaitable, Iterable, Mapping
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
+from linkplay.commands import format_command
 from linkplay.consts import (
+    FOLLOWER_MIRRORED_PLAYER_ATTRIBUTES,
+    FOLLOWER_POLL_INTERVAL,
     INPUT_MODE_MAP,
+    INTERNED_DEVICE_ATTRIBUTES,
     LOGGER,
+    METAINFO_MAX_AGE,
+    OPTIMISTIC_CONFIRMATION_DELAY,
     PLAY_MODE_SEND_MAP,
+    TRACK_IDENTITY_PLAYER_ATTRIBUTES,
+    WATCH_INTERVAL,
     AudioOutputHwMode,
     AudioOutputModeResponse,
     ChannelType,
@@ -22,41 +33,100 @@ from linkplay.consts import (
     PlayerAttribute,
     PlayingMode,
     PlayingStatus,
+    RefreshPart,
     SpeakerType,
 )
 from linkplay.endpoint import LinkPlayEndpoint
-from linkplay.exceptions import LinkPlayInvalidDataException
+from linkplay.events import schedule
+from linkplay.exceptions import LinkPlayException, LinkPlayInvalidDataException
 from linkplay.manufacturers import MANUFACTURER_WIIM, get_info_from_project
 from linkplay.utils import (
+    compact_properties,
     equalizer_mode_from_number_mapping,
     equalizer_mode_to_number_mapping,
     fixup_player_properties,
+    properties_changes,
 )
+from linkplay.watch import LinkPlayPoller, watch_players
+
+_T = TypeVar("_T")
+
+# Called with the properties which changed when a device or player is updated
+StateListener = Callable[[dict[str, str]], Any]
+
+
+def _add_listener(
+    listeners: list[StateListener], listener: StateListener
+) -> Callable[[], None]:
+    listeners.append(listener)
+
+    def remove() -> None:
+        if listener in listeners:
+            listeners.remove(listener)
+
+    return remove
+
+
+def _notify_listeners(
+    listeners: list[StateListener],
+    previous: dict[Any, str],
+    properties: dict[Any, str],
+) -> None:
+    if not listeners:
+        return
+    changes = properties_changes(previous, properties)
+    if not changes:
+        return
+    for listener in list(listeners):
+        try:
+            listener(changes)
+        except Exception:  # A failing listener must not break the update
+            LOGGER.exception("State listener %s failed", listener)
 
 
 class LinkPlayDevice:
     """Represents a LinkPlay device."""
 
+    __slots__ = ("bridge", "properties", "controller", "listeners")
+
     bridge: LinkPlayBridge
     properties: dict[DeviceAttribute, str]
-
-    controller: Callable[[], None] | None = None
+    controller: Callable[[], Any] | None
+    listeners: list[StateListener]
 
     def __init__(self, bridge: LinkPlayBridge):
         self.bridge = bridge
         self.properties = dict.fromkeys(DeviceAttribute.__members__.values(), "")
+        self.controller = None
+        self.listeners = []
 
     def to_dict(self):
         """Return the state of the LinkPlayDevice."""
         return {"properties": self.properties}
 
-    def set_callback(self, controller: Callable[[], None]) -> None:
-        """Sets a callback function to notify events."""
+    def set_callback(self, controller: Callable[[], Any]) -> None:
+        """Sets a callback function to notify multiroom changes. An awaitable
+        returned by the callback is run in a task."""
         self.controller = controller
 
+    def add_listener(self, listener: StateListener) -> Callable[[], None]:
+        """Adds a listener called with the changed properties after every status
+        update. Returns a function removing the listener."""
+        return _add_listener(self.listeners, listener)
+
     async def update_status(self) -> None:
         """Update the device status."""
-        self.properties = await self.bridge.json_request(LinkPlayCommand.DEVICE_STATUS)  # type: ignore[assignment]
+        self.apply_status(await self.request_status())
+
+    async def request_status(self) -> dict[str, str]:
+        """Requests the device status without applying it."""
+        return await self.bridge.json_request(LinkPlayCommand.DEVICE_STATUS)
+
+    def apply_status(self, properties: dict[str, str]) -> None:
+        """Applies a device status returned by request_status."""
+        previous = self.properties
+        self.properties = compact_properties(properties, INTERNED_DEVICE_ATTRIBUTES)  # type: ignore[arg-type]
+        _notify_listeners(self.listeners, previous, self.properties)
 
     async def reboot(self) -> None:
         """Reboot the device."""
@@ -92,10 +162,11 @@ class LinkPlayDevice:
     def playmode_support(self) -> list[PlayingMode]:
         """Returns the player playmode support."""
 
-        flags = InputMode(
-            int(self.properties[DeviceAttribute.PLAYMODE_SUPPORT], base=16)
-        )
+        playmode_support = self.properties.get(DeviceAttribute.PLAYMODE_SUPPORT, "")
+        if playmode_support == "":
+            return [PlayingMode.NETWORK]  # always supported
 
+        flags = InputMode(int(playmode_support, base=16))
         playing_modes = [INPUT_MODE_MAP[flag] for flag in flags]
         playing_modes.insert(0, PlayingMode.NETWORK)  # always supported
         return playing_modes
@@ -123,48 +194,160 @@ class LinkPlayDevice:
     async def timesync(self) -> None:
         """Sync the time."""
         timestamp = time.strftime("%Y%m%d%H%M%S")
-        await self.bridge.request(LinkPlayCommand.TIMESYNC.format(timestamp))
+        await self.bridge.request(format_command(LinkPlayCommand.TIMESYNC, timestamp))
 
 
 class LinkPlayPlayer:
     """Represents a LinkPlay player."""
 
+    __slots__ = (
+        "bridge",
+        "properties",
+        "custom_properties",
+        "metainfo",
+        "decode_cache",
+        "previous_playing_mode",
+        "metainfo_max_age",
+        "metainfo_track",
+        "metainfo_timestamp",
+        "track",
+        "status_timestamp",
+        "position_drift",
+        "confirmation_delay",
+        "confirmation_handle",
+        "confirmation_task",
+        "listeners",
+        "poller",
+        "poll_timestamp",
+        "mirror_timestamp",
+        "follower_poll_interval",
+    )
+
     bridge: LinkPlayBridge
     properties: dict[PlayerAttribute, str]
     custom_properties: dict[PlayerAttribute, str]
     metainfo: dict[MetaInfo, dict[MetaInfoMetaData, str]]
-
-    previous_playing_mode: PlayingMode | None = None
+    decode_cache: dict[PlayerAttribute, tuple[str, str]]
+    previous_playing_mode: PlayingMode | None
+    metainfo_max_age: float
+    metainfo_track: tuple[str, ...] | None
+    metainfo_timestamp: float | None
+    track: tuple[str, ...] | None
+    status_timestamp: float | None
+    position_drift: int
+    confirmation_delay: float | None
+    confirmation_handle: asyncio.TimerHandle | None
+    confirmation_task: asyncio.Task[None] | None
+    listeners: list[StateListener]
+    poller: LinkPlayPoller | None
+    poll_timestamp: float | None
+    mirror_timestamp: float | None
+    follower_poll_interval: float
 
     def __init__(self, bridge: LinkPlayBridge):
         self.bridge = bridge
         self.properties = dict.fromkeys(PlayerAttribute.__members__.values(), "")
         self.custom_properties = dict.fromkeys(PlayerAttribute.__members__.values(), "")
         self.metainfo = dict.fromkeys(MetaInfo.__members__.values(), {})
+        self.decode_cache = {}
+        self.previous_playing_mode = None
+        self.metainfo_max_age = METAINFO_MAX_AGE
+        self.metainfo_track = None
+        self.metainfo_timestamp = None
+        self.track = None
+        self.status_timestamp = None
+        self.position_drift = 0
+        self.confirmation_delay = OPTIMISTIC_CONFIRMATION_DELAY
+        self.confirmation_handle = None
+        self.confirmation_task = None
+        self.listeners = []
+        self.poller = None
+        self.poll_timestamp = None
+        self.mirror_timestamp = None
+        self.follower_poll_interval = FOLLOWER_POLL_INTERVAL
 
     def to_dict(self):
         """Return the state of the LinkPlayPlayer."""
         return {"properties": self.properties}
 
-    async def update_status(self) -> None:
-        """Update the player status."""
-        properties: dict[PlayerAttribute, str] = await self.bridge.json_request(
-            LinkPlayCommand.PLAYER_STATUS
-        )  # type: ignore[assignment]
+    def add_listener(self, listener: StateListener) -> Callable[[], None]:
+        """Adds a listener called with the changed properties after every status
+        update. Returns a function removing the listener."""
+        return _add_listener(self.listeners, listener)
+
+    async def watch(
+        self, interval: float = WATCH_INTERVAL
+    ) -> AsyncGenerator[dict[PlayerAttribute, str], None]:
+        """Polls the player every interval seconds and yields its properties when
+        they changed, starting with the current ones. All consumers watching the
+        player share the same polling, and a slow consumer only gets the latest
+        properties. Use contextlib.aclosing to stop watching promptly."""
+        async with aclosing(watch_players([self], interval)) as states:
+            async for _, properties in states:
+                yield properties
+
+    async def update_status(self, force: bool = False) -> None:
+        """Update the player status.
+
+        On WiiM devices the metainfo is only requested again when the track changes
+        or when it is older than metainfo_max_age seconds. An expired metainfo is
+        requested concurrently with the player status.
+
+        The status of a multiroom follower is mirrored from its leader, so it is
+        only requested when update_due, unless force is set."""
+        if not (force or self.update_due):
+            return
+        self._cancel_confirmation()
+        self.apply_status(*await self.request_status())
+
+    async def request_status(
+        self, manufacturer: str | None = None
+    ) -> tuple[
+        dict[PlayerAttribute, str], dict[MetaInfo, dict[MetaInfoMetaData, str]] | None
+    ]:
+        """Requests the player status, and the metainfo when it is needed, without
+        applying them. The metainfo is None when the current one is still valid.
+
+        The metainfo is only requested from WiiM devices, the manufacturer of the
+        device is used unless given."""
+        if manufacturer is None:
+            manufacturer = self.bridge.device.manufacturer
+        properties: dict[PlayerAttribute, str]
+        if manufacturer != MANUFACTURER_WIIM:
+            properties = await self.bridge.json_request(LinkPlayCommand.PLAYER_STATUS)  # type: ignore[assignment]
+            return properties, {}
+        if self._metainfo_expired():
+            return await asyncio.gather(  # type: ignore[return-value]
+                self.bridge.json_request(LinkPlayCommand.PLAYER_STATUS),
+                self._request_metainfo(),
+            )
+        properties = await self.bridge.json_request(LinkPlayCommand.PLAYER_STATUS)  # type: ignore[assignment]
+        if self._track_identity(properties) != self.metainfo_track:
+            return properties, await self._request_metainfo()
+        return properties, None
+
+    def apply_status(
+        self,
+        properties: dict[PlayerAttribute, str],
+        metainfo: dict[MetaInfo, dict[MetaInfoMetaData, str]] | None = None,
+    ) -> None:
+        """Applies a player status and metainfo returned by request_status."""
+        track = self._track_identity(properties)
+        if metainfo is not None:
+            self.metainfo = metainfo
+            self.metainfo_timestamp = time.monotonic()
+            self.metainfo_track = (
+                track if self.bridge.device.manufacturer == MANUFACTURER_WIIM else None
+            )
 
-        self.properties = fixup_player_properties(properties)
-        if self.bridge.device.manufacturer == MANUFACTURER_WIIM:
-            try:
-                self.metainfo: dict[
-                    MetaInfo, dict[MetaInfoMetaData, str]
-                ] = await self.bridge.json_request(LinkPlayCommand.META_INFO)  # type: ignore[assignment]
-            except LinkPlayInvalidDataException as exc:
-                if getattr(exc, "data", None) == "Failed":
-                    self.metainfo = {}
-                else:
-                    raise
-        else:
-            self.metainfo = {}
+        self._update_position_drift(properties, track)
+        previous = self.properties
+        self.properties = compact_properties(
+            fixup_player_properties(properties, self.decode_cache)
+        )
+        _notify_listeners(self.listeners, previous, self.properties)
+        self.track = track
+        self.status_timestamp = self.poll_timestamp = time.monotonic()
 
         # handle multiroom changes
         if self.bridge.device.controller is not None and (
@@ -177,9 +360,181 @@ class LinkPlayPlayer:
                 and self.play_mode != PlayingMode.FOLLOWER
             )
         ):
-            self.bridge.device.controller()
+            schedule(self.bridge.device.controller())
         self.previous_playing_mode = self.play_mode
 
+        multiroom = self.bridge.multiroom
+        if multiroom is not None and multiroom.leader is self.bridge:
+            multiroom.mirror_leader()
+
+    def mirror(
+        self,
+        leader: LinkPlayPlayer,
+        properties: dict[PlayerAttribute, str] | None = None,
+    ) -> None:
+        """Updates the player of a multiroom follower from its leader, which plays
+        the same track, and the given properties reported by the leader."""
+        previous = self.properties
+        self.properties = dict(previous)
+        if leader.status_timestamp is not None:
+            for attribute in FOLLOWER_MIRRORED_PLAYER_ATTRIBUTES:
+                if attribute in leader.properties:
+                    self.properties[attribute] = leader.properties[attribute]
+                else:
+                    self.properties.pop(attribute, None)
+            self.metainfo = leader.metainfo
+            self.track = leader.track
+            self.status_timestamp = leader.status_timestamp
+        if properties:
+            self.properties.update(properties)
+        self.mirror_timestamp = time.monotonic()
+        _notify_listeners(self.listeners, previous, self.properties)
+
+    @property
+    def update_due(self) -> bool:
+        """Returns if the player should be polled. The state of a multiroom follower
+        is mirrored from its leader, so followers are only polled every
+        follower_poll_interval seconds."""
+        multiroom = self.bridge.multiroom
+        if (
+            self.mirror_timestamp is None
+            or self.poll_timestamp is None
+            or multiroom is None
+            or multiroom.leader is self.bridge
+        ):
+            return True
+        return time.monotonic() - self.poll_timestamp >= self.follower_poll_interval
+
+    def _update_position_drift(
+        self, properties: dict[PlayerAttribute, str], track: tuple[str, ...]
+    ) -> None:
+        """Measures how far the interpolated position was off from the reported one."""
+        self.position_drift = 0
+        if (
+            track != self.track
+            or self.properties.get(PlayerAttribute.PLAYING_STATUS)
+            != PlayingStatus.PLAYING
+            or properties.get(PlayerAttribute.PLAYING_STATUS) != PlayingStatus.PLAYING
+        ):
+            return
+
+        self.position_drift = (
+            int(properties.get(PlayerAttribute.CURRENT_POSITION, 0))
+            - self.current_position
+        )
+
+    def _metainfo_expired(self) -> bool:
+        """Returns if the metainfo has never been requested or is too old."""
+        return (
+            self.metainfo_timestamp is None
+            or time.monotonic() - self.metainfo_timestamp >= self.metainfo_max_age
+        )
+
+    @staticmethod
+    def _track_identity(properties: dict[PlayerAttribute, str]) -> tuple[str, ...]:
+        """Returns the raw values identifying the track in the player properties."""
+        return tuple(
+            properties.get(attribute, "")
+            for attribute in TRACK_IDENTITY_PLAYER_ATTRIBUTES
+        )
+
+    async def _request_metainfo(self) -> dict[MetaInfo, dict[MetaInfoMetaData, str]]:
+        """Requests the metainfo of the current track."""
+        try:
+            return await self.bridge.json_request(LinkPlayCommand.META_INFO)  # type: ignore[return-value]
+        except LinkPlayInvalidDataException as exc:
+            if getattr(exc, "data", None) == "Failed":
+                return {}
+            raise
+
+    async def _request_optimistic(
+        self, command: str, effects: dict[PlayerAttribute, str]
+    ) -> None:
+        """Performs a command and applies its expected effects on the properties right away.
+
+        The effects are rolled back when the command fails, unless a status poll or
+        another command changed them meanwhile. Otherwise a status poll is scheduled
+        after confirmation_delay seconds to reconcile with the device."""
+        properties = self.properties
+        previous = {attribute: properties.get(attribute) for attribute in effects}
+        self._apply_effects(effects)
+
+        try:
+            await self.bridge.request(command)
+        except LinkPlayException:
+            if self.properties is properties:
+                self._update_properties(
+                    {
+                        attribute: value
+                        for attribute, value in previous.items()
+                        if properties.get(attribute) == effects[attribute]
+                    }
+                )
+            raise
+
+        self._schedule_confirmation()
+
+    def _apply_effects(self, effects: dict[PlayerAttribute, str]) -> None:
+        """Applies the expected effects of a command on the properties."""
+        if self.status_timestamp is not None:
+            # Rebase the interpolated position so it stays continuous, which is no
+            # change for the listeners
+            self.properties[PlayerAttribute.CURRENT_POSITION] = str(
+                self.current_position
+            )
+            self.status_timestamp = time.monotonic()
+        self._update_properties(effects)
+
+    def _update_properties(self, updates: Mapping[PlayerAttribute, str | None]) -> None:
+        """Updates the properties in place, removing the attributes updated to None,
+        and notifies the listeners of the changes."""
+        previous = dict(self.properties) if self.listeners else self.properties
+        for attribute, value in updates.items():
+            if value is None:
+                self.properties.pop(attribute, None)
+            else:
+                self.properties[attribute] = value
+        _notify_listeners(self.listeners, previous, self.properties)
+
+    def _schedule_confirmation(self) -> None:
+        """Schedules a status poll confirming the optimistic updates."""
+        if self.confirmation_delay is None:
+            return
+
+        self._cancel_confirmation()
+        self.confirmation_handle = asyncio.get_running_loop().call_later(
+            self.confirmation_delay, self._start_confirmation
+        )
+
+    def _cancel_confirmation(self) -> None:
+        """Cancels a scheduled confirmation poll, a status poll makes it redundant."""
+        if self.confirmation_handle is not None:
+            self.confirmation_handle.cancel()
+            self.confirmation_handle = None
+
+    def _start_confirmation(self) -> None:
+        """Starts the confirmation poll."""
+        self.confirmation_handle = None
+        self.confirmation_task = asyncio.create_task(self._confirm())
+
+    async def _confirm(self) -> None:
+        """Polls the player status to reconcile the optimistic updates."""
+        try:
+            await self.update_status(force=True)
+        except LinkPlayException as exc:
+            LOGGER.warning("Confirmation poll failed for %s: %s", self.bridge, exc)
+        except Exception:  # The task is not awaited, e.g. the session was closed
+            LOGGER.exception("Confirmation poll failed for %s", self.bridge)
+        finally:
+            self.confirmation_task = None
+
+    def close(self) -> None:
+        """Cancels the pending confirmation poll, e.g. before closing the session."""
+        self._cancel_confirmation()
+        if self.confirmation_task is not None:
+            self.confirmation_task.cancel()
+            self.confirmation_task = None
+
     async def next(self) -> None:
         """Play the next song in the playlist."""
         await self.bridge.request(LinkPlayCommand.NEXT)
@@ -190,46 +545,66 @@ class LinkPlayPlayer:
 
     async def play(self, value: str) -> None:
         """Start playing the selected track."""
-        await self.bridge.request(LinkPlayCommand.PLAY.format(value))  # type: ignore[str-format]
+        await self.bridge.request(format_command(LinkPlayCommand.PLAY, value))
 
     async def resume(self) -> None:
         """Resume playing the current track."""
-        await self.bridge.request(LinkPlayCommand.RESUME)
+        await self._request_optimistic(
+            LinkPlayCommand.RESUME,
+            {PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING},
+        )
 
     async def mute(self) -> None:
         """Mute the player."""
-        await self.bridge.request(LinkPlayCommand.MUTE)
-        self.properties[PlayerAttribute.MUTED] = MuteMode.MUTED
+        await self._request_optimistic(
+            LinkPlayCommand.MUTE, {PlayerAttribute.MUTED: MuteMode.MUTED}
+        )
 
     async def unmute(self) -> None:
         """Unmute the player."""
-        await self.bridge.request(LinkPlayCommand.UNMUTE)
-        self.properties[PlayerAttribute.MUTED] = MuteMode.UNMUTED
+        await self._request_optimistic(
+            LinkPlayCommand.UNMUTE, {PlayerAttribute.MUTED: MuteMode.UNMUTED}
+        )
 
     async def play_playlist(self, index: int) -> None:
         """Start playing chosen playlist by index number."""
-        await self.bridge.request(LinkPlayCommand.PLAYLIST.format(index))  # type: ignore[str-format]
+        await self.bridge.request(format_command(LinkPlayCommand.PLAYLIST, index))
 
     async def pause(self) -> None:
         """Pause the current playing track."""
-        await self.bridge.request(LinkPlayCommand.PAUSE)
-        self.properties[PlayerAttribute.PLAYING_STATUS] = PlayingStatus.PAUSED
+        await self._request_optimistic(
+            LinkPlayCommand.PAUSE,
+            {PlayerAttribute.PLAYING_STATUS: PlayingStatus.PAUSED},
+        )
 
     async def stop(self) -> None:
         """Stop the current playing track and remove the selected source."""
-        await self.bridge.request(LinkPlayCommand.STOP)
-        self.properties[PlayerAttribute.PLAYING_STATUS] = PlayingStatus.STOPPED
+        await self._request_optimistic(
+            LinkPlayCommand.STOP,
+            {PlayerAttribute.PLAYING_STATUS: PlayingStatus.STOPPED},
+        )
 
     async def toggle(self) -> None:
         """Start playing if the player is currently not playing. Stops playing if it is."""
-        await self.bridge.request(LinkPlayCommand.TOGGLE)
+        status = (
+            PlayingStatus.PAUSED
+            if self.properties.get(PlayerAttribute.PLAYING_STATUS)
+            == PlayingStatus.PLAYING
+            else PlayingStatus.PLAYING
+        )
+        await self._request_optimistic(
+            LinkPlayCommand.TOGGLE, {PlayerAttribute.PLAYING_STATUS: status}
+        )
 
     async def set_volume(self, value: int) -> None:
         """Set the player volume."""
         if not 0 <= value <= 100:
             raise ValueError("Volume must be between 0 and 100.")
 
-        await self.bridge.request(LinkPlayCommand.VOLUME.format(value))  # type: ignore[str-format]
+        await self._request_optimistic(
+            format_command(LinkPlayCommand.VOLUME, value),
+            {PlayerAttribute.VOLUME: str(value)},
+        )
 
     async def set_equalizer_mode(self, mode: EqualizerMode) -> None:
         """Set the equalizer mode."""
@@ -249,7 +624,9 @@ class LinkPlayPlayer:
         if mode == EqualizerMode.NONE:
             await self.bridge.json_request(LinkPlayCommand.WIIM_EQUALIZER_OFF)
         else:
-            await self.bridge.json_request(LinkPlayCommand.WIIM_EQ_LOAD.format(mode))
+            await self.bridge.json_request(
+                format_command(LinkPlayCommand.WIIM_EQ_LOAD, mode)
+            )
         # WiiM doesn't update the property after setting it
         self.custom_properties[PlayerAttribute.EQUALIZER_MODE] = mode
 
@@ -261,19 +638,24 @@ class LinkPlayPlayer:
                 f"Invalid equalizer mode {mode}. Allowed equalizer modes are {self.available_equalizer_modes}."
             )
 
-        await self.bridge.request(
-            LinkPlayCommand.EQUALIZER_MODE.format(equalizer_mode_as_number)
+        await self._request_optimistic(
+            format_command(LinkPlayCommand.EQUALIZER_MODE, equalizer_mode_as_number),
+            {PlayerAttribute.EQUALIZER_MODE: equalizer_mode_as_number},
         )
 
     async def set_loop_mode(self, mode: LoopMode) -> None:
         """Set the loop mode."""
-        await self.bridge.request(LinkPlayCommand.LOOP_MODE.format(mode))  # type: ignore[str-format]
+        await self._request_optimistic(
+            format_command(LinkPlayCommand.LOOP_MODE, mode),
+            {PlayerAttribute.PLAYLIST_MODE: mode},
+        )
 
     async def set_play_mode(self, mode: PlayingMode) -> None:
         """Set the play mode."""
-        await self.bridge.request(
-            LinkPlayCommand.SWITCH_MODE.format(PLAY_MODE_SEND_MAP[mode])
-        )  # type: ignore[str-format]
+        await self._request_optimistic(
+            format_command(LinkPlayCommand.SWITCH_MODE, PLAY_MODE_SEND_MAP[mode]),
+            {PlayerAttribute.PLAYBACK_MODE: mode},
+        )
 
     async def play_preset(self, preset_number: int) -> None:
         """Play a preset."""
@@ -284,7 +666,10 @@ class LinkPlayPlayer:
             raise ValueError(
                 f"Preset must be between 1 and {max_number_of_presets_allowed}."
             )
-        await self.bridge.request(LinkPlayCommand.PLAY_PRESET.format(preset_number))
+        await self._request_optimistic(
+            format_command(LinkPlayCommand.PLAY_PRESET, preset_number),
+            {PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING},
+        )
 
     async def seek(self, position: int) -> None:
         """Seek to a position."""
@@ -293,11 +678,16 @@ class LinkPlayPlayer:
             and position >= 0
             and position <= self.total_length_in_seconds
         ):
-            await self.bridge.request(LinkPlayCommand.SEEK.format(position))
+            await self._request_optimistic(
+                format_command(LinkPlayCommand.SEEK, position),
+                {PlayerAttribute.CURRENT_POSITION: str(position * 1000)},
+            )
 
     async def set_audio_output_hw_mode(self, mode: AudioOutputHwMode) -> None:
         """Set the audio hardware output."""
-        await self.bridge.request(LinkPlayCommand.AUDIO_OUTPUT_HW_MODE_SET.format(mode))
+        await self.bridge.request(
+            format_command(LinkPlayCommand.AUDIO_OUTPUT_HW_MODE_SET, mode)
+        )
 
     async def get_audio_output_hw_mode(self) -> AudioOutputModeResponse:
         """Get the audio hardware output."""
@@ -345,8 +735,23 @@ class LinkPlayPlayer:
 
     @property
     def current_position(self) -> int:
-        """Returns the current position of the track in milliseconds."""
-        return int(self.properties.get(PlayerAttribute.CURRENT_POSITION, 0))
+        """Returns the current position of the track in milliseconds.
+
+        While playing, the position is extrapolated from the last status poll and
+        clamped to the total length of the track."""
+        position = int(self.properties.get(PlayerAttribute.CURRENT_POSITION, 0))
+        if (
+            self.status_timestamp is None
+            or self.properties.get(PlayerAttribute.PLAYING_STATUS)
+            != PlayingStatus.PLAYING
+        ):
+            return position
+
+        position += int((time.monotonic() - self.status_timestamp) * 1000)
+        total_length = self.total_length
+        if total_length > 0:
+            return min(position, total_length)
+        return position
 
     @property
     def total_length(self) -> int:
@@ -356,7 +761,7 @@ class LinkPlayPlayer:
     @property
     def current_position_in_seconds(self) -> int:
         """Returns the current position of the track in seconds."""
-        return int(int(self.properties.get(PlayerAttribute.CURRENT_POSITION, 0)) / 1000)
+        return int(self.current_position / 1000)
 
     @property
     def total_length_in_seconds(self) -> int:
@@ -467,6 +872,8 @@ class LinkPlayPlayer:
 class LinkPlayBridge:
     """Represents a LinkPlay bridge to control the device and player attached to it."""
 
+    __slots__ = ("endpoint", "device", "player", "multiroom")
+
     endpoint: LinkPlayEndpoint
     device: LinkPlayDevice
     player: LinkPlayPlayer
@@ -495,22 +902,94 @@ class LinkPlayBridge:
 
     async def json_request(self, command: str) -> dict[str, str]:
         """Performs a GET request on the given command and returns the result as a JSON object."""
-        LOGGER.debug(str.format("Request {} at {}", command, self.endpoint))
+        LOGGER.debug("Request %s at %s", command, self.endpoint)
         response = await self.endpoint.json_request(command)
-        LOGGER.debug(str.format("Response {}: {}", command, response))
+        LOGGER.debug("Response %s: %s", command, response)
         return response
 
     async def request(self, command: str) -> None:
         """Performs a GET request on the given command and verifies the result."""
 
-        LOGGER.debug(str.format("Request command at {}: {}", self.endpoint, command))
+        LOGGER.debug("Request command at %s: %s", self.endpoint, command)
         await self.endpoint.request(command)
 
+    def close(self) -> None:
+        """Cancels the pending background work of the bridge. To be called when the
+        bridge is removed or before its session is closed."""
+        self.player.close()
+
+    async def refresh(
+        self,
+        parts: Iterable[RefreshPart] = (RefreshPart.DEVICE, RefreshPart.PLAYER),
+        bridges: list[LinkPlayBridge] | None = None,
+    ) -> None:
+        """Updates the given parts of the bridge with a single round of requests.
+
+        The requests are sent concurrently, within the concurrency limit of the
+        endpoint, and their results are only applied once all of them succeeded.
+        The device status is requested first when the manufacturer of the device is
+        not known yet, it decides whether the player metainfo is requested.
+        The multiroom part is refreshed when the bridge leads a group, looking for
+        its followers in bridges, or in the current followers if not given. The
+        player part of a multiroom follower is only refreshed when update_due."""
+        parts = set(parts)
+        multiroom = self.multiroom
+        if multiroom is None or multiroom.leader is not self:
+            multiroom = None
+            parts.discard(RefreshPart.MULTIROOM)
+
+        requests: dict[RefreshPart, Awaitable[Any]] = {}
+        manufacturer = None
+        if RefreshPart.DEVICE in parts:
+            if self.device.properties.get(DeviceAttribute.PROJECT, "") == "":
+                device_properties = await self.device.request_status()
+                manufacturer, _ = get_info_from_project(
+                    device_properties.get(DeviceAttribute.PROJECT, "")
+                )
+                requests[RefreshPart.DEVICE] = _result(device_properties)
+            else:
+                requests[RefreshPart.DEVICE] = self.device.request_status()
+        if RefreshPart.PLAYER in parts and self.player.update_due:
+            self.player._cancel_confirmation()
+            requests[RefreshPart.PLAYER] = self.player.request_status(manufacturer)
+        if multiroom is not None and RefreshPart.MULTIROOM in parts:
+            requests[RefreshPart.MULTIROOM] = multiroom.request_status()
+        results = dict(zip(requests, await asyncio.gather(*requests.values())))
+
+        if RefreshPart.DEVICE in results:
+            self.device.apply_status(results[RefreshPart.DEVICE])
+        if RefreshPart.PLAYER in results:
+            self.player.apply_status(*results[RefreshPart.PLAYER])
+        if multiroom is not None and RefreshPart.MULTIROOM in results:
+            multiroom.apply_status(
+                results[RefreshPart.MULTIROOM],
+                multiroom.followers if bridges is None else bridges,
+            )
+
+
+async def _result(value: _T) -> _T:
+    """Returns the value, as the result of an awaitable."""
+    return value
+
+
+def _follower_player_properties(
+    follower: dict[str, Any],
+) -> dict[PlayerAttribute, str]:
+    """Returns the player properties reported for a follower by its leader."""
+    properties = {}
+    if MultiroomAttribute.VOLUME in follower:
+        properties[PlayerAttribute.VOLUME] = str(follower[MultiroomAttribute.VOLUME])
+    if MultiroomAttribute.MUTE in follower:
+        properties[PlayerAttribute.MUTED] = str(follower[MultiroomAttribute.MUTE])
+    return properties
+
 
 class LinkPlayMultiroom:
     """Represents a LinkPlay multiroom group. Contains a leader and a list of followers.
     The leader is the device that controls the group."""
 
+    __slots__ = ("leader", "followers")
+
     leader: LinkPlayBridge
     followers: list[LinkPlayBridge]
 
@@ -527,25 +1006,45 @@ class LinkPlayMultiroom:
 
     async def update_status(self, bridges: list[LinkPlayBridge]) -> None:
         """Updates the multiroom status."""
-        try:
-            properties: dict[Any, Any] = await self.leader.json_request(
-                LinkPlayCommand.MULTIROOM_LIST
-            )
-
-            self.followers = []
-            if int(properties[MultiroomAttribute.NUM_FOLLOWERS]) == 0:
-                return
+        self.apply_status(await self.request_status(), bridges)
 
-            follower_uuids = [
-                follower[MultiroomAttribute.UUID]
-                for follower in properties[MultiroomAttribute.FOLLOWER_LIST]
-            ]
-            new_followers = [
-                bridge for bridge in bridges if bridge.device.uuid in follower_uuids
-            ]
-            self.followers.extend(new_followers)
+    async def request_status(self) -> dict[Any, Any] | None:
+        """Requests the followers of the leader without applying them. Returns None
+        when the leader answered with invalid data."""
+        try:
+            return await self.leader.json_request(LinkPlayCommand.MULTIROOM_LIST)
         except LinkPlayInvalidDataException as exc:
             LOGGER.exception(exc)
+            return None
+
+    def apply_status(
+        self, properties: dict[Any, Any] | None, bridges: list[LinkPlayBridge]
+    ) -> None:
+        """Applies the followers returned by request_status, looked up in bridges."""
+        if properties is None:
+            return
+        self.followers = []
+        if int(properties[MultiroomAttribute.NUM_FOLLOWERS]) == 0:
+            return
+
+        followers = {
+            follower[MultiroomAttribute.UUID]: follower
+            for follower in properties[MultiroomAttribute.FOLLOWER_LIST]
+        }
+        new_followers = [
+            bridge for bridge in bridges if bridge.device.uuid in followers
+        ]
+        self.followers.extend(new_followers)
+        for follower in new_followers:
+            follower.player.mirror(
+                self.leader.player,
+                _follower_player_properties(followers[follower.device.uuid]),
+            )
+
+    def mirror_leader(self) -> None:
+        """Updates the players of the followers from the player of the leader."""
+        for follower in self.followers:
+            follower.player.mirror(self.leader.player)
 
     async def ungroup(self) -> None:
         """Ungroups the multiroom group."""
@@ -557,8 +1056,8 @@ class LinkPlayMultiroom:
     async def add_follower(self, follower: LinkPlayBridge) -> None:
         """Adds a follower to the multiroom group."""
         await follower.request(
-            LinkPlayCommand.MULTIROOM_JOIN.format(self.leader.device.eth)
-        )  # type: ignore[str-format]
+            format_command(LinkPlayCommand.MULTIROOM_JOIN, self.leader.device.eth)
+        )
         if follower not in self.followers:
             follower.multiroom = self
             self.followers.append(follower)
@@ -566,8 +1065,8 @@ class LinkPlayMultiroom:
     async def remove_follower(self, follower: LinkPlayBridge) -> None:
         """Removes a follower from the multiroom group."""
         await self.leader.request(
-            LinkPlayCommand.MULTIROOM_KICK.format(follower.device.eth)
-        )  # type: ignore[str-format]
+            format_command(LinkPlayCommand.MULTIROOM_KICK, follower.device.eth)
+        )
         if follower in self.followers:
             follower.multiroom = None
             self.followers.remove(follower)
@@ -578,10 +1077,12 @@ class LinkPlayMultiroom:
             raise ValueError("Volume must be between 0 and 100")
 
         str_vol = str(value)
-        await self.leader.request(LinkPlayCommand.MULTIROOM_VOL.format(str_vol))  # type: ignore[str-format]
+        await self.leader.request(
+            format_command(LinkPlayCommand.MULTIROOM_VOL, str_vol)
+        )
 
         for bridge in [self.leader] + self.followers:
-            bridge.player.properties[PlayerAttribute.VOLUME] = str_vol
+            bridge.player._update_properties({PlayerAttribute.VOLUME: str_vol})
 
     async def mute(self) -> None:
         """Mutes the multiroom group."""
@@ -0,0 +1,153 @@
+"""Registry of LinkPlay commands, formatting their parameters and request URLs."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import quote
+from weakref import WeakValueDictionary
+
+from linkplay.consts import API_ENDPOINT, LinkPlayCommand
+
+if TYPE_CHECKING:
+    from yarl import URL
+
+# Characters sent as is in a command, all others are percent-encoded. A "+" is
+# decoded to a space and some decoders split the query on ";", so both are encoded
+COMMAND_SAFE_CHARACTERS = ":/,=?@!$'()*~"
+
+CONSTANT_COMMANDS: frozenset[str] = frozenset(
+    command for command in LinkPlayCommand if "{}" not in command
+)
+
+
+def _text(value: Any) -> str:
+    return str(value)
+
+
+def _integer(
+    minimum: int | None = None, maximum: int | None = None
+) -> Callable[[Any], str]:
+    """Returns an encoder of integer parameters within the given bounds."""
+
+    def encode(value: Any) -> str:
+        number = int(value)
+        if (minimum is not None and number < minimum) or (
+            maximum is not None and number > maximum
+        ):
+            raise ValueError(f"Parameter {value} is out of range")
+        return str(number)
+
+    return encode
+
+
+class LinkPlayCommandTemplate:
+    """A command taking a parameter, converted to text by its encoder."""
+
+    __slots__ = ("command", "prefix", "suffix", "encoder")
+
+    command: LinkPlayCommand
+    prefix: str
+    suffix: str
+    encoder: Callable[[Any], str]
+
+    def __init__(self, command: LinkPlayCommand, encoder: Callable[[Any], str] = _text):
+        self.command = command
+        self.prefix, _, self.suffix = command.partition("{}")
+        self.encoder = encoder
+
+    def format(self, value: Any) -> str:
+        """Returns the command with the given parameter."""
+        return self.prefix + self.encoder(value) + self.suffix
+
+
+COMMAND_TEMPLATES: dict[LinkPlayCommand, LinkPlayCommandTemplate] = {
+    command: LinkPlayCommandTemplate(command, encoder)
+    for command, encoder in {
+        LinkPlayCommand.PLAY: _text,
+        LinkPlayCommand.SEEK: _integer(minimum=0),
+        LinkPlayCommand.VOLUME: _integer(0, 100),
+        LinkPlayCommand.PLAYLIST: _integer(minimum=0),
+        LinkPlayCommand.EQUALIZER_MODE: _integer(minimum=0),
+        LinkPlayCommand.LOOP_MODE: _integer(minimum=-1),
+        LinkPlayCommand.SWITCH_MODE: _text,
+        LinkPlayCommand.M3U_PLAYLIST: _text,
+        LinkPlayCommand.MULTIROOM_KICK: _text,
+        LinkPlayCommand.MULTIROOM_VOL: _integer(0, 100),
+        LinkPlayCommand.MULTIROOM_JOIN: _text,
+        LinkPlayCommand.PLAY_PRESET: _integer(minimum=1),
+        LinkPlayCommand.TIMESYNC: _text,
+        LinkPlayCommand.WIIM_EQ_LOAD: _text,
+        LinkPlayCommand.AUDIO_OUTPUT_HW_MODE_SET: _integer(minimum=1),
+    }.items()
+}
+
+
+def format_command(command: LinkPlayCommand, value: Any) -> str:
+    """Returns the command with the given parameter, validated by its encoder."""
+    return COMMAND_TEMPLATES[command].format(value)
+
+
+def encode_command(command: str) -> str:
+    """Returns the command percent-encoded for the query string of a request."""
+    return quote(command, safe=COMMAND_SAFE_CHARACTERS)
+
+
+class LinkPlayCommandUrls:
+    """Builds the request URLs of the commands sent to an endpoint. The URL prefix
+    is built once, and so are the URLs of the commands without parameters, starting
+    with the preloaded ones."""
+
+    __slots__ = ("prefix", "urls", "__weakref__")
+
+    prefix: str
+    urls: dict[str, URL]
+
+    def __init__(self, endpoint: str, preload: Iterable[str] = ()):
+        self.prefix = API_ENDPOINT.format(endpoint, "")
+        self.urls = {}
+        for command in preload:
+            self.url(command)
+
+    def url(self, command: str) -> URL:
+        """Returns the already encoded URL requesting the command."""
+        url = self.urls.get(command)
+        if url is not None:
+            return url
+
+        from yarl import URL
+
+        url = URL(self.prefix + encode_command(command), encoded=True)
+        if command in CONSTANT_COMMANDS:
+            self.urls[command] = url
+        return url
+
+
+# URL builders of the endpoints in use, kept while their endpoint references them
+_REGISTERED_URLS: WeakValueDictionary[str, LinkPlayCommandUrls] = WeakValueDictionary()
+
+
+def register_command_urls(
+    endpoint: str, preload: Iterable[str] = ()
+) -> LinkPlayCommandUrls:
+    """Returns the URL builder of the endpoint with the URLs of the preloaded
+    commands built. It is used by the requests to the endpoint as long as the
+    caller keeps a reference to it."""
+    urls = _REGISTERED_URLS.get(endpoint)
+    if urls is None:
+        urls = _REGISTERED_URLS[endpoint] = LinkPlayCommandUrls(endpoint)
+    for command in preload:
+        urls.url(command)
+    return urls
+
+
+@lru_cache(maxsize=1024)
+def _cached_command_urls(endpoint: str) -> LinkPlayCommandUrls:
+    return LinkPlayCommandUrls(endpoint)
+
+
+def get_command_urls(endpoint: str) -> LinkPlayCommandUrls:
+    """Returns the shared URL builder of the endpoint."""
+    urls = _REGISTERED_URLS.get(endpoint)
+    return urls if urls is not None else _cached_command_urls(endpoint)
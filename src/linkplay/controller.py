@@ -1,9 +1,26 @@
-from aiohttp import ClientSession
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Iterable
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Callable, TextIO
 
 from linkplay.bridge import LinkPlayBridge, LinkPlayMultiroom
-from linkplay.consts import LOGGER
+from linkplay.consts import LOGGER, WATCH_INTERVAL, PlayerAttribute, TimedOperation
 from linkplay.discovery import discover_linkplay_bridges
+from linkplay.events import LinkPlayEvent, LinkPlayEventBus, LinkPlayEventType
 from linkplay.exceptions import LinkPlayInvalidDataException
+from linkplay.instrumentation import INSTRUMENTATION
+from linkplay.utils import deep_sizeof
+from linkplay.watch import watch_players
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+# Prefixes of the fields exported from the device or player properties
+EXPORT_DEVICE_PREFIX = "device."
+EXPORT_PLAYER_PREFIX = "player."
 
 
 class LinkPlayController:
@@ -12,27 +29,55 @@ class LinkPlayController:
     session: ClientSession
     bridges: list[LinkPlayBridge]
     multirooms: list[LinkPlayMultiroom]
+    events: LinkPlayEventBus
 
     def __init__(self, session: ClientSession):
         self.session = session
         self.bridges = []
         self.multirooms = []
+        self.events = LinkPlayEventBus()
+        self.events.subscribe(
+            LinkPlayEventType.TOPOLOGY_CHANGED, self._on_topology_changed
+        )
+        self._discovery: asyncio.Task[None] | None = None
+        self._rediscover = False
+
+    def get_bridge_callback(
+        self, bridge: LinkPlayBridge | None = None
+    ) -> Callable[[], None]:
+        """Returns a callback publishing the multiroom changes of the bridge, if
+        given, on the event bus."""
+
+        def callback() -> None:
+            """Publishes a multiroom change of the bridge on the event bus."""
+            LOGGER.debug("Controller event received from %s", bridge)
+            self.events.publish(
+                LinkPlayEvent(LinkPlayEventType.TOPOLOGY_CHANGED, bridge)
+            )
 
-    def get_bridge_callback(self):
-        """Returns an async callback function for LinkPlayBridge."""
+        return callback
 
-        async def callback() -> None:
-            """Async callback function to handle events from a LinkPlayBridge."""
-            LOGGER.debug("Controller event received")
+    def _on_topology_changed(self, event: LinkPlayEvent) -> asyncio.Task[None] | None:
+        """Discovers the multirooms again in a task. Changes published while the
+        discovery runs are coalesced into a single new discovery."""
+        if self._discovery is not None and not self._discovery.done():
+            self._rediscover = True
+            return None
+        self._discovery = asyncio.create_task(self._discover_multirooms_until_settled())
+        return self._discovery
+
+    async def _discover_multirooms_until_settled(self) -> None:
+        self._rediscover = True
+        while self._rediscover:
+            self._rediscover = False
             await self.discover_multirooms()
 
-        return callback
-
     async def discover_bridges(self) -> None:
         """Attempts to discover LinkPlay devices on the local network."""
 
         # Discover new bridges
-        discovered_bridges = await discover_linkplay_bridges(self.session)
+        with INSTRUMENTATION.measure(TimedOperation.DISCOVERY):
+            discovered_bridges = await discover_linkplay_bridges(self.session)
         current_bridges = [bridge.device.uuid for bridge in self.bridges]
         new_bridges = [
             discovered_bridge
@@ -41,6 +86,75 @@ class LinkPlayController:
         ]
         self.bridges.extend(new_bridges)
 
+    def memory_per_bridge(self) -> float:
+        """Returns the average memory in bytes used by a bridge of the controller.
+
+        Objects shared between bridges, such as interned attribute names and values,
+        are only counted once."""
+        if not self.bridges:
+            return 0.0
+
+        seen: set[int] = set()
+        return sum(deep_sizeof(bridge, seen) for bridge in self.bridges) / len(
+            self.bridges
+        )
+
+    def export_column(self, field: str) -> list[str]:
+        """Returns the values of a field for all bridges, in the order of bridges.
+
+        Fields are either device.<attribute> or player.<attribute>, e.g. device.RSSI
+        or player.vol, or one of uuid, name and endpoint. Missing values are empty,
+        values which are not strings are converted to strings."""
+        if field.startswith(EXPORT_DEVICE_PREFIX):
+            key = field.removeprefix(EXPORT_DEVICE_PREFIX)
+            return [
+                str(bridge.device.properties.get(key, ""))  # type: ignore[call-overload]
+                for bridge in self.bridges
+            ]
+        if field.startswith(EXPORT_PLAYER_PREFIX):
+            key = field.removeprefix(EXPORT_PLAYER_PREFIX)
+            return [
+                str(bridge.player.properties.get(key, ""))  # type: ignore[call-overload]
+                for bridge in self.bridges
+            ]
+        if field == "uuid":
+            return [bridge.device.uuid for bridge in self.bridges]
+        if field == "name":
+            return [bridge.device.name for bridge in self.bridges]
+        if field == "endpoint":
+            return [str(bridge.endpoint) for bridge in self.bridges]
+        raise ValueError(f"Unknown export field: {field}")
+
+    def export_columns(self, fields: Iterable[str]) -> dict[str, list[str]]:
+        """Returns the state of all bridges as one column of values per field."""
+        return {field: self.export_column(field) for field in fields}
+
+    def export_records(self, fields: Iterable[str], stream: TextIO) -> int:
+        """Writes the state of all bridges to the stream as newline-delimited JSON
+        records holding the given fields. Returns the number of records written."""
+        columns = self.export_columns(fields)
+        keys = [f"{json.dumps(field, ensure_ascii=False)}:" for field in columns]
+        for row in zip(*columns.values(), strict=True):
+            stream.write(
+                "{"
+                + ",".join(
+                    key + json.dumps(value, ensure_ascii=False)
+                    for key, value in zip(keys, row, strict=True)
+                )
+                + "}\n"
+            )
+        return len(self.bridges) if columns else 0
+
+    async def watch_all(
+        self, interval: float = WATCH_INTERVAL
+    ) -> AsyncGenerator[tuple[LinkPlayBridge, dict[PlayerAttribute, str]], None]:
+        """Yields the bridges of the controller and their player properties when
+        they changed. See LinkPlayPlayer.watch."""
+        players = [bridge.player for bridge in self.bridges]
+        async with aclosing(watch_players(players, interval)) as states:
+            async for player, properties in states:
+                yield player.bridge, properties
+
     async def find_bridge(self, bridge_uuid: str) -> LinkPlayBridge | None:
         """Find a LinkPlay device by its bridge uuid."""
 
@@ -56,7 +170,7 @@ class LinkPlayController:
         # Add bridge
         current_bridges = [bridge.device.uuid for bridge in self.bridges]
         if bridge_to_add.device.uuid not in current_bridges:
-            bridge_to_add.device.set_callback(self.get_bridge_callback())
+            bridge_to_add.device.set_callback(self.get_bridge_callback(bridge_to_add))
             self.bridges.append(bridge_to_add)
 
     async def remove_bridge(self, bridge_to_remove: LinkPlayBridge) -> None:
@@ -66,6 +180,7 @@ class LinkPlayController:
         current_bridges = [bridge.device.uuid for bridge in self.bridges]
         if bridge_to_remove.device.uuid in current_bridges:
             self.bridges.remove(bridge_to_remove)
+            bridge_to_remove.close()
 
     async def discover_multirooms(self) -> None:
         """Attempts to discover multirooms on the local network."""
@@ -1,14 +1,16 @@
-from typing import Any
+from __future__ import annotations
 
-from aiohttp import ClientSession
-from async_upnp_client.search import async_search
-from async_upnp_client.utils import CaseInsensitiveDict
-from deprecated import deprecated
+from typing import TYPE_CHECKING, Any
 
 from linkplay.bridge import LinkPlayBridge
 from linkplay.consts import UPNP_DEVICE_TYPE, LinkPlayCommand, MultiroomAttribute
 from linkplay.endpoint import LinkPlayApiEndpoint, LinkPlayEndpoint
 from linkplay.exceptions import LinkPlayInvalidDataException, LinkPlayRequestException
+from linkplay.utils import deprecated
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+    from async_upnp_client.utils import CaseInsensitiveDict
 
 
 @deprecated(
@@ -70,6 +72,8 @@ async def discover_linkplay_bridges(
     session: ClientSession, discovery_through_multiroom: bool = True
 ) -> list[LinkPlayBridge]:
     """Attempts to discover LinkPlay devices on the local network."""
+    from async_upnp_client.search import async_search
+
     bridges: dict[str, LinkPlayBridge] = {}
 
     async def add_linkplay_device_to_list(upnp_device: CaseInsensitiveDict):
@@ -1,8 +1,20 @@
+from __future__ import annotations
+
 import asyncio
+import time
 from abc import ABC, abstractmethod
-
-from aiohttp import ClientSession
-
+from typing import TYPE_CHECKING
+
+from linkplay.commands import LinkPlayCommandUrls, register_command_urls
+from linkplay.consts import CONNECTOR_LIMIT_PER_HOST, STATUS_COMMANDS
+from linkplay.instrumentation import INSTRUMENTATION, LinkPlayInstrumentation
+from linkplay.resilience import (
+    LinkPlayAdaptiveTimeouts,
+    LinkPlayCircuitBreaker,
+    LinkPlayRetryPolicy,
+    call_with_policies,
+    get_command_class,
+)
 from linkplay.utils import (
     call_tcpuart,
     call_tcpuart_json,
@@ -10,10 +22,15 @@ from linkplay.utils import (
     session_call_api_ok,
 )
 
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 
 class LinkPlayEndpoint(ABC):
     """Represents an abstract LinkPlay endpoint."""
 
+    __slots__ = ()
+
     @abstractmethod
     async def request(self, command: str) -> None:
         """Performs a request on the given command and verifies the result."""
@@ -28,10 +45,33 @@ class LinkPlayEndpoint(ABC):
 
 
 class LinkPlayApiEndpoint(LinkPlayEndpoint):
-    """Represents a LinkPlay HTTP API endpoint."""
+    """Represents a LinkPlay HTTP API endpoint.
+
+    At most concurrency requests are sent to the device at the same time, whatever
+    the limits of the session."""
+
+    __slots__ = (
+        "_endpoint",
+        "_session",
+        "_limiter",
+        "urls",
+        "retry_policy",
+        "circuit_breaker",
+        "timeouts",
+        "instrumentation",
+    )
 
     def __init__(
-        self, *, protocol: str, port: int, endpoint: str, session: ClientSession
+        self,
+        *,
+        protocol: str,
+        port: int,
+        endpoint: str,
+        session: ClientSession,
+        retry_policy: LinkPlayRetryPolicy | None = None,
+        circuit_breaker: LinkPlayCircuitBreaker | None = None,
+        instrumentation: LinkPlayInstrumentation | None = None,
+        concurrency: int = CONNECTOR_LIMIT_PER_HOST,
     ):
         assert protocol in [
             "http",
@@ -42,8 +82,20 @@ class LinkPlayApiEndpoint(LinkPlayEndpoint):
         )
         port_suffix = f":{port}" if include_port else ""
         self._endpoint: str = f"{protocol}://{endpoint}{port_suffix}"
+        self.urls: LinkPlayCommandUrls = register_command_urls(
+            self._endpoint, STATUS_COMMANDS
+        )
 
         self._session: ClientSession = session
+        self._limiter: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self.retry_policy: LinkPlayRetryPolicy = retry_policy or LinkPlayRetryPolicy()
+        self.circuit_breaker: LinkPlayCircuitBreaker = (
+            circuit_breaker or LinkPlayCircuitBreaker()
+        )
+        self.timeouts: LinkPlayAdaptiveTimeouts = LinkPlayAdaptiveTimeouts()
+        self.instrumentation: LinkPlayInstrumentation = (
+            instrumentation or INSTRUMENTATION
+        )
 
     def to_dict(self):
         """Return the state of the LinkPlayEndpoint"""
@@ -51,11 +103,44 @@ class LinkPlayApiEndpoint(LinkPlayEndpoint):
 
     async def request(self, command: str) -> None:
         """Performs a GET request on the given command and verifies the result."""
-        await session_call_api_ok(self._endpoint, self._session, command)
+        if self.instrumentation.enabled:
+            await self.instrumentation.instrument(
+                self._endpoint, command, lambda: self._request(command)
+            )
+        else:
+            await self._request(command)
 
     async def json_request(self, command: str) -> dict[str, str]:
         """Performs a GET request on the given command and returns the result as a JSON object."""
-        return await session_call_api_json(self._endpoint, self._session, command)
+        if self.instrumentation.enabled:
+            return await self.instrumentation.instrument(
+                self._endpoint, command, lambda: self._json_request(command)
+            )
+        return await self._json_request(command)
+
+    async def _request(self, command: str) -> None:
+        async with self._limiter:
+            await call_with_policies(
+                command,
+                lambda timeout: session_call_api_ok(
+                    self._endpoint, self._session, command, timeout
+                ),
+                self.retry_policy,
+                self.circuit_breaker,
+                self.timeouts,
+            )
+
+    async def _json_request(self, command: str) -> dict[str, str]:
+        async with self._limiter:
+            return await call_with_policies(
+                command,
+                lambda timeout: session_call_api_json(
+                    self._endpoint, self._session, command, timeout
+                ),
+                self.retry_policy,
+                self.circuit_breaker,
+                self.timeouts,
+            )
 
     def __str__(self) -> str:
         return self._endpoint
@@ -64,19 +149,60 @@ class LinkPlayApiEndpoint(LinkPlayEndpoint):
 class LinkPlayTcpUartEndpoint(LinkPlayEndpoint):
     """Represents a LinkPlay TCPUART API endpoint."""
 
+    __slots__ = ("_connection", "timeouts", "instrumentation")
+
     def __init__(
-        self, *, connection: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        self,
+        *,
+        connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        instrumentation: LinkPlayInstrumentation | None = None,
     ):
         self._connection = connection
+        self.timeouts: LinkPlayAdaptiveTimeouts = LinkPlayAdaptiveTimeouts()
+        self.instrumentation: LinkPlayInstrumentation = (
+            instrumentation or INSTRUMENTATION
+        )
 
     def to_dict(self):
         """Return the state of the LinkPlayEndpoint"""
         return {}
 
     async def request(self, command: str) -> None:
-        reader, writer = self._connection
-        await call_tcpuart(reader, writer, command)
+        if self.instrumentation.enabled:
+            await self.instrumentation.instrument(
+                str(self), command, lambda: self._request(command)
+            )
+        else:
+            await self._request(command)
 
     async def json_request(self, command: str) -> dict[str, str]:
+        if self.instrumentation.enabled:
+            return await self.instrumentation.instrument(
+                str(self), command, lambda: self._json_request(command)
+            )
+        return await self._json_request(command)
+
+    async def _request(self, command: str) -> None:
         reader, writer = self._connection
-        return await call_tcpuart_json(reader, writer, command)
+        command_class = get_command_class(command)
+        start = time.monotonic()
+        await call_tcpuart(
+            reader, writer, command, self.timeouts.timeout(command_class)
+        )
+        self.timeouts.record(command_class, time.monotonic() - start)
+
+    async def _json_request(self, command: str) -> dict[str, str]:
+        reader, writer = self._connection
+        command_class = get_command_class(command)
+        start = time.monotonic()
+        response = await call_tcpuart_json(
+            reader, writer, command, self.timeouts.timeout(command_class)
+        )
+        self.timeouts.record(command_class, time.monotonic() - start)
+        return response
+
+    def __str__(self) -> str:
+        peername = self._connection[1].get_extra_info("peername")
+        if not peername:
+            return "tcpuart"
+        return f"tcpuart://{peername[0]}:{peername[1]}"
@@ -0,0 +1,107 @@
+"""Event bus dispatching LinkPlay events to their handlers in tasks."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Callable
+
+from linkplay.consts import LOGGER
+
+if TYPE_CHECKING:
+    from linkplay.bridge import LinkPlayBridge
+
+
+class LinkPlayEventType(StrEnum):
+    """Defines the events published on a LinkPlayEventBus."""
+
+    TOPOLOGY_CHANGED = "topology_changed"
+
+
+class LinkPlayEvent:
+    """An event concerning a bridge, or None when it is not known."""
+
+    __slots__ = ("type", "bridge", "data")
+
+    type: LinkPlayEventType
+    bridge: LinkPlayBridge | None
+    data: dict[str, Any]
+
+    def __init__(
+        self,
+        event_type: LinkPlayEventType,
+        bridge: LinkPlayBridge | None,
+        data: dict[str, Any] | None = None,
+    ):
+        self.type = event_type
+        self.bridge = bridge
+        self.data = data or {}
+
+
+EventHandler = Callable[[LinkPlayEvent], Any]
+
+# Keeps a reference to the scheduled tasks until they are done
+_TASKS: set[asyncio.Future[Any]] = set()
+
+
+def _task_done(task: asyncio.Future[Any]) -> None:
+    _TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        LOGGER.error("Event handler failed", exc_info=task.exception())
+
+
+def schedule(result: Any) -> asyncio.Future[Any] | None:
+    """Runs the result of a callback in a task when it is awaitable. Returns the
+    task, which is kept alive until done and logs its exception if any."""
+    if not inspect.isawaitable(result):
+        return None
+    task = asyncio.ensure_future(result)
+    _TASKS.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+class LinkPlayEventBus:
+    """Dispatches published events to the handlers subscribed to their type.
+
+    Handlers are called without blocking the publisher: the awaitable returned by
+    an async handler runs in its own task, concurrently with the other handlers."""
+
+    handlers: dict[LinkPlayEventType, list[EventHandler]]
+    tasks: set[asyncio.Future[Any]]
+
+    def __init__(self) -> None:
+        self.handlers = {}
+        self.tasks = set()
+
+    def subscribe(
+        self, event_type: LinkPlayEventType, handler: EventHandler
+    ) -> Callable[[], None]:
+        """Subscribes the handler to the events of the given type. Returns a function
+        unsubscribing it."""
+        handlers = self.handlers.setdefault(event_type, [])
+        handlers.append(handler)
+
+        def unsubscribe() -> None:
+            if handler in handlers:
+                handlers.remove(handler)
+
+        return unsubscribe
+
+    def publish(self, event: LinkPlayEvent) -> None:
+        """Calls the handlers of the event and schedules those which are async."""
+        for handler in list(self.handlers.get(event.type, ())):
+            try:
+                task = schedule(handler(event))
+            except Exception:  # A failing handler must not break the publisher
+                LOGGER.exception("Event handler %s failed", handler)
+                continue
+            if task is not None:
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def drain(self) -> None:
+        """Waits until the scheduled handlers are done."""
+        while self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
@@ -9,6 +9,18 @@ class LinkPlayRequestException(LinkPlayException):
     """Exception raised for errors in LinkPlay requests."""
 
 
+class LinkPlayRequestTimeoutException(LinkPlayRequestException):
+    """Exception raised when a LinkPlay request times out."""
+
+
+class LinkPlayRequestRejectedException(LinkPlayRequestException):
+    """Exception raised when a LinkPlay device answers but rejects a request."""
+
+
+class LinkPlayCircuitOpenException(LinkPlayRequestException):
+    """Exception raised when requests to a LinkPlay endpoint fail fast because it is down."""
+
+
 class LinkPlayRequestCancelledException(LinkPlayException):
     """Exception raised when a LinkPlay request is cancelled."""
 
@@ -19,3 +31,7 @@ class LinkPlayInvalidDataException(LinkPlayException):
     def __init__(self, message: str = "Invalid data received", data: str | None = None):
         super().__init__(message)
         self.data = data
+
+
+class LinkPlayShardException(LinkPlayException):
+    """Exception raised when a shard of a sharded controller is unavailable or fails."""
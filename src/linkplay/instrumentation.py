@@ -0,0 +1,304 @@
+"""Instrumentation hooks and request metrics for LinkPlay endpoints."""
+
+import bisect
+import math
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, TypeVar
+
+from linkplay.consts import (
+    LOGGER,
+    REQUEST_LATENCY_BUCKETS,
+    REQUEST_LATENCY_WINDOW,
+    LinkPlayCommand,
+    TimedOperation,
+)
+from linkplay.exceptions import (
+    LinkPlayCircuitOpenException,
+    LinkPlayRequestTimeoutException,
+)
+
+_T = TypeVar("_T")
+
+_CONSTANT_COMMANDS: frozenset[str] = frozenset(
+    command for command in LinkPlayCommand if "{" not in command
+)
+_TEMPLATED_COMMANDS: list[tuple[str, str]] = sorted(
+    (
+        (command.partition("{")[0], command.value)
+        for command in LinkPlayCommand
+        if "{" in command
+    ),
+    key=lambda prefix_command: len(prefix_command[0]),
+    reverse=True,
+)
+
+
+@lru_cache(maxsize=512)
+def get_command_name(command: str) -> str:
+    """Returns the unformatted LinkPlayCommand of a formatted command.
+
+    Commands with arguments are grouped by their template, e.g. all volume
+    commands are reported as 'setPlayerCmd:vol:{}'."""
+    if command in _CONSTANT_COMMANDS:
+        return command
+    for prefix, template in _TEMPLATED_COMMANDS:
+        if command.startswith(prefix):
+            return template
+    return command
+
+
+class LinkPlayRequestEvent:
+    """Describes a single request performed by an endpoint, including retries."""
+
+    command: str
+    endpoint: str
+    start: float
+    latency: float
+    bytes: int
+    status: int | None
+    exception: type[BaseException] | None
+
+    def __init__(self, command: str, endpoint: str):
+        self.command = command
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.latency = 0.0
+        self.bytes = 0
+        self.status = None
+        self.exception = None
+
+    @property
+    def failed(self) -> bool:
+        """Returns if the request raised an exception."""
+        return self.exception is not None
+
+    @property
+    def timed_out(self) -> bool:
+        """Returns if the request timed out."""
+        return self.exception is not None and issubclass(
+            self.exception, LinkPlayRequestTimeoutException
+        )
+
+
+RequestHook = Callable[[LinkPlayRequestEvent], Any]
+# Called with the operation and its duration in seconds
+DurationHook = Callable[[TimedOperation, float], Any]
+
+_CURRENT_REQUEST: ContextVar[LinkPlayRequestEvent | None] = ContextVar(
+    "linkplay_current_request", default=None
+)
+
+
+def record_response(status: int | None, response: str | bytes) -> None:
+    """Records the status and size of a response on the instrumented request, if any."""
+    event = _CURRENT_REQUEST.get()
+    if event is None:
+        return
+    event.status = status
+    event.bytes += len(response.encode() if isinstance(response, str) else response)
+
+
+class LinkPlayInstrumentation:
+    """Calls hooks before and after every request of the endpoints using it, and
+    after the poll cycles and discoveries of the library.
+
+    Requests are not wrapped at all while no hooks are registered."""
+
+    start_hooks: list[RequestHook]
+    end_hooks: list[RequestHook]
+    duration_hooks: list[DurationHook]
+    enabled: bool
+
+    def __init__(self) -> None:
+        self.start_hooks = []
+        self.end_hooks = []
+        self.duration_hooks = []
+        self.enabled = False
+
+    def add_request_start_hook(self, hook: RequestHook) -> Callable[[], None]:
+        """Adds a hook called before every request. Returns a function removing it."""
+        return self._add_hook(self.start_hooks, hook)
+
+    def add_request_end_hook(self, hook: RequestHook) -> Callable[[], None]:
+        """Adds a hook called after every request. Returns a function removing it."""
+        return self._add_hook(self.end_hooks, hook)
+
+    def add_duration_hook(self, hook: DurationHook) -> Callable[[], None]:
+        """Adds a hook called after every poll cycle and discovery of the library.
+        Returns a function removing it."""
+        self.duration_hooks.append(hook)
+
+        def remove() -> None:
+            if hook in self.duration_hooks:
+                self.duration_hooks.remove(hook)
+
+        return remove
+
+    @contextmanager
+    def measure(self, operation: TimedOperation) -> Iterator[None]:
+        """Reports the duration of the operation to the duration hooks, if any."""
+        if not self.duration_hooks:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            for hook in list(self.duration_hooks):
+                try:
+                    hook(operation, duration)
+                except Exception:
+                    LOGGER.exception("Instrumentation hook %s failed", hook)
+
+    def _add_hook(
+        self, hooks: list[RequestHook], hook: RequestHook
+    ) -> Callable[[], None]:
+        hooks.append(hook)
+        self.enabled = True
+
+        def remove() -> None:
+            if hook in hooks:
+                hooks.remove(hook)
+            self.enabled = bool(self.start_hooks or self.end_hooks)
+
+        return remove
+
+    async def instrument(
+        self, endpoint: str, command: str, call: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Performs the request while reporting it to the registered hooks."""
+        event = LinkPlayRequestEvent(command, endpoint)
+        self._call_hooks(self.start_hooks, event)
+        token = _CURRENT_REQUEST.set(event)
+        try:
+            return await call()
+        except BaseException as exc:
+            event.exception = type(exc)
+            raise
+        finally:
+            _CURRENT_REQUEST.reset(token)
+            event.latency = time.perf_counter() - event.start
+            self._call_hooks(self.end_hooks, event)
+
+    @staticmethod
+    def _call_hooks(hooks: list[RequestHook], event: LinkPlayRequestEvent) -> None:
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                LOGGER.exception("Instrumentation hook %s failed", hook)
+
+
+INSTRUMENTATION = LinkPlayInstrumentation()
+"""The instrumentation used by endpoints created without an explicit one."""
+
+
+class LinkPlayRequestMetrics:
+    """Latency histogram and error counters of a group of requests.
+
+    Latencies are counted in fixed buckets, while the most recent latencies are kept
+    to calculate percentiles."""
+
+    buckets: tuple[float, ...]
+    bucket_counts: list[int]
+    count: int
+    total: float
+    bytes: int
+    errors: int
+    timeouts: int
+    latencies: deque[float]
+
+    def __init__(self, buckets: tuple[float, ...] = REQUEST_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.bytes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latencies = deque(maxlen=REQUEST_LATENCY_WINDOW)
+
+    def observe(self, event: LinkPlayRequestEvent) -> None:
+        """Adds the request to the metrics."""
+        if event.exception is not None:
+            self.errors += 1
+            if event.timed_out:
+                self.timeouts += 1
+            # Rejected requests never reached the device
+            if issubclass(event.exception, LinkPlayCircuitOpenException):
+                return
+
+        self.record(event.latency, event.bytes)
+
+    def record(self, latency: float, size: int = 0) -> None:
+        """Adds a latency in seconds, and the size of the response, to the metrics."""
+        self.count += 1
+        self.total += latency
+        self.bytes += size
+        self.bucket_counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.latencies.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Returns the latency percentile (0 to 1) of the recent requests."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the state of the LinkPlayRequestMetrics."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes": self.bytes,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+        }
+
+
+class LinkPlayRequestStats:
+    """Request end hook collecting request metrics per command and per endpoint."""
+
+    commands: dict[str, LinkPlayRequestMetrics]
+    endpoints: dict[str, LinkPlayRequestMetrics]
+
+    def __init__(self) -> None:
+        self.commands = {}
+        self.endpoints = {}
+
+    def __call__(self, event: LinkPlayRequestEvent) -> None:
+        command = get_command_name(event.command)
+        if (command_metrics := self.commands.get(command)) is None:
+            command_metrics = self.commands[command] = LinkPlayRequestMetrics()
+        if (endpoint_metrics := self.endpoints.get(event.endpoint)) is None:
+            endpoint_metrics = self.endpoints[event.endpoint] = LinkPlayRequestMetrics()
+        command_metrics.observe(event)
+        endpoint_metrics.observe(event)
+
+    def slowest_endpoints(self, percentile: float = 0.99) -> list[tuple[str, float]]:
+        """Returns the endpoints sorted by their latency percentile, slowest first."""
+        latencies = [
+            (endpoint, latency)
+            for endpoint, metrics in self.endpoints.items()
+            if (latency := metrics.percentile(percentile)) is not None
+        ]
+        return sorted(latencies, key=lambda item: item[1], reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the state of the LinkPlayRequestStats."""
+        return {
+            "commands": {
+                command: metrics.to_dict() for command, metrics in self.commands.items()
+            },
+            "endpoints": {
+                endpoint: metrics.to_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+        }
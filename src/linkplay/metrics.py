@@ -0,0 +1,267 @@
+"""OpenMetrics exporter for the health of LinkPlay devices."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from linkplay.consts import (
+    DISCOVERY_DURATION_BUCKETS,
+    METRICS_PORT,
+    POLL_DURATION_BUCKETS,
+    DeviceAttribute,
+    TimedOperation,
+)
+from linkplay.instrumentation import (
+    INSTRUMENTATION,
+    LinkPlayInstrumentation,
+    LinkPlayRequestMetrics,
+    LinkPlayRequestStats,
+)
+
+if TYPE_CHECKING:
+    from aiohttp.web import AppRunner, Request, Response
+
+    from linkplay.controller import LinkPlayController
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Map between the exported device gauges and the device attribute they are read from
+DEVICE_GAUGES: dict[str, tuple[DeviceAttribute, str]] = {
+    "linkplay_device_rssi_dbm": (DeviceAttribute.RSSI, "WiFi signal strength."),
+    "linkplay_device_wlan_snr_db": (
+        DeviceAttribute.WLAN_SNR,
+        "WiFi signal to noise ratio.",
+    ),
+    "linkplay_device_wlan_data_rate_mbps": (
+        DeviceAttribute.WLAN_DATA_RATE,
+        "WiFi data rate.",
+    ),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram(
+    lines: list[str],
+    name: str,
+    description: str,
+    series: dict[str, LinkPlayRequestMetrics],
+    label: str | None,
+) -> None:
+    lines.append(f"# TYPE {name} histogram")
+    lines.append(f"# UNIT {name} seconds")
+    lines.append(f"# HELP {name} {description}")
+    for key, metrics in series.items():
+        labels = {label: key} if label else {}
+        bounds = [_format_number(float(bound)) for bound in metrics.buckets]
+        cumulative = 0
+        for le, count in zip((*bounds, "+Inf"), metrics.bucket_counts, strict=True):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(labels | {'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_format_number(metrics.total)}")
+        lines.append(f"{name}_count{_labels(labels)} {metrics.count}")
+
+
+def _counter(
+    lines: list[str],
+    name: str,
+    description: str,
+    values: dict[str, int],
+    label: str,
+) -> None:
+    lines.append(f"# TYPE {name} counter")
+    lines.append(f"# HELP {name} {description}")
+    for key, value in values.items():
+        lines.append(f"{name}_total{_labels({label: key})} {value}")
+
+
+def _gauge(
+    lines: list[str],
+    name: str,
+    description: str,
+    values: list[tuple[dict[str, str], float]],
+) -> None:
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"# HELP {name} {description}")
+    for labels, value in values:
+        lines.append(f"{name}{_labels(labels)} {_format_number(value)}")
+
+
+class LinkPlayMetrics:
+    """Collects the request, polling and discovery metrics of a LinkPlayController
+    and renders them in the OpenMetrics text format.
+
+    The poll cycles and discoveries of the library are measured through the
+    instrumentation, time_poll_cycle and time_discovery measure those of the
+    caller."""
+
+    controller: LinkPlayController | None
+    requests: LinkPlayRequestStats
+    poll_cycles: LinkPlayRequestMetrics
+    discoveries: LinkPlayRequestMetrics
+
+    def __init__(
+        self,
+        controller: LinkPlayController | None = None,
+        instrumentation: LinkPlayInstrumentation = INSTRUMENTATION,
+    ):
+        self.controller = controller
+        self.requests = LinkPlayRequestStats()
+        self.poll_cycles = LinkPlayRequestMetrics(POLL_DURATION_BUCKETS)
+        self.discoveries = LinkPlayRequestMetrics(DISCOVERY_DURATION_BUCKETS)
+        self._remove_hook = instrumentation.add_request_end_hook(self.requests)
+        self._remove_duration_hook = instrumentation.add_duration_hook(
+            self._record_duration
+        )
+
+    def close(self) -> None:
+        """Stops collecting request, polling and discovery metrics."""
+        self._remove_hook()
+        self._remove_duration_hook()
+
+    def _record_duration(self, operation: TimedOperation, duration: float) -> None:
+        if operation == TimedOperation.POLL_CYCLE:
+            self.poll_cycles.record(duration)
+        elif operation == TimedOperation.DISCOVERY:
+            self.discoveries.record(duration)
+
+    @contextmanager
+    def time_poll_cycle(self) -> Iterator[None]:
+        """Measures the duration of a cycle polling the devices."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.poll_cycles.record(time.perf_counter() - start)
+
+    @contextmanager
+    def time_discovery(self) -> Iterator[None]:
+        """Measures the duration of a discovery of the devices."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.discoveries.record(time.perf_counter() - start)
+
+    def render(self) -> str:
+        """Returns the metrics in the OpenMetrics text format."""
+        lines: list[str] = []
+        _histogram(
+            lines,
+            "linkplay_request_duration_seconds",
+            "Duration of requests per endpoint.",
+            self.requests.endpoints,
+            "endpoint",
+        )
+        _histogram(
+            lines,
+            "linkplay_command_duration_seconds",
+            "Duration of requests per command.",
+            self.requests.commands,
+            "command",
+        )
+        _counter(
+            lines,
+            "linkplay_request_errors",
+            "Failed requests per endpoint.",
+            {key: value.errors for key, value in self.requests.endpoints.items()},
+            "endpoint",
+        )
+        _counter(
+            lines,
+            "linkplay_request_timeouts",
+            "Timed out requests per endpoint.",
+            {key: value.timeouts for key, value in self.requests.endpoints.items()},
+            "endpoint",
+        )
+        _histogram(
+            lines,
+            "linkplay_poll_cycle_duration_seconds",
+            "Duration of the cycles polling the devices.",
+            {"": self.poll_cycles},
+            None,
+        )
+        _histogram(
+            lines,
+            "linkplay_discovery_duration_seconds",
+            "Duration of the discoveries of the devices.",
+            {"": self.discoveries},
+            None,
+        )
+        if self.controller is not None:
+            self._render_controller(lines, self.controller)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_controller(lines: list[str], controller: LinkPlayController) -> None:
+        _gauge(
+            lines,
+            "linkplay_bridges",
+            "Number of known devices.",
+            [({}, len(controller.bridges))],
+        )
+        _gauge(
+            lines,
+            "linkplay_multiroom_groups",
+            "Number of multiroom groups.",
+            [({}, len(controller.multirooms))],
+        )
+        _gauge(
+            lines,
+            "linkplay_multiroom_followers",
+            "Number of followers per multiroom group.",
+            [
+                ({"leader": multiroom.leader.device.uuid}, len(multiroom.followers))
+                for multiroom in controller.multirooms
+            ],
+        )
+        for name, (attribute, description) in DEVICE_GAUGES.items():
+            values: list[tuple[dict[str, str], float]] = []
+            for bridge in controller.bridges:
+                try:
+                    value = float(bridge.device.properties.get(attribute, ""))
+                except ValueError:
+                    continue
+                labels = {"uuid": bridge.device.uuid, "name": bridge.device.name}
+                values.append((labels, value))
+            _gauge(lines, name, description, values)
+
+    async def handle_metrics(self, request: Request) -> Response:
+        """Serves the metrics to a scraper."""
+        from aiohttp import web
+
+        return web.Response(
+            body=self.render().encode(),
+            headers={"Content-Type": OPENMETRICS_CONTENT_TYPE},
+        )
+
+
+async def start_metrics_server(
+    metrics: LinkPlayMetrics, host: str = "127.0.0.1", port: int = METRICS_PORT
+) -> AppRunner:
+    """Serves the metrics on http://host:port/metrics. Returns the runner to stop it."""
+    from aiohttp import web
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics.handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,122 @@
+"""Decoding of the JSON responses, optionally batched and offloaded from the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+
+from linkplay.consts import PARSE_OFFLOAD_THRESHOLD
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# Stands for a response the batch failed to decode, decoded again on the event loop
+_INVALID = None
+
+
+@lru_cache(maxsize=1)
+def get_json_loads() -> Callable[[str], Any]:
+    """Returns orjson.loads when orjson is installed, json.loads otherwise."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def parse_batch(texts: list[str]) -> list[Any]:
+    """Decodes the JSON texts. Texts which are not valid JSON decode to None."""
+    loads = get_json_loads()
+    results = []
+    for text in texts:
+        try:
+            results.append(loads(text))
+        except ValueError:
+            results.append(_INVALID)
+    return results
+
+
+class LinkPlayJsonParser:
+    """Decodes the JSON responses of the requests.
+
+    Responses are decoded right away while the parser is disabled. Once enabled,
+    the responses received during an iteration of the event loop are decoded as a
+    batch, in the executor when the batch has at least threshold responses. Only
+    the responses of the status commands go through the parser."""
+
+    enabled: bool
+    threshold: int
+    executor: Executor | None
+    pending: list[tuple[str, asyncio.Future[Any]]]
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.threshold = PARSE_OFFLOAD_THRESHOLD
+        self.executor = None
+        self.pending = []
+        self._flush_handle: asyncio.Handle | None = None
+
+    def enable(
+        self,
+        threshold: int = PARSE_OFFLOAD_THRESHOLD,
+        executor: Executor | None = None,
+    ) -> None:
+        """Batches the decoding, offloaded to the executor from threshold responses.
+        The default executor of the loop is used when none is given."""
+        self.enabled = True
+        self.threshold = threshold
+        self.executor = executor
+
+    def disable(self) -> None:
+        """Decodes the responses right away again."""
+        self.enabled = False
+
+    async def loads(self, text: str) -> Any:
+        """Decodes the JSON text. Raises json.JSONDecodeError if it is invalid."""
+        if not self.enabled:
+            return json.loads(text)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self.pending.append((text, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        result = await future
+        if result is _INVALID and text.strip() != "null":
+            return json.loads(text)
+        return result
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        batch, self.pending = self.pending, []
+        texts = [text for text, _ in batch]
+        if len(batch) < self.threshold:
+            _resolve(batch, parse_batch(texts))
+            return
+
+        offloaded = asyncio.get_running_loop().run_in_executor(
+            self.executor, parse_batch, texts
+        )
+        offloaded.add_done_callback(lambda done: _resolve_offloaded(batch, done))
+
+
+def _resolve(batch: list[tuple[str, asyncio.Future[Any]]], results: list[Any]) -> None:
+    for (_, future), result in zip(batch, results, strict=True):
+        if not future.done():
+            future.set_result(result)
+
+
+def _resolve_offloaded(
+    batch: list[tuple[str, asyncio.Future[Any]]], done: asyncio.Future[list[Any]]
+) -> None:
+    if done.cancelled() or done.exception() is not None:
+        # Let every request decode its own response instead
+        _resolve(batch, [_INVALID] * len(batch))
+        return
+    _resolve(batch, done.result())
+
+
+PARSER = LinkPlayJsonParser()
+"""The parser decoding the JSON responses of the API requests."""
@@ -0,0 +1,207 @@
+"""Append-only log recording the state changes of LinkPlay bridges over time."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from linkplay.consts import RECORDER_BLOCK_RECORDS
+from linkplay.exceptions import LinkPlayException
+
+if TYPE_CHECKING:
+    from linkplay.bridge import LinkPlayBridge
+
+RECORDER_MAGIC = b"LPLOG\x01"
+
+# Every block starts with its first and last timestamp, record count and length
+_BLOCK_HEADER = struct.Struct("<ddII")
+
+DEVICE = "device"
+PLAYER = "player"
+
+
+class LinkPlayRecord(NamedTuple):
+    """The properties of a device or player which changed at the given time."""
+
+    timestamp: float
+    uuid: str
+    kind: str
+    changes: dict[str, str]
+
+
+class _Block(NamedTuple):
+    first: float
+    last: float
+    offset: int
+    length: int
+
+
+class LinkPlayRecorder:
+    """Records the changed properties of devices and players in a local log.
+
+    Records are buffered and appended to the log as zlib compressed blocks of
+    block_records records. Queries memory-map the log and only decompress the
+    blocks overlapping the requested time range."""
+
+    path: str
+    block_records: int
+    pending: list[LinkPlayRecord]
+
+    def __init__(self, path: str, block_records: int = RECORDER_BLOCK_RECORDS):
+        self.path = path
+        self.block_records = block_records
+        self.pending = []
+        self._blocks: list[_Block] = []
+        self._file = open(path, "ab+")
+        if self._file.tell() == 0:
+            self._file.write(RECORDER_MAGIC)
+            self._file.flush()
+        self._load_blocks()
+
+    def __enter__(self) -> LinkPlayRecorder:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _load_blocks(self) -> None:
+        with self._map() as data:
+            if data[: len(RECORDER_MAGIC)] != RECORDER_MAGIC:
+                raise LinkPlayException(f"{self.path} is not a LinkPlay log")
+            end = offset = len(RECORDER_MAGIC)
+            while offset + _BLOCK_HEADER.size <= len(data):
+                first, last, _, length = _BLOCK_HEADER.unpack_from(data, offset)
+                offset += _BLOCK_HEADER.size
+                if offset + length > len(data):
+                    break
+                self._blocks.append(_Block(first, last, offset, length))
+                end = offset = offset + length
+            size = len(data)
+
+        if end < size:
+            # Drop the block truncated by an interrupted write, new blocks follow
+            # the last complete one
+            self._file.truncate(end)
+
+    def _map(self) -> mmap.mmap:
+        return mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def attach(self, bridge: LinkPlayBridge) -> Callable[[], None]:
+        """Records the changes of the device and player of the bridge from now on.
+        Returns a function detaching the recorder from the bridge."""
+        removers = [
+            bridge.device.add_listener(
+                lambda changes: self.record(bridge.device.uuid, DEVICE, changes)
+            ),
+            bridge.player.add_listener(
+                lambda changes: self.record(bridge.device.uuid, PLAYER, changes)
+            ),
+        ]
+
+        def detach() -> None:
+            for remove in removers:
+                remove()
+
+        return detach
+
+    def record(
+        self,
+        uuid: str,
+        kind: str,
+        changes: dict[str, str],
+        timestamp: float | None = None,
+    ) -> None:
+        """Records the changed properties of the device or player of a bridge."""
+        if timestamp is None:
+            timestamp = time.time()
+        self.pending.append(LinkPlayRecord(timestamp, uuid, kind, dict(changes)))
+        if len(self.pending) >= self.block_records:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the pending records to the log."""
+        if not self.pending:
+            return
+
+        payload = zlib.compress(
+            "\n".join(
+                json.dumps(record, separators=(",", ":")) for record in self.pending
+            ).encode()
+        )
+        offset = self._file.seek(0, os.SEEK_END) + _BLOCK_HEADER.size
+        self._file.write(
+            _BLOCK_HEADER.pack(
+                self.pending[0].timestamp,
+                self.pending[-1].timestamp,
+                len(self.pending),
+                len(payload),
+            )
+            + payload
+        )
+        self._file.flush()
+        self._blocks.append(
+            _Block(
+                self.pending[0].timestamp,
+                self.pending[-1].timestamp,
+                offset,
+                len(payload),
+            )
+        )
+        self.pending = []
+
+    def close(self) -> None:
+        """Flushes the pending records and closes the log."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        uuid: str | None = None,
+        kind: str | None = None,
+    ) -> Iterator[LinkPlayRecord]:
+        """Yields the records from start to end included, in order, optionally only
+        those of a bridge and of its device or player."""
+        low = float("-inf") if start is None else start
+        high = float("inf") if end is None else end
+
+        def matches(record: LinkPlayRecord) -> bool:
+            return (
+                low <= record.timestamp <= high
+                and (uuid is None or record.uuid == uuid)
+                and (kind is None or record.kind == kind)
+            )
+
+        blocks = [
+            block for block in self._blocks if block.last >= low and block.first <= high
+        ]
+        if blocks:
+            with self._map() as data:
+                for block in blocks:
+                    payload = zlib.decompress(
+                        data[block.offset : block.offset + block.length]
+                    )
+                    for line in payload.splitlines():
+                        record = LinkPlayRecord(*json.loads(line))
+                        if matches(record):
+                            yield record
+
+        yield from filter(matches, list(self.pending))
+
+    def replay(
+        self, uuid: str, kind: str, until: float | None = None
+    ) -> dict[str, str]:
+        """Returns the properties of the device or player of a bridge as they were
+        at the given time, rebuilt from the recorded changes."""
+        properties: dict[str, str] = {}
+        for record in self.query(end=until, uuid=uuid, kind=kind):
+            properties.update(record.changes)
+        return {key: value for key, value in properties.items() if value != ""}
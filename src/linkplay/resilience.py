@@ -0,0 +1,261 @@
+"""Retry, circuit breaker and timeout policies for requests to LinkPlay endpoints."""
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from enum import StrEnum
+from typing import Awaitable, Callable, TypeVar
+
+from linkplay.consts import (
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_MULTIPLIER,
+    ADAPTIVE_TIMEOUT_PERCENTILE,
+    ADAPTIVE_TIMEOUT_WINDOW,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    COMMAND_CLASS_TIMEOUTS,
+    IDEMPOTENT_COMMANDS,
+    LOGGER,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_MAX_BACKOFF,
+    SLOW_COMMANDS,
+    STATUS_COMMANDS,
+    CommandClass,
+    LinkPlayCommand,
+)
+from linkplay.exceptions import (
+    LinkPlayCircuitOpenException,
+    LinkPlayInvalidDataException,
+    LinkPlayRequestException,
+    LinkPlayRequestRejectedException,
+    LinkPlayRequestTimeoutException,
+)
+
+_T = TypeVar("_T")
+
+
+def _command_matcher(commands: tuple[LinkPlayCommand, ...]) -> Callable[[str], bool]:
+    """Returns a function checking if a formatted command is one of the given commands."""
+    constant_commands = frozenset(command for command in commands if "{" not in command)
+    command_prefixes = tuple(
+        command.partition("{")[0] for command in commands if "{" in command
+    )
+
+    def matches(command: str) -> bool:
+        return command in constant_commands or command.startswith(command_prefixes)
+
+    return matches
+
+
+_is_idempotent_command = _command_matcher(IDEMPOTENT_COMMANDS)
+_is_status_command = _command_matcher(STATUS_COMMANDS)
+_is_slow_command = _command_matcher(SLOW_COMMANDS)
+
+
+def is_idempotent_command(command: str) -> bool:
+    """Returns if the command can safely be sent again after a failed request."""
+    return _is_idempotent_command(command)
+
+
+def get_command_class(command: str) -> CommandClass:
+    """Returns the class of the given formatted command."""
+    if _is_status_command(command):
+        return CommandClass.STATUS
+    if _is_slow_command(command):
+        return CommandClass.SLOW
+    return CommandClass.CONTROL
+
+
+class LinkPlayRetryPolicy:
+    """Retries failed idempotent commands with jittered exponential backoff."""
+
+    __slots__ = ("attempts", "backoff", "max_backoff")
+
+    attempts: int
+    backoff: float
+    max_backoff: float
+
+    def __init__(
+        self,
+        *,
+        attempts: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+    ):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def should_retry(self, command: str, attempt: int) -> bool:
+        """Returns if the command should be sent again after the given failed attempt."""
+        return attempt + 1 < self.attempts and is_idempotent_command(command)
+
+    def delay(self, attempt: int) -> float:
+        """Returns the delay before retrying after the given failed attempt."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class CircuitState(StrEnum):
+    """Defines the state of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class LinkPlayCircuitBreaker:
+    """Fails requests fast while an endpoint is down.
+
+    After failure_threshold consecutive failed requests the circuit opens and requests
+    are rejected. Every reset_timeout seconds a single request is let through to probe
+    the endpoint; the circuit closes again once a request succeeds."""
+
+    __slots__ = ("failure_threshold", "reset_timeout", "state", "failures", "opened_at")
+
+    failure_threshold: int
+    reset_timeout: float
+    state: CircuitState
+    failures: int
+    opened_at: float
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_request(self) -> None:
+        """Checks if a request may be sent, raises LinkPlayCircuitOpenException if not."""
+        if self.state == CircuitState.CLOSED:
+            return
+
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            raise LinkPlayCircuitOpenException(
+                f"Circuit open after {self.failures} failed requests"
+            )
+
+        # Let this request probe the endpoint, others keep failing fast meanwhile
+        self.state = CircuitState.HALF_OPEN
+        self.opened_at = now
+
+    def record_success(self) -> None:
+        """Records a request which reached the endpoint."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Records a failed request."""
+        self.failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def to_dict(self) -> dict[str, str | int]:
+        """Return the state of the LinkPlayCircuitBreaker."""
+        return {"state": self.state, "failures": self.failures}
+
+
+class LinkPlayAdaptiveTimeouts:
+    """Derives request timeouts per command class from the observed latencies.
+
+    Until enough latencies are observed the maximum timeout of the command class is
+    used. Afterwards the timeout is a multiple of the latency percentile, clamped
+    to the minimum and maximum timeout of the command class."""
+
+    __slots__ = ("latencies", "_timeouts")
+
+    latencies: dict[CommandClass, deque[float]]
+
+    def __init__(self) -> None:
+        self.latencies = {
+            command_class: deque(maxlen=ADAPTIVE_TIMEOUT_WINDOW)
+            for command_class in CommandClass
+        }
+        self._timeouts: dict[CommandClass, float] = {}
+
+    def timeout(self, command_class: CommandClass) -> float:
+        """Returns the timeout in seconds for a command of the given class."""
+        timeout = self._timeouts.get(command_class)
+        if timeout is not None:
+            return timeout
+
+        minimum, maximum = COMMAND_CLASS_TIMEOUTS[command_class]
+        latencies = self.latencies[command_class]
+        if len(latencies) < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            timeout = maximum
+        else:
+            ordered = sorted(latencies)
+            index = math.ceil(ADAPTIVE_TIMEOUT_PERCENTILE * len(ordered)) - 1
+            timeout = min(
+                maximum, max(minimum, ordered[index] * ADAPTIVE_TIMEOUT_MULTIPLIER)
+            )
+
+        self._timeouts[command_class] = timeout
+        return timeout
+
+    def record(self, command_class: CommandClass, latency: float) -> None:
+        """Records the latency of a request in seconds.
+
+        A timed out request is recorded with its timeout, which raises the timeout
+        of following requests when the endpoint becomes slower."""
+        self.latencies[command_class].append(latency)
+        self._timeouts.pop(command_class, None)
+
+    def to_dict(self) -> dict[str, float]:
+        """Return the state of the LinkPlayAdaptiveTimeouts."""
+        return {
+            command_class: self.timeout(command_class) for command_class in CommandClass
+        }
+
+
+async def call_with_policies(
+    command: str,
+    call: Callable[[float], Awaitable[_T]],
+    retry_policy: LinkPlayRetryPolicy,
+    circuit_breaker: LinkPlayCircuitBreaker,
+    timeouts: LinkPlayAdaptiveTimeouts,
+) -> _T:
+    """Performs a request guarded by the circuit breaker, retrying it when allowed.
+
+    The request is called with the adaptive timeout of its command class."""
+    command_class = get_command_class(command)
+    attempt = 0
+    while True:
+        circuit_breaker.before_request()
+        timeout = timeouts.timeout(command_class)
+        start = time.monotonic()
+        try:
+            result = await call(timeout)
+        except (LinkPlayInvalidDataException, LinkPlayRequestRejectedException):
+            # The device answered, so it is up and retrying would not help
+            timeouts.record(command_class, time.monotonic() - start)
+            circuit_breaker.record_success()
+            raise
+        except LinkPlayRequestException as exc:
+            if isinstance(exc, LinkPlayRequestTimeoutException):
+                timeouts.record(command_class, timeout)
+            circuit_breaker.record_failure()
+            if not retry_policy.should_retry(command, attempt):
+                raise
+            delay = retry_policy.delay(attempt)
+            LOGGER.debug("Retrying %s in %.2fs", command, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        timeouts.record(command_class, time.monotonic() - start)
+        circuit_breaker.record_success()
+        return result
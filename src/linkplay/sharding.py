@@ -0,0 +1,436 @@
+"""Controller spreading LinkPlay bridges across shards running in worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import itertools
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+from linkplay import exceptions
+from linkplay.consts import LOGGER, TimedOperation
+from linkplay.exceptions import LinkPlayException, LinkPlayShardException
+from linkplay.instrumentation import INSTRUMENTATION
+
+BridgeState = dict[str, dict[str, str]]
+StateListener = Callable[[str, BridgeState], None]
+
+_STATE = "state"
+_RESULT = "result"
+_ERROR = "error"
+
+
+class ShardStrategy(StrEnum):
+    """Defines how bridges are assigned to shards."""
+
+    HASH = "hash"
+    SUBNET = "subnet"
+    SITE = "site"
+
+
+def _bridge_state(bridge: Any) -> BridgeState:
+    return {
+        "device": dict(bridge.device.properties),
+        "player": dict(bridge.player.properties),
+    }
+
+
+class _PipeWriter:
+    """Sends messages over a pipe in order from a thread, so that sending a large
+    message does not block the event loop."""
+
+    def __init__(self, connection: Connection, name: str):
+        self.connection = connection
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    def send(self, message: tuple[Any, ...]) -> asyncio.Future[None]:
+        """Sends the message after the previously sent ones."""
+        return asyncio.get_running_loop().run_in_executor(
+            self.executor, self.connection.send, message
+        )
+
+    def post(self, message: tuple[Any, ...]) -> None:
+        """Sends the message without waiting for it, logging a failure."""
+        self.send(message).add_done_callback(_log_send_failure)
+
+    def close(self, wait: bool = False) -> None:
+        """Stops sending messages, once the pending ones are sent if wait is set."""
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _log_send_failure(future: asyncio.Future[None]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        LOGGER.warning("Failed to send a shard message: %s", future.exception())
+
+
+class _ShardWorker:
+    """Owns the bridges of a shard inside a worker process."""
+
+    def __init__(self, connection: Connection):
+        from linkplay.bridge import LinkPlayBridge
+
+        self.connection = connection
+        self.writer = _PipeWriter(connection, "linkplay-shard-writer")
+        self.bridges: dict[str, LinkPlayBridge] = {}
+        self.session: Any = None
+        self.polling: asyncio.Task[None] | None = None
+        self.tasks: set[asyncio.Task[None]] = set()
+        self.stopped = asyncio.Event()
+
+    async def run(self) -> None:
+        from linkplay.utils import async_create_unverified_client_session
+
+        self.session = await async_create_unverified_client_session()
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.connection.fileno(), self._receive)
+        try:
+            await self.stopped.wait()
+        finally:
+            loop.remove_reader(self.connection.fileno())
+            if self.polling is not None:
+                self.polling.cancel()
+            for bridge in self.bridges.values():
+                bridge.close()
+            await self.session.close()
+            self.writer.close(wait=True)
+
+    def _receive(self) -> None:
+        try:
+            while self.connection.poll():
+                request_id, operation, args = self.connection.recv()
+                task = asyncio.create_task(self._handle(request_id, operation, args))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        except EOFError:
+            self.stopped.set()
+
+    async def _handle(
+        self, request_id: int, operation: str, args: tuple[Any, ...]
+    ) -> None:
+        try:
+            result = await getattr(self, f"op_{operation}")(*args)
+        except Exception as exc:  # Forwarded to the controller
+            message = (request_id, _ERROR, (type(exc).__name__, str(exc)))
+        else:
+            message = (request_id, _RESULT, result)
+        try:
+            await self.writer.send(message)
+        except Exception:
+            LOGGER.exception("Failed to send the result of %s", operation)
+
+    def _publish(self, uuid: str) -> BridgeState:
+        state = _bridge_state(self.bridges[uuid])
+        self.writer.post((None, _STATE, (uuid, state)))
+        return state
+
+    async def op_add_bridge(self, protocol: str, host: str, port: int) -> str:
+        from linkplay.discovery import linkplay_factory_bridge_endpoint
+        from linkplay.endpoint import LinkPlayApiEndpoint
+
+        endpoint = LinkPlayApiEndpoint(
+            protocol=protocol, port=port, endpoint=host, session=self.session
+        )
+        bridge = await linkplay_factory_bridge_endpoint(endpoint)
+        self.bridges[bridge.device.uuid] = bridge
+        self._publish(bridge.device.uuid)
+        return bridge.device.uuid
+
+    async def op_remove_bridge(self, uuid: str) -> None:
+        bridge = self.bridges.pop(uuid, None)
+        if bridge is not None:
+            bridge.close()
+
+    async def op_command(
+        self, uuid: str, target: str, method: str, args: tuple[Any, ...]
+    ) -> BridgeState:
+        bridge = self.bridges[uuid]
+        await getattr(getattr(bridge, target), method)(*args)
+        return self._publish(uuid)
+
+    async def op_poll(self) -> int:
+        uuids = list(self.bridges)
+        results = await asyncio.gather(
+            *(self.bridges[uuid].player.update_status() for uuid in uuids),
+            return_exceptions=True,
+        )
+        failures = 0
+        for uuid, result in zip(uuids, results, strict=True):
+            if isinstance(result, LinkPlayException):
+                failures += 1
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                self._publish(uuid)
+        return failures
+
+    async def op_start_polling(self, interval: float) -> None:
+        async def poll_forever() -> None:
+            loop = asyncio.get_running_loop()
+            while True:
+                start = loop.time()
+                try:
+                    with INSTRUMENTATION.measure(TimedOperation.POLL_CYCLE):
+                        await self.op_poll()
+                except Exception:
+                    LOGGER.exception("Polling the bridges of the shard failed")
+                await asyncio.sleep(max(0.0, interval - (loop.time() - start)))
+
+        if self.polling is not None:
+            self.polling.cancel()
+        self.polling = asyncio.create_task(poll_forever())
+
+    async def op_stop_polling(self) -> None:
+        if self.polling is not None:
+            self.polling.cancel()
+            self.polling = None
+
+    async def op_stop(self) -> None:
+        self.stopped.set()
+
+
+def _run_shard(connection: Connection) -> None:
+    """Entry point of a shard worker process."""
+    asyncio.run(_ShardWorker(connection).run())
+
+
+class LinkPlayShard:
+    """Handle to a shard running in a worker process."""
+
+    index: int
+    bridges: set[str]
+
+    def __init__(self, index: int, on_state: Callable[[str, BridgeState], None]):
+        self.index = index
+        self.bridges = set()
+        self._on_state = on_state
+        self._connection: Connection | None = None
+        self._writer: _PipeWriter | None = None
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._request_ids = itertools.count()
+
+    def start(self, context: multiprocessing.context.BaseContext) -> None:
+        """Starts the worker process of the shard."""
+        self._connection, worker_connection = context.Pipe()
+        self._writer = _PipeWriter(self._connection, f"linkplay-shard-{self.index}")
+        self._process = context.Process(  # type: ignore[attr-defined]
+            target=_run_shard,
+            args=(worker_connection,),
+            name=f"linkplay-shard-{self.index}",
+            daemon=True,
+        )
+        self._process.start()
+        worker_connection.close()
+        asyncio.get_running_loop().add_reader(self._connection.fileno(), self._receive)
+
+    async def stop(self) -> None:
+        """Stops the worker process of the shard."""
+        if self._connection is None or self._process is None:
+            return
+        try:
+            await self.call("stop")
+        except LinkPlayShardException:
+            pass
+        self._close()
+        await asyncio.get_running_loop().run_in_executor(None, self._process.join, 5)
+        if self._process.is_alive():
+            self._process.terminate()
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._connection is not None:
+            asyncio.get_running_loop().remove_reader(self._connection.fileno())
+            self._connection.close()
+            self._connection = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(
+                    LinkPlayShardException(f"Shard {self.index} stopped")
+                )
+        self._pending.clear()
+
+    async def call(self, operation: str, *args: Any) -> Any:
+        """Performs the operation in the worker process and returns its result."""
+        if self._writer is None:
+            raise LinkPlayShardException(f"Shard {self.index} is not running")
+
+        request_id = next(self._request_ids)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._writer.send((request_id, operation, args))
+        except (OSError, RuntimeError) as exc:
+            self._pending.pop(request_id, None)
+            raise LinkPlayShardException(f"Shard {self.index} stopped") from exc
+        return await future
+
+    def _receive(self) -> None:
+        assert self._connection is not None
+        try:
+            while self._connection is not None and self._connection.poll():
+                request_id, kind, payload = self._connection.recv()
+                if kind == _STATE:
+                    self._on_state(*payload)
+                    continue
+
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if kind == _ERROR:
+                    future.set_exception(_shard_exception(*payload))
+                else:
+                    future.set_result(payload)
+        except (EOFError, OSError):
+            LOGGER.warning("Shard %s stopped unexpectedly", self.index)
+            self._close()
+
+
+def _shard_exception(name: str, message: str) -> LinkPlayException:
+    exception_class = getattr(exceptions, name, None)
+    if isinstance(exception_class, type) and issubclass(
+        exception_class, LinkPlayException
+    ):
+        return exception_class(message)
+    return LinkPlayShardException(f"{name}: {message}")
+
+
+class LinkPlayShardedController:
+    """Spreads LinkPlay bridges across shards, each running in a worker process with
+    its own event loop and client session.
+
+    Commands are forwarded to the shard owning the bridge, while the states
+    published by all shards are merged into states and passed to the listeners."""
+
+    strategy: ShardStrategy
+    shards: list[LinkPlayShard]
+    states: dict[str, BridgeState]
+
+    def __init__(
+        self,
+        shards: int | None = None,
+        strategy: ShardStrategy = ShardStrategy.HASH,
+    ):
+        self.strategy = strategy
+        self.shards = [
+            LinkPlayShard(index, self._on_state)
+            for index in range(shards or os.cpu_count() or 1)
+        ]
+        self.states = {}
+        self._owners: dict[str, LinkPlayShard] = {}
+        self._sites: dict[str, LinkPlayShard] = {}
+        self._listeners: list[StateListener] = []
+
+    async def __aenter__(self) -> LinkPlayShardedController:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Starts the worker processes of all shards."""
+        context = multiprocessing.get_context("spawn")
+        for shard in self.shards:
+            shard.start(context)
+
+    async def stop(self) -> None:
+        """Stops the worker processes of all shards."""
+        await asyncio.gather(*(shard.stop() for shard in self.shards))
+
+    def add_listener(self, listener: StateListener) -> Callable[[], None]:
+        """Adds a listener called with the uuid and state of every updated bridge.
+        Returns a function removing the listener."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _on_state(self, uuid: str, state: BridgeState) -> None:
+        self.states[uuid] = state
+        for listener in list(self._listeners):
+            try:
+                listener(uuid, state)
+            except Exception:  # A failing listener must not stop the shard reader
+                LOGGER.exception("Shard state listener %s failed", listener)
+
+    def select_shard(self, host: str, site: str | None = None) -> LinkPlayShard:
+        """Returns the shard a bridge at the given host is assigned to."""
+        match self.strategy:
+            case ShardStrategy.SITE:
+                key = site or host
+                if key not in self._sites:
+                    # Spread the sites over the least loaded shards
+                    self._sites[key] = min(
+                        self.shards,
+                        key=lambda shard: sum(
+                            owner is shard for owner in self._sites.values()
+                        ),
+                    )
+                return self._sites[key]
+            case ShardStrategy.SUBNET:
+                try:
+                    key = str(ipaddress.ip_network(f"{host}/24", strict=False))
+                except ValueError:
+                    key = host
+            case _:
+                key = host
+        return self.shards[zlib.crc32(key.encode()) % len(self.shards)]
+
+    async def add_bridge(
+        self,
+        host: str,
+        *,
+        port: int = 80,
+        protocol: str = "http",
+        site: str | None = None,
+    ) -> str:
+        """Adds the bridge at the given address to its shard. Returns its uuid."""
+        shard = self.select_shard(host, site)
+        uuid: str = await shard.call("add_bridge", protocol, host, port)
+        self._owners[uuid] = shard
+        shard.bridges.add(uuid)
+        return uuid
+
+    async def remove_bridge(self, uuid: str) -> None:
+        """Removes the bridge from its shard."""
+        shard = self._owners.pop(uuid)
+        shard.bridges.discard(uuid)
+        self.states.pop(uuid, None)
+        await shard.call("remove_bridge", uuid)
+
+    async def command(
+        self, uuid: str, target: str, method: str, *args: Any
+    ) -> BridgeState:
+        """Calls the method of the device or player of the bridge in its shard,
+        e.g. command(uuid, "player", "set_volume", 20). Returns the new state."""
+        if target not in ("device", "player"):
+            raise ValueError("Target must be either 'device' or 'player'")
+        shard = self._owners.get(uuid)
+        if shard is None:
+            raise LinkPlayShardException(f"Unknown bridge {uuid}")
+        return await shard.call("command", uuid, target, method, args)  # type: ignore[no-any-return]
+
+    async def poll(self) -> int:
+        """Polls the player status of all bridges, with all shards in parallel.
+        Returns the number of bridges which failed to update."""
+        with INSTRUMENTATION.measure(TimedOperation.POLL_CYCLE):
+            failures = await asyncio.gather(
+                *(shard.call("poll") for shard in self.shards)
+            )
+        return sum(failures)
+
+    async def start_polling(self, interval: float) -> None:
+        """Lets every shard poll its bridges every interval seconds."""
+        await asyncio.gather(
+            *(shard.call("start_polling", interval) for shard in self.shards)
+        )
+
+    async def stop_polling(self) -> None:
+        """Stops the polling of all shards."""
+        await asyncio.gather(*(shard.call("stop_polling") for shard in self.shards))
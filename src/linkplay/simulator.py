@@ -0,0 +1,471 @@
+"""Simulated LinkPlay devices served on localhost, for load and regression testing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import socket
+import time
+import uuid
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import unquote
+
+from aiohttp import web
+
+from linkplay.consts import (
+    API_ENDPOINT,
+    DeviceAttribute,
+    LinkPlayCommand,
+    LoopMode,
+    MetaInfo,
+    MetaInfoMetaData,
+    MultiroomAttribute,
+    PlayerAttribute,
+    PlayingMode,
+    PlayingStatus,
+)
+from linkplay.endpoint import LinkPlayApiEndpoint, LinkPlayTcpUartEndpoint
+from linkplay.instrumentation import get_command_name
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+    from linkplay.bridge import LinkPlayBridge
+
+API_PATH = API_ENDPOINT.format("", "").partition("?")[0]
+TCPUART_HEADER = bytes.fromhex("18 96 18 20")
+TCPUART_FRAME_HEADER_LENGTH = 20
+_LINKPLAY_COMMANDS: frozenset[str] = frozenset(LinkPlayCommand)
+
+
+def _encode_hexstr(value: str) -> str:
+    return value.encode("utf-8").hex().upper()
+
+
+def _command_argument(command: str, template: str) -> str:
+    prefix, _, suffix = template.partition("{}")
+    return command[len(prefix) : len(command) - len(suffix)]
+
+
+class LinkPlaySimulatedDevice:
+    """A simulated LinkPlay device answering the HTTP API and TCPUART commands.
+
+    Every response is delayed by latency seconds plus an exponentially distributed
+    jitter with a mean of jitter seconds, and fails with the given failure_rate."""
+
+    number: int
+    ip: str
+    host: str
+    port: int
+    tcpuart_port: int | None
+    latency: float
+    jitter: float
+    failure_rate: float
+    device_status: dict[str, str]
+    player_status: dict[str, str]
+    metainfo: dict[str, str]
+    leader: LinkPlaySimulatedDevice | None
+    followers: list[LinkPlaySimulatedDevice]
+    requests: Counter[str]
+
+    def __init__(
+        self,
+        network: dict[str, LinkPlaySimulatedDevice],
+        number: int,
+        *,
+        name: str | None = None,
+        project: str = "UP2STREAM_PRO_V3",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        rng: random.Random | None = None,
+    ):
+        self._network = network
+        self._random = rng or random.Random(number)
+        self.number = number
+        self.ip = f"10.0.{number // 250}.{number % 250 + 1}"
+        self.host = ""
+        self.port = 0
+        self.tcpuart_port = None
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.leader = None
+        self.followers = []
+        self.requests = Counter()
+        self.device_status = {
+            DeviceAttribute.UUID: str(uuid.UUID(int=number + 1)).upper(),
+            DeviceAttribute.DEVICE_NAME: name or f"Speaker {number}",
+            DeviceAttribute.PROJECT: project,
+            DeviceAttribute.FIRMWARE: "4.6.415145",
+            DeviceAttribute.ETH2: self.ip,
+            DeviceAttribute.MAC_ADDRESS: f"00:22:6C:00:{number // 256:02X}:{number % 256:02X}",
+            DeviceAttribute.PLAYMODE_SUPPORT: "0x40006",
+            DeviceAttribute.PRESET_KEY: "6",
+            DeviceAttribute.RSSI: str(-40 - number % 40),
+            DeviceAttribute.WLAN_SNR: str(20 + number % 20),
+            DeviceAttribute.WLAN_DATA_RATE: "390",
+        }
+        self.player_status = {
+            PlayerAttribute.SPEAKER_TYPE: "0",
+            PlayerAttribute.CHANNEL_TYPE: "0",
+            PlayerAttribute.PLAYBACK_MODE: PlayingMode.NETWORK,
+            PlayerAttribute.PLAYLIST_MODE: LoopMode.PLAY_IN_ORDER,
+            PlayerAttribute.EQUALIZER_MODE: "0",
+            PlayerAttribute.PLAYING_STATUS: PlayingStatus.STOPPED,
+            PlayerAttribute.CURRENT_POSITION: "0",
+            PlayerAttribute.TOTAL_LENGTH: "240000",
+            PlayerAttribute.TITLE: _encode_hexstr(f"Track {number}"),
+            PlayerAttribute.ARTIST: _encode_hexstr("Simulated Artist"),
+            PlayerAttribute.ALBUM: _encode_hexstr("Simulated Album"),
+            PlayerAttribute.PLAYLIST_COUNT: "10",
+            PlayerAttribute.PLAYLIST_INDEX: "1",
+            PlayerAttribute.VOLUME: "20",
+            PlayerAttribute.MUTED: "0",
+        }
+        self.metainfo = {
+            MetaInfoMetaData.TRACK_TITLE: f"Track {number}",
+            MetaInfoMetaData.ALBUM_TITLE: "Simulated Album",
+            MetaInfoMetaData.SAMPLE_RATE: "44100",
+            MetaInfoMetaData.BIT_DEPTH: "16",
+        }
+        self._position_timestamp = time.monotonic()
+
+        self._commands: dict[str, Callable[[str], str]] = {
+            LinkPlayCommand.DEVICE_STATUS: lambda _: json.dumps(self.device_status),
+            LinkPlayCommand.PLAYER_STATUS: self._player_status,
+            LinkPlayCommand.META_INFO: lambda _: json.dumps(
+                {MetaInfo.METADATA: self.metainfo}
+            ),
+            LinkPlayCommand.MULTIROOM_LIST: self._multiroom_list,
+            LinkPlayCommand.AUDIO_OUTPUT_HW_MODE: lambda _: json.dumps(
+                {"hardware": "2", "source": "0", "audiocast": "0"}
+            ),
+            LinkPlayCommand.RESUME: lambda _: self._set_playing(PlayingStatus.PLAYING),
+            LinkPlayCommand.PLAY: lambda _: self._set_playing(PlayingStatus.PLAYING),
+            LinkPlayCommand.PAUSE: lambda _: self._set_playing(PlayingStatus.PAUSED),
+            LinkPlayCommand.STOP: lambda _: self._set_playing(PlayingStatus.STOPPED),
+            LinkPlayCommand.TOGGLE: self._toggle,
+            LinkPlayCommand.MUTE: lambda _: self._set(PlayerAttribute.MUTED, "1"),
+            LinkPlayCommand.UNMUTE: lambda _: self._set(PlayerAttribute.MUTED, "0"),
+            LinkPlayCommand.VOLUME: lambda value: self._set(
+                PlayerAttribute.VOLUME, value
+            ),
+            LinkPlayCommand.SEEK: self._seek,
+            LinkPlayCommand.LOOP_MODE: lambda value: self._set(
+                PlayerAttribute.PLAYLIST_MODE, value
+            ),
+            LinkPlayCommand.EQUALIZER_MODE: lambda value: self._set(
+                PlayerAttribute.EQUALIZER_MODE, value
+            ),
+            LinkPlayCommand.SWITCH_MODE: lambda _: "OK",
+            LinkPlayCommand.MULTIROOM_JOIN: self._join,
+            LinkPlayCommand.MULTIROOM_KICK: self._kick,
+            LinkPlayCommand.MULTIROOM_UNGROUP: lambda _: self._ungroup(),
+            LinkPlayCommand.MULTIROOM_VOL: self._multiroom_volume,
+            LinkPlayCommand.MULTIROOM_MUTE: lambda _: self._multiroom_mute("1"),
+            LinkPlayCommand.MULTIROOM_UNMUTE: lambda _: self._multiroom_mute("0"),
+        }
+
+    @property
+    def uuid(self) -> str:
+        """The UUID of the device."""
+        return self.device_status[DeviceAttribute.UUID]
+
+    @property
+    def name(self) -> str:
+        """The name of the device."""
+        return self.device_status[DeviceAttribute.DEVICE_NAME]
+
+    async def respond(self, command: str) -> str | None:
+        """Returns the response to the command, or None when the request fails."""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.expovariate(1 / self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return None
+        return self.handle(command)
+
+    def handle(self, command: str) -> str:
+        """Executes the command and returns the response of the device."""
+        template = get_command_name(command)
+        self.requests[template] += 1
+        handler = self._commands.get(template)
+        if handler is None:
+            return "OK" if template in _LINKPLAY_COMMANDS else "unknown command"
+        return handler(_command_argument(command, template))
+
+    def _set(self, attribute: PlayerAttribute, value: str) -> str:
+        self.player_status[attribute] = value
+        return "OK"
+
+    def _position(self) -> int:
+        position = int(self.player_status[PlayerAttribute.CURRENT_POSITION])
+        if self.player_status[PlayerAttribute.PLAYING_STATUS] == PlayingStatus.PLAYING:
+            elapsed = int((time.monotonic() - self._position_timestamp) * 1000)
+            position += elapsed
+        return min(position, int(self.player_status[PlayerAttribute.TOTAL_LENGTH]))
+
+    def _player_status(self, _: str) -> str:
+        status = self.player_status | {
+            PlayerAttribute.CURRENT_POSITION: str(self._position())
+        }
+        return json.dumps(status)
+
+    def _set_playing(self, status: PlayingStatus) -> str:
+        position = 0 if status == PlayingStatus.STOPPED else self._position()
+        self.player_status[PlayerAttribute.CURRENT_POSITION] = str(position)
+        self._position_timestamp = time.monotonic()
+        return self._set(PlayerAttribute.PLAYING_STATUS, status)
+
+    def _toggle(self, _: str) -> str:
+        if self.player_status[PlayerAttribute.PLAYING_STATUS] == PlayingStatus.PLAYING:
+            return self._set_playing(PlayingStatus.PAUSED)
+        return self._set_playing(PlayingStatus.PLAYING)
+
+    def _seek(self, value: str) -> str:
+        self.player_status[PlayerAttribute.CURRENT_POSITION] = str(int(value) * 1000)
+        self._position_timestamp = time.monotonic()
+        return "OK"
+
+    def _multiroom_list(self, _: str) -> str:
+        return json.dumps(
+            {
+                MultiroomAttribute.NUM_FOLLOWERS: len(self.followers),
+                MultiroomAttribute.FOLLOWER_LIST: [
+                    {
+                        "name": follower.name,
+                        MultiroomAttribute.UUID: follower.uuid,
+                        MultiroomAttribute.IP: follower.ip,
+                        "volume": follower.player_status[PlayerAttribute.VOLUME],
+                        "mute": follower.player_status[PlayerAttribute.MUTED],
+                    }
+                    for follower in self.followers
+                ],
+            }
+        )
+
+    def _join(self, ip: str) -> str:
+        leader = self._network.get(ip)
+        if leader is None or leader is self:
+            return "Failed"
+        self.join(leader)
+        return "OK"
+
+    def _kick(self, ip: str) -> str:
+        follower = self._network.get(ip)
+        if follower is None or follower not in self.followers:
+            return "Failed"
+        follower.leave()
+        return "OK"
+
+    def _ungroup(self) -> str:
+        if self.leader is not None:
+            self.leave()
+        for follower in list(self.followers):
+            follower.leave()
+        return "OK"
+
+    def _multiroom_volume(self, value: str) -> str:
+        for device in (self, *self.followers):
+            device.player_status[PlayerAttribute.VOLUME] = value
+        return "OK"
+
+    def _multiroom_mute(self, value: str) -> str:
+        for device in (self, *self.followers):
+            device.player_status[PlayerAttribute.MUTED] = value
+        return "OK"
+
+    def join(self, leader: LinkPlaySimulatedDevice) -> None:
+        """Makes the device follow the given leader."""
+        self.leave()
+        for follower in list(self.followers):
+            follower.leave()
+        self.leader = leader
+        leader.followers.append(self)
+
+    def leave(self) -> None:
+        """Removes the device from the group it follows, if any."""
+        if self.leader is not None:
+            self.leader.followers.remove(self)
+            self.leader = None
+
+
+class LinkPlaySimulator:
+    """Serves simulated LinkPlay devices on localhost.
+
+    Every device listens on its own local port for the HTTP API, and optionally on
+    another one for TCPUART. Devices report a unique virtual IP address, which is
+    used to resolve multiroom join and kick commands between the devices."""
+
+    host: str
+    devices: list[LinkPlaySimulatedDevice]
+
+    def __init__(self, host: str = "127.0.0.1", seed: int | None = None):
+        self.host = host
+        self.devices = []
+        self._network: dict[str, LinkPlaySimulatedDevice] = {}
+        self._addresses: dict[int, LinkPlaySimulatedDevice] = {}
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._tcpuart_servers: list[asyncio.Server] = []
+
+    async def __aenter__(self) -> LinkPlaySimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def add_device(
+        self, *, tcpuart: bool = False, **kwargs: Any
+    ) -> LinkPlaySimulatedDevice:
+        """Adds a simulated device. See LinkPlaySimulatedDevice for the options.
+
+        Devices added after the simulator is started must be started with
+        start_device."""
+        device = LinkPlaySimulatedDevice(
+            self._network,
+            len(self.devices),
+            rng=random.Random(self._random.random()),
+            **kwargs,
+        )
+        device.tcpuart_port = 0 if tcpuart else None
+        self.devices.append(device)
+        self._network[device.ip] = device
+        return device
+
+    def add_devices(self, count: int, **kwargs: Any) -> list[LinkPlaySimulatedDevice]:
+        """Adds the given number of simulated devices with the same options."""
+        return [self.add_device(**kwargs) for _ in range(count)]
+
+    @staticmethod
+    def group(
+        leader: LinkPlaySimulatedDevice, followers: list[LinkPlaySimulatedDevice]
+    ) -> None:
+        """Groups the followers with the leader."""
+        for follower in followers:
+            follower.join(leader)
+
+    async def start(self) -> None:
+        """Starts serving all the devices."""
+        app = web.Application()
+        app.router.add_get(API_PATH, self._handle_request)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        for device in self.devices:
+            await self.start_device(device)
+
+    async def start_device(self, device: LinkPlaySimulatedDevice) -> None:
+        """Starts serving the device on a free local port."""
+        assert self._runner is not None, "The simulator is not started"
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, 0))
+        device.host = self.host
+        device.port = sock.getsockname()[1]
+        self._addresses[device.port] = device
+        await web.SockSite(self._runner, sock).start()
+
+        if device.tcpuart_port is not None:
+            server = await asyncio.start_server(
+                lambda reader, writer: self._handle_tcpuart(device, reader, writer),
+                self.host,
+                0,
+            )
+            device.tcpuart_port = server.sockets[0].getsockname()[1]
+            self._tcpuart_servers.append(server)
+
+    async def stop(self) -> None:
+        """Stops serving all the devices."""
+        for server in self._tcpuart_servers:
+            server.close()
+            await server.wait_closed()
+        self._tcpuart_servers.clear()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self._addresses.clear()
+
+    def endpoint(
+        self, device: LinkPlaySimulatedDevice, session: ClientSession, **kwargs: Any
+    ) -> LinkPlayApiEndpoint:
+        """Returns an HTTP API endpoint for the device."""
+        return LinkPlayApiEndpoint(
+            protocol="http",
+            port=device.port,
+            endpoint=device.host,
+            session=session,
+            **kwargs,
+        )
+
+    async def tcpuart_endpoint(
+        self, device: LinkPlaySimulatedDevice
+    ) -> LinkPlayTcpUartEndpoint:
+        """Opens a TCPUART endpoint to the device."""
+        assert device.tcpuart_port, "TCPUART is not enabled for the device"
+        connection = await asyncio.open_connection(device.host, device.tcpuart_port)
+        return LinkPlayTcpUartEndpoint(connection=connection)
+
+    async def bridges(
+        self, session: ClientSession, **kwargs: Any
+    ) -> list[LinkPlayBridge]:
+        """Creates a LinkPlayBridge for every device, like discovery does."""
+        from linkplay.discovery import linkplay_factory_bridge_endpoint
+
+        return list(
+            await asyncio.gather(
+                *(
+                    linkplay_factory_bridge_endpoint(
+                        self.endpoint(device, session, **kwargs)
+                    )
+                    for device in self.devices
+                )
+            )
+        )
+
+    async def _handle_request(self, request: web.Request) -> web.Response:
+        assert request.transport is not None
+        device = self._addresses[request.transport.get_extra_info("sockname")[1]]
+        query = request.rel_url.raw_query_string
+        command = unquote(query.removeprefix("command="))
+
+        response = await device.respond(command)
+        if response is None:
+            return web.Response(status=500, text="Internal Server Error")
+        return web.Response(text=response)
+
+    async def _handle_tcpuart(
+        self,
+        device: LinkPlaySimulatedDevice,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(TCPUART_FRAME_HEADER_LENGTH)
+                if not header.startswith(TCPUART_HEADER):
+                    break
+                length = header[len(TCPUART_HEADER)]
+                command = (await reader.readexactly(length)).decode()
+
+                response = await device.respond(command)
+                if response is None:
+                    break
+                payload = response.encode()
+                writer.write(
+                    TCPUART_HEADER
+                    + len(payload).to_bytes(4, "little")
+                    + bytes(12)
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -1,24 +1,33 @@
+from __future__ import annotations
+
 import asyncio
 import contextlib
+import functools
 import json
-import logging
 import os
 import socket
 import ssl
-from concurrent.futures import ThreadPoolExecutor
+import sys
+import tempfile
+import threading
+import warnings
+from collections import deque
+from collections.abc import Collection
+from functools import lru_cache
 from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
 
-import aiofiles
-import async_timeout
-from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
-from appdirs import AppDirs
-from deprecated import deprecated
-
+from linkplay.commands import get_command_urls
 from linkplay.consts import (
-    API_ENDPOINT,
     API_TIMEOUT,
+    CONNECTOR_KEEPALIVE_TIMEOUT,
+    CONNECTOR_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    HEX_DECODE_CACHE_SIZE,
+    HEX_ENCODED_PLAYER_ATTRIBUTES,
     LOGGER,
     MTLS_CERTIFICATE_CONTENTS,
+    STATUS_COMMANDS,
     TCP_MESSAGE_LENGTH,
     EqualizerMode,
     PlayerAttribute,
@@ -28,33 +37,86 @@ from linkplay.exceptions import (
     LinkPlayInvalidDataException,
     LinkPlayRequestCancelledException,
     LinkPlayRequestException,
+    LinkPlayRequestRejectedException,
+    LinkPlayRequestTimeoutException,
 )
+from linkplay.instrumentation import record_response
+from linkplay.parsing import PARSER
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aiohttp import (
+        ClientSession,
+        TCPConnector,
+        TraceConfig,
+        TraceConnectionCreateEndParams,
+        TraceConnectionReuseconnParams,
+        TraceRequestStartParams,
+    )
+
+_CallableT = TypeVar("_CallableT", bound=Callable[..., Any])
+_T = TypeVar("_T")
+_K = TypeVar("_K")
+_V = TypeVar("_V")
 
+_UNVERIFIED_CONTEXT: ssl.SSLContext | None = None
+_UNVERIFIED_CONTEXT_LOCK = threading.Lock()
 
-async def session_call_api(endpoint: str, session: ClientSession, command: str) -> str:
+
+def deprecated(*, version: str, reason: str) -> Callable[[_CallableT], _CallableT]:
+    """Marks a function as deprecated, emitting a DeprecationWarning when called."""
+
+    def decorator(func: _CallableT) -> _CallableT:
+        message = (
+            f"Call to deprecated function {func.__name__}. ({reason}) "
+            f"-- Deprecated since version {version}."
+        )
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            warnings.warn(message, category=DeprecationWarning, stacklevel=2)
+            return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+async def session_call_api(
+    endpoint: str, session: ClientSession, command: str, timeout: float = API_TIMEOUT
+) -> str:
     """Calls the LinkPlay API and returns the result as a string.
 
     Args:
         endpoint (str): The endpoint to use.
         session (ClientSession): The client session to use.
         command (str): The command to use.
+        timeout (float): The timeout of the request in seconds.
 
     Raises:
-        LinkPlayRequestException: Thrown when the request fails or an invalid response is received.
+        LinkPlayRequestException: Thrown when the request fails.
+        LinkPlayRequestRejectedException: Thrown when an error HTTP status is received.
+        LinkPlayRequestTimeoutException: Thrown when the request times out.
 
     Returns:
         str: The response of the API call.
     """
-    url = API_ENDPOINT.format(endpoint, command)
+    from aiohttp import ClientError
+
+    url = get_command_urls(endpoint).url(command)
 
     try:
-        async with async_timeout.timeout(API_TIMEOUT):
+        async with asyncio.timeout(timeout):
             response = await session.get(url)
             if response.status != HTTPStatus.OK:
-                raise LinkPlayRequestException(
+                record_response(response.status, b"")
+                raise LinkPlayRequestRejectedException(
                     f"Unexpected HTTPStatus {response.status} received from '{url}'"
                 )
-            return await response.text()
+            text = await response.text()
+            record_response(response.status, text)
+            return text
 
     except ClientError as error:
         LOGGER.warning("ClientError for %s: %s", url, error)
@@ -64,7 +126,7 @@ async def session_call_api(endpoint: str, session: ClientSession, command: str)
 
     except asyncio.TimeoutError as error:
         LOGGER.warning("Timeout for %s: %s", url, error)
-        raise LinkPlayRequestException(
+        raise LinkPlayRequestTimeoutException(
             f"{error} error requesting data from '{url}'"
         ) from error
 
@@ -76,7 +138,7 @@ async def session_call_api(endpoint: str, session: ClientSession, command: str)
 
 
 async def session_call_api_json(
-    endpoint: str, session: ClientSession, command: str
+    endpoint: str, session: ClientSession, command: str, timeout: float = API_TIMEOUT
 ) -> dict[str, str]:
     """Calls the LinkPlay API and returns the result as a JSON object
 
@@ -84,6 +146,7 @@ async def session_call_api_json(
         endpoint (str): The endpoint to use.
         session (ClientSession): The client session to use.
         command (str): The command to use.
+        timeout (float): The timeout of the request in seconds.
 
     Raises:
         LinkPlayRequestException: Thrown when the request fails (timeout, error http status).
@@ -93,10 +156,13 @@ async def session_call_api_json(
         str: The response of the API call.
     """
     try:
-        result = await session_call_api(endpoint, session, command)
-        return json.loads(result)  # type: ignore
+        result = await session_call_api(endpoint, session, command, timeout)
+        if command not in STATUS_COMMANDS:
+            # Answers to commands are awaited by the caller, never batched with polls
+            return json.loads(result)  # type: ignore[no-any-return]
+        return await PARSER.loads(result)  # type: ignore[no-any-return]
     except json.JSONDecodeError as jsonexc:
-        url = API_ENDPOINT.format(endpoint, command)
+        url = get_command_urls(endpoint).url(command)
         LOGGER.warning("Unexpected json for %s: %s", url, jsonexc)
         raise LinkPlayInvalidDataException(
             message=f"Unexpected JSON ({result}) received from '{url}'", data=result
@@ -104,17 +170,22 @@ async def session_call_api_json(
 
 
 async def session_call_api_ok(
-    endpoint: str, session: ClientSession, command: str
+    endpoint: str, session: ClientSession, command: str, timeout: float = API_TIMEOUT
 ) -> None:
     """Calls the LinkPlay API and checks if the response is OK. Throws exception if not."""
-    result = await session_call_api(endpoint, session, command)
+    result = await session_call_api(endpoint, session, command, timeout)
 
     if result != "OK":
-        raise LinkPlayRequestException(f"Didn't receive expected OK from {endpoint}")
+        raise LinkPlayRequestRejectedException(
+            f"Didn't receive expected OK from {endpoint}"
+        )
 
 
 async def call_tcpuart(
-    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, cmd: str
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    cmd: str,
+    timeout: float = API_TIMEOUT,
 ) -> str:
     """Get the latest data from TCP UART service."""
     payload_header: str = "18 96 18 20 "
@@ -122,7 +193,7 @@ async def call_tcpuart(
     payload_command_header: str = " 00 00 00 c1 02 00 00 00 00 00 00 00 00 00 00 "
     payload_command_content: str = " ".join(hex(ord(c))[2:] for c in cmd)
 
-    async with async_timeout.timeout(API_TIMEOUT):
+    async with asyncio.timeout(timeout):
         writer.write(
             bytes.fromhex(
                 payload_header
@@ -137,14 +208,19 @@ async def call_tcpuart(
         if data == b"":
             raise LinkPlayRequestException("No data received from socket")
 
+        record_response(None, data)
+
         return str(repr(data))
 
 
 async def call_tcpuart_json(
-    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, cmd: str
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    cmd: str,
+    timeout: float = API_TIMEOUT,
 ) -> dict[str, str]:
     """Get JSON data from TCPUART service."""
-    raw_response: str = await call_tcpuart(reader, writer, cmd)
+    raw_response: str = await call_tcpuart(reader, writer, cmd, timeout)
     strip_start = raw_response.find("{")
     strip_end = raw_response.find("}", strip_start) + 1
     data = raw_response[strip_start:strip_end]
@@ -159,33 +235,76 @@ def decode_hexstr(hexstr: str) -> str:
         return hexstr
 
 
-@deprecated(version="0.0.9", reason="Use async_create_unverified_context instead")
-def create_unverified_context() -> ssl.SSLContext:
-    """Creates an unverified SSL context with the default mTLS certificate."""
-    dirs = AppDirs("python-linkplay")
-    mtls_certificate_path = os.path.join(dirs.user_data_dir, "linkplay.pem")
+@lru_cache(maxsize=HEX_DECODE_CACHE_SIZE)
+def cached_decode_hexstr(hexstr: str) -> str:
+    """Decode a hex string, sharing recently decoded values across all players."""
+    return decode_hexstr(hexstr)
+
+
+def _load_cert_chain_from_memory(sslcontext: ssl.SSLContext, contents: str) -> None:
+    """Loads a PEM encoded certificate chain without writing it to disk.
+
+    OpenSSL can only load a certificate chain from a path, so on platforms supporting
+    it the chain is put in an anonymous in-memory file. Other platforms fall back to
+    a temporary file which is removed right after loading."""
+    if hasattr(os, "memfd_create"):
+        fd = os.memfd_create("linkplay.pem")
+        try:
+            os.write(fd, contents.encode("utf-8"))
+            sslcontext.load_cert_chain(f"/proc/self/fd/{fd}")
+        finally:
+            os.close(fd)
+        return
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", suffix=".pem", delete=False
+    ) as certificate:
+        certificate.write(contents)
+    try:
+        sslcontext.load_cert_chain(certificate.name)
+    finally:
+        os.remove(certificate.name)
+
 
-    if not os.path.isdir(dirs.user_data_dir):
-        os.makedirs(dirs.user_data_dir, exist_ok=True)
+def get_unverified_context() -> ssl.SSLContext:
+    """Returns the unverified SSL context with the default mTLS certificate.
 
-    if not os.path.isfile(mtls_certificate_path):
-        with open(mtls_certificate_path, "w", encoding="utf-8") as file:
-            file.write(MTLS_CERTIFICATE_CONTENTS)
+    The context is built once per process and shared by all sessions and event loops."""
+    global _UNVERIFIED_CONTEXT
+    if _UNVERIFIED_CONTEXT is not None:
+        return _UNVERIFIED_CONTEXT
 
-    return create_ssl_context(path=mtls_certificate_path)
+    with _UNVERIFIED_CONTEXT_LOCK:
+        if _UNVERIFIED_CONTEXT is None:
+            sslcontext: ssl.SSLContext = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            sslcontext.check_hostname = False
+            sslcontext.verify_mode = ssl.CERT_NONE
+            _load_cert_chain_from_memory(sslcontext, MTLS_CERTIFICATE_CONTENTS)
+            with contextlib.suppress(AttributeError):
+                # This only works for OpenSSL >= 1.0.0
+                sslcontext.options |= ssl.OP_NO_COMPRESSION
+            sslcontext.set_default_verify_paths()
+            _UNVERIFIED_CONTEXT = sslcontext
+
+    return _UNVERIFIED_CONTEXT
+
+
+@deprecated(version="0.0.9", reason="Use async_create_unverified_context instead")
+def create_unverified_context() -> ssl.SSLContext:
+    """Creates an unverified SSL context with the default mTLS certificate."""
+    return get_unverified_context()
 
 
 async def async_create_unverified_context(
     executor: ThreadPoolExecutor | None = None,
 ) -> ssl.SSLContext:
-    """Asynchronously creates an unverified SSL context with the default mTLS certificate."""
-    async with aiofiles.tempfile.NamedTemporaryFile(
-        "w", encoding="utf-8"
-    ) as mtls_certificate:
-        await mtls_certificate.write(MTLS_CERTIFICATE_CONTENTS)
-        await mtls_certificate.flush()
-        certfile: str = str(mtls_certificate.name)
-        return await async_create_ssl_context(certfile=certfile, executor=executor)
+    """Asynchronously creates an unverified SSL context with the default mTLS certificate.
+    Only the first call builds the context, in the given executor."""
+    if _UNVERIFIED_CONTEXT is not None:
+        return _UNVERIFIED_CONTEXT
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, get_unverified_context)
 
 
 async def async_create_ssl_context(
@@ -220,36 +339,133 @@ def create_ssl_context(path: str) -> ssl.SSLContext:
     return sslcontext
 
 
+class LinkPlayConnectionStats:
+    """Counts how often a ClientSession creates new connections versus reusing them."""
+
+    requests: int
+    connections_created: int
+    connections_reused: int
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Returns the fraction of connections that were reused."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        """Return the state of the LinkPlayConnectionStats."""
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": self.reuse_ratio,
+        }
+
+    def trace_config(self) -> TraceConfig:
+        """Returns a TraceConfig updating these statistics."""
+        from aiohttp import TraceConfig
+
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+    async def _on_request_start(
+        self, session: ClientSession, context: Any, params: TraceRequestStartParams
+    ) -> None:
+        self.requests += 1
+
+    async def _on_connection_create_end(
+        self,
+        session: ClientSession,
+        context: Any,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(
+        self,
+        session: ClientSession,
+        context: Any,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self.connections_reused += 1
+
+
+def create_linkplay_connector(
+    context: ssl.SSLContext, poll_interval: float | None = None
+) -> TCPConnector:
+    """Creates a TCPConnector tuned for LinkPlay devices on the local network.
+
+    LinkPlay devices handle only a few concurrent connections, so connections per
+    device are limited. Idle connections are kept alive for longer than the poll
+    interval, so every poll reuses the connection of the previous one and avoids a
+    new TLS handshake with the mTLS client certificate."""
+    from aiohttp import TCPConnector
+
+    keepalive_timeout = CONNECTOR_KEEPALIVE_TIMEOUT
+    if poll_interval is not None:
+        keepalive_timeout = max(keepalive_timeout, 2 * poll_interval)
+
+    return TCPConnector(
+        family=socket.AF_UNSPEC,
+        ssl=context,
+        limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+
+
 @deprecated(
     version="0.0.9", reason="Use async_create_unverified_client_session instead"
 )
 def create_unverified_client_session() -> ClientSession:
     """Creates a ClientSession using the default unverified SSL context"""
+    from aiohttp import ClientSession
+
     context: ssl.SSLContext = create_unverified_context()
-    connector: TCPConnector = TCPConnector(family=socket.AF_UNSPEC, ssl=context)
-    return ClientSession(connector=connector)
+    return ClientSession(connector=create_linkplay_connector(context))
+
 
+async def async_create_unverified_client_session(
+    stats: LinkPlayConnectionStats | None = None,
+) -> ClientSession:
+    """Asynchronously creates a ClientSession using the default unverified SSL context.
+    Connection reuse is recorded in the given LinkPlayConnectionStats."""
+    from aiohttp import ClientSession
 
-async def async_create_unverified_client_session() -> ClientSession:
-    """Asynchronously creates a ClientSession using the default unverified SSL context"""
     context: ssl.SSLContext = await async_create_unverified_context()
-    connector: TCPConnector = TCPConnector(family=socket.AF_UNSPEC, ssl=context)
-    return ClientSession(connector=connector)
+    return ClientSession(
+        connector=create_linkplay_connector(context),
+        trace_configs=[stats.trace_config()] if stats is not None else None,
+    )
 
 
 def fixup_player_properties(
     properties: dict[PlayerAttribute, str],
+    decode_cache: dict[PlayerAttribute, tuple[str, str]] | None = None,
 ) -> dict[PlayerAttribute, str]:
-    """Fixes up PlayerAttribute in a dict."""
-    properties[PlayerAttribute.TITLE] = decode_hexstr(
-        properties.get(PlayerAttribute.TITLE, "")
-    )
-    properties[PlayerAttribute.ARTIST] = decode_hexstr(
-        properties.get(PlayerAttribute.ARTIST, "")
-    )
-    properties[PlayerAttribute.ALBUM] = decode_hexstr(
-        properties.get(PlayerAttribute.ALBUM, "")
-    )
+    """Fixes up PlayerAttribute in a dict.
+
+    When a decode_cache is given, it maps each hex encoded attribute to its last
+    (raw, decoded) pair so unchanged values are not decoded again."""
+    for attribute in HEX_ENCODED_PLAYER_ATTRIBUTES:
+        raw = properties.get(attribute, "")
+        if decode_cache is None:
+            properties[attribute] = cached_decode_hexstr(raw)
+            continue
+
+        cached = decode_cache.get(attribute)
+        if cached is None or cached[0] != raw:
+            cached = (raw, cached_decode_hexstr(raw))
+            decode_cache[attribute] = cached
+        properties[attribute] = cached[1]
 
     # Fixup playing status "none" by setting it to "stopped"
     if (
@@ -261,6 +477,79 @@ def fixup_player_properties(
     return properties
 
 
+def _intern(value: _T) -> _T:
+    """Interns the value if it is a plain string."""
+    if type(value) is str:
+        return cast(_T, sys.intern(cast(str, value)))
+    return value
+
+
+def compact_properties(
+    properties: dict[_K, _V], interned: Collection[Any] = ()
+) -> dict[_K, _V]:
+    """Returns the properties with their keys interned, and the values of the
+    interned keys.
+
+    Devices report the same attribute names, and mostly the same firmware, project
+    and hardware values, so interning them shares a single copy across all bridges.
+    Values which change continuously, such as the position or the RSSI, must not be
+    interned, the interned strings are never released."""
+    return {
+        _intern(key): _intern(value) if key in interned else value
+        for key, value in properties.items()
+    }
+
+
+def properties_changes(
+    previous: dict[Any, str], properties: dict[Any, str]
+) -> dict[str, str]:
+    """Returns the properties which differ from the previous ones. Removed
+    properties are returned with an empty value."""
+    changes = {
+        key: value
+        for key, value in properties.items()
+        if previous.get(key, "") != value
+    }
+    changes.update(
+        (key, "") for key in previous.keys() - properties.keys() if previous[key] != ""
+    )
+    return changes
+
+
+def deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Returns the size in bytes of the object and all objects it references.
+
+    Objects referenced more than once are counted once per seen set, so strings shared
+    between bridges are only counted for the first bridge using them. Only containers
+    and slotted objects of this library are followed, other objects such as client
+    sessions are counted without the objects they reference."""
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack: list[object] = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif type(item).__module__.startswith("linkplay.") and not hasattr(
+            item, "__dict__"
+        ):
+            for cls in type(item).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(item, name):
+                        stack.append(getattr(item, name))
+    return size
+
+
 def equalizer_mode_to_number_mapping(equalizer_mode: EqualizerMode) -> str | None:
     """Converts EqualizerMode to a number mapping."""
     match equalizer_mode:
@@ -0,0 +1,128 @@
+"""Streams of player states shared between any number of consumers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Iterable
+from typing import TYPE_CHECKING, Callable
+
+from linkplay.consts import LOGGER, PlayerAttribute, TimedOperation
+from linkplay.exceptions import LinkPlayException, LinkPlayRequestCancelledException
+from linkplay.instrumentation import INSTRUMENTATION
+
+if TYPE_CHECKING:
+    from linkplay.bridge import LinkPlayPlayer
+
+PlayerState = dict[PlayerAttribute, str]
+
+
+class LinkPlaySubscription:
+    """Holds the latest state of every watched player not yet consumed.
+
+    A newer state of a player replaces the pending one, so a slow consumer only
+    misses intermediate states and never makes the pollers wait."""
+
+    states: dict[LinkPlayPlayer, PlayerState]
+
+    def __init__(self) -> None:
+        self.states = {}
+        self._event = asyncio.Event()
+
+    def push(self, player: LinkPlayPlayer, state: PlayerState) -> None:
+        """Replaces the pending state of the player."""
+        self.states.pop(player, None)
+        self.states[player] = state
+        self._event.set()
+
+    async def get(self) -> tuple[LinkPlayPlayer, PlayerState]:
+        """Waits for and returns the oldest pending player and its state."""
+        while not self.states:
+            self._event.clear()
+            await self._event.wait()
+        player = next(iter(self.states))
+        return player, self.states.pop(player)
+
+
+class LinkPlayPoller:
+    """Polls a player for all of its subscriptions, at the shortest interval any
+    of them asked for. Polling stops with the last subscription."""
+
+    player: LinkPlayPlayer
+    subscriptions: dict[LinkPlaySubscription, float]
+    task: asyncio.Task[None] | None
+
+    def __init__(self, player: LinkPlayPlayer):
+        self.player = player
+        self.subscriptions = {}
+        self.task = None
+        self._remove_listener: Callable[[], None] | None = None
+
+    def subscribe(self, subscription: LinkPlaySubscription, interval: float) -> None:
+        """Adds the subscription, pushing the current state to it when known."""
+        self.subscriptions[subscription] = interval
+        if self.player.status_timestamp is not None:
+            subscription.push(self.player, dict(self.player.properties))
+        if self.task is None:
+            self._remove_listener = self.player.add_listener(self._on_change)
+            self.task = asyncio.create_task(self._poll())
+
+    def unsubscribe(self, subscription: LinkPlaySubscription) -> None:
+        """Removes the subscription."""
+        self.subscriptions.pop(subscription, None)
+        if self.subscriptions or self.task is None:
+            return
+        self.task.cancel()
+        self.task = None
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+
+    def _on_change(self, changes: dict[str, str]) -> None:
+        # Optimistic updates change the properties in place, consumers get a copy
+        state = dict(self.player.properties)
+        for subscription in self.subscriptions:
+            subscription.push(self.player, state)
+
+    async def _poll(self) -> None:
+        task = asyncio.current_task()
+        # A replaced or unsubscribed poller stops, even if its cancellation was lost
+        while self.task is task and self.subscriptions:
+            try:
+                if self.player.update_due:
+                    with INSTRUMENTATION.measure(TimedOperation.POLL_CYCLE):
+                        await self.player.update_status()
+            except LinkPlayRequestCancelledException as exc:
+                # The request turns the cancellation of the poller into an exception
+                if task is not None and task.cancelling():
+                    raise asyncio.CancelledError from exc
+                LOGGER.debug("Polling %s failed: %s", self.player.bridge, exc)
+            except LinkPlayException as exc:
+                LOGGER.debug("Polling %s failed: %s", self.player.bridge, exc)
+            except Exception:  # Keep polling, the consumers would wait forever
+                LOGGER.exception("Polling %s failed", self.player.bridge)
+            if self.task is not task or not self.subscriptions:
+                return
+            await asyncio.sleep(min(self.subscriptions.values()))
+
+
+def get_poller(player: LinkPlayPlayer) -> LinkPlayPoller:
+    """Returns the poller shared by all consumers watching the player."""
+    if player.poller is None:
+        player.poller = LinkPlayPoller(player)
+    return player.poller
+
+
+async def watch_players(
+    players: Iterable[LinkPlayPlayer], interval: float
+) -> AsyncGenerator[tuple[LinkPlayPlayer, PlayerState], None]:
+    """Yields the players and their state whenever it changed."""
+    subscription = LinkPlaySubscription()
+    pollers = [get_poller(player) for player in players]
+    for poller in pollers:
+        poller.subscribe(subscription, interval)
+    try:
+        while True:
+            yield await subscription.get()
+    finally:
+        for poller in pollers:
+            poller.unsubscribe(subscription)
@@ -1,5 +1,7 @@
 """Test bridge functionality."""
 
+import asyncio
+import time
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
@@ -21,8 +23,10 @@ from linkplay.consts import (
     PlayerAttribute,
     PlayingMode,
     PlayingStatus,
+    RefreshPart,
 )
 from linkplay.endpoint import LinkPlayApiEndpoint
+from linkplay.exceptions import LinkPlayRequestException
 from linkplay.manufacturers import MANUFACTURER_WIIM
 
 
@@ -38,6 +42,88 @@ def test_device_name():
     assert f"{bridge}" == "TestDevice"
 
 
+async def test_bridge_refresh_requests_concurrently():
+    """Tests if a refresh sends its requests together and applies all results."""
+    in_flight = 0
+    max_in_flight = 0
+    responses = {
+        LinkPlayCommand.DEVICE_STATUS: {DeviceAttribute.UUID: "1234"},
+        LinkPlayCommand.PLAYER_STATUS: {PlayerAttribute.VOLUME: "42"},
+        LinkPlayCommand.MULTIROOM_LIST: {
+            "slaves": 1,
+            "slave_list": [{"uuid": "5678", "volume": 10, "mute": 0}],
+        },
+    }
+
+    async def json_request(command: str) -> dict[str, Any]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return responses[command]
+
+    bridge = LinkPlayBridge(endpoint=AsyncMock())
+    bridge.endpoint.json_request.side_effect = json_request
+    bridge.device.properties[DeviceAttribute.PROJECT] = "UP2STREAM_PRO_V3"
+    follower = LinkPlayBridge(endpoint=AsyncMock())
+    follower.device.properties[DeviceAttribute.UUID] = "5678"
+    bridge.multiroom = LinkPlayMultiroom(bridge)
+
+    await bridge.refresh(
+        (RefreshPart.DEVICE, RefreshPart.PLAYER, RefreshPart.MULTIROOM), [follower]
+    )
+
+    assert max_in_flight == 3
+    assert bridge.device.uuid == "1234"
+    assert bridge.player.volume == 42
+    assert bridge.multiroom.followers == [follower]
+    assert follower.player.volume == 10
+
+
+async def test_bridge_refresh_resolves_the_device_first():
+    """Tests if a first refresh knows the manufacturer before requesting the player."""
+    commands: list[str] = []
+    responses = {
+        LinkPlayCommand.DEVICE_STATUS: {DeviceAttribute.PROJECT: "WiiM_Pro_with_gc4a"},
+        LinkPlayCommand.PLAYER_STATUS: {PlayerAttribute.TITLE: "Title"},
+        LinkPlayCommand.META_INFO: {"metaData": {"album": "Album"}},
+    }
+
+    async def json_request(command: str) -> dict[str, Any]:
+        commands.append(command)
+        return responses[command]
+
+    bridge = LinkPlayBridge(endpoint=AsyncMock())
+    bridge.endpoint.json_request.side_effect = json_request
+
+    await bridge.refresh()
+
+    assert commands[0] == LinkPlayCommand.DEVICE_STATUS
+    assert LinkPlayCommand.META_INFO in commands
+    assert bridge.device.manufacturer == MANUFACTURER_WIIM
+    assert bridge.player.metainfo_track is not None
+
+
+async def test_bridge_refresh_applies_nothing_on_failure():
+    """Tests if a refresh leaves the bridge unchanged when a request fails."""
+
+    async def json_request(command: str) -> dict[str, Any]:
+        if command == LinkPlayCommand.PLAYER_STATUS:
+            raise LinkPlayRequestException("Timeout")
+        return {DeviceAttribute.UUID: "1234"}
+
+    bridge = LinkPlayBridge(endpoint=AsyncMock())
+    bridge.endpoint.json_request.side_effect = json_request
+    properties = dict(bridge.player.properties)
+
+    with pytest.raises(LinkPlayRequestException):
+        await bridge.refresh()
+
+    assert bridge.device.uuid == ""
+    assert bridge.player.properties == properties
+
+
 async def test_device_update_status():
     """Tests if the device update status is correctly called."""
     bridge = AsyncMock()
@@ -50,6 +136,39 @@ async def test_device_update_status():
     assert device.uuid == "1234"
 
 
+async def test_device_update_status_listeners():
+    """Tests if the device listeners are called with the changed properties."""
+    bridge = AsyncMock()
+    device = LinkPlayDevice(bridge)
+    listener = Mock(side_effect=[None, None, ValueError])
+    remove = device.add_listener(listener)
+
+    bridge.json_request.return_value = {DeviceAttribute.UUID: "1234", "RSSI": "-50"}
+    await device.update_status()
+    await device.update_status()
+    bridge.json_request.return_value = {DeviceAttribute.UUID: "1234", "RSSI": "-60"}
+    await device.update_status()
+    bridge.json_request.return_value = {DeviceAttribute.UUID: "1234"}
+    await device.update_status()
+    remove()
+    bridge.json_request.return_value = {DeviceAttribute.UUID: "5678"}
+    await device.update_status()
+
+    assert [call.args[0] for call in listener.call_args_list] == [
+        {DeviceAttribute.UUID: "1234", "RSSI": "-50"},
+        {"RSSI": "-60"},
+        {"RSSI": ""},
+    ]
+
+
+def test_device_properties_keep_every_attribute():
+    """Tests if the device properties hold every attribute, empty when unknown."""
+    device = LinkPlayDevice(AsyncMock())
+
+    assert device.properties[DeviceAttribute.FIRMWARE] == ""
+    assert device.playmode_support == [PlayingMode.NETWORK]
+
+
 async def test_device_reboot():
     """Tests if the device update is correctly called."""
     bridge = AsyncMock()
@@ -398,6 +517,91 @@ async def test_multiroom_update_status():
     assert multiroom.leader == leader
 
 
+def test_player_mirror_leader():
+    """Tests if a follower mirrors the track of its leader and keeps its volume."""
+    leader = LinkPlayPlayer(Mock())
+    leader.properties = {
+        PlayerAttribute.TITLE: "Song",
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING,
+        PlayerAttribute.VOLUME: "80",
+    }
+    leader.status_timestamp = 1.0
+    follower = LinkPlayPlayer(Mock())
+    follower.properties = {
+        PlayerAttribute.ARTIST: "Old",
+        PlayerAttribute.PLAYBACK_MODE: PlayingMode.FOLLOWER,
+    }
+    listener = Mock()
+    follower.add_listener(listener)
+
+    follower.mirror(leader, {PlayerAttribute.VOLUME: "20"})
+
+    assert follower.properties == {
+        PlayerAttribute.TITLE: "Song",
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING,
+        PlayerAttribute.PLAYBACK_MODE: PlayingMode.FOLLOWER,
+        PlayerAttribute.VOLUME: "20",
+    }
+    assert follower.status_timestamp == 1.0
+    listener.assert_called_once()
+
+
+def test_player_update_due():
+    """Tests if mirrored followers are only polled every follower_poll_interval."""
+    bridge = Mock()
+    player = LinkPlayPlayer(bridge)
+    assert player.update_due
+
+    player.poll_timestamp = time.monotonic()
+    player.mirror(LinkPlayPlayer(Mock()))
+    assert not player.update_due
+
+    player.follower_poll_interval = 0
+    assert player.update_due
+
+    player.follower_poll_interval = 60
+    bridge.multiroom = None
+    assert player.update_due
+
+
+async def test_player_update_status_skips_mirrored_follower():
+    """Tests if a mirrored follower is not polled before it is due, unless forced."""
+    bridge = AsyncMock()
+    bridge.device.manufacturer = None
+    bridge.device.controller = None
+    bridge.json_request.return_value = {PlayerAttribute.VOLUME: "20"}
+    player = LinkPlayPlayer(bridge)
+    player.poll_timestamp = time.monotonic()
+    player.mirror(LinkPlayPlayer(Mock()))
+
+    await player.update_status()
+    bridge.json_request.assert_not_called()
+
+    await player.update_status(force=True)
+    bridge.json_request.assert_called_once_with(LinkPlayCommand.PLAYER_STATUS)
+
+
+async def test_multiroom_update_status_mirrors_followers():
+    """Tests if multiroom update status fills in the followers' volume and mute."""
+    leader = AsyncMock()
+    leader.json_request.return_value = {
+        "slaves": 1,
+        "slave_list": [{"uuid": "follower", "volume": 30, "mute": 1}],
+    }
+    follower = AsyncMock()
+    follower.device.uuid = "follower"
+    follower.player = Mock()
+    multiroom = LinkPlayMultiroom(leader)
+
+    await multiroom.update_status([leader, follower])
+
+    assert multiroom.followers == [follower]
+    follower.player.mirror.assert_called_once_with(
+        leader.player,
+        {PlayerAttribute.VOLUME: "30", PlayerAttribute.MUTED: "1"},
+    )
+
+
 async def test_multiroom_ungroup():
     """Tests if multiroom ungroup is correctly called on the leader."""
     leader = AsyncMock()
@@ -465,6 +669,7 @@ async def test_multiroom_unmute():
 async def test_multiroom_set_volume(volume: int):
     """Tests if multiroom set volume is correctly called on the leader."""
     leader = AsyncMock()
+    leader.player = Mock()
     multiroom = LinkPlayMultiroom(leader)
 
     await multiroom.set_volume(volume)
@@ -539,6 +744,25 @@ async def test_update_status_triggers_controller_on_mode_change_from_follower(
     mock_bridge.device.controller.assert_called_once()
 
 
+async def test_update_status_schedules_async_controller(mock_bridge):
+    """Test that an async controller callback is run in a task instead of dropped."""
+    player = LinkPlayPlayer(mock_bridge)
+    called = asyncio.Event()
+
+    async def controller() -> None:
+        called.set()
+
+    mock_bridge.device.controller = controller
+    player.previous_playing_mode = PlayingMode.IDLE
+    mock_bridge.json_request = AsyncMock(
+        return_value={PlayerAttribute.PLAYBACK_MODE: PlayingMode.FOLLOWER}
+    )
+
+    await player.update_status()
+
+    await asyncio.wait_for(called.wait(), 1)
+
+
 @pytest.mark.asyncio
 async def test_update_status_does_not_trigger_controller_on_no_mode_change(mock_bridge):
     """Test that update_status does not trigger the controller when playing mode remains FOLLOWER."""
@@ -568,7 +792,9 @@ async def test_update_status_does_not_trigger_controller_on_no_mode_change(mock_
 async def test_meta_info_failed_handling():
     """Test that the player handles a failed META_INFO request correctly."""
 
-    async def mock_session_call_api_json_side_effect(endpoint, session, command):
+    async def mock_session_call_api_json_side_effect(
+        endpoint, session, command, timeout
+    ):
         if command == LinkPlayCommand.META_INFO:
             return "Failed"
         return "{}"
@@ -599,13 +825,17 @@ async def test_meta_info_failed_handling():
         assert player.metainfo == {}
 
         # Verify that the mocked function was called with the correct command
-        mock_api.assert_called_with("http://1.2.3.4", None, LinkPlayCommand.META_INFO)
+        mock_api.assert_called_with(
+            "http://1.2.3.4", None, LinkPlayCommand.META_INFO, 3
+        )
 
 
 async def test_audio_output_control():
     """Test that the player handles a audio output control correctly."""
 
-    async def mock_session_call_api_json_side_effect(endpoint, session, command):
+    async def mock_session_call_api_json_side_effect(
+        endpoint, session, command, timeout
+    ):
         if command == LinkPlayCommand.AUDIO_OUTPUT_HW_MODE:
             return """{"hardware":"2","source":"0","audiocast":"1"}"""
         return "{}"
@@ -639,5 +869,326 @@ async def test_audio_output_control():
 
         # Verify that the mocked function was called with the correct command
         mock_api.assert_called_with(
-            "http://1.2.3.4", None, LinkPlayCommand.AUDIO_OUTPUT_HW_MODE
+            "http://1.2.3.4", None, LinkPlayCommand.AUDIO_OUTPUT_HW_MODE, 3
         )
+
+
+def _wiim_player_bridge(status: dict[PlayerAttribute, str]) -> AsyncMock:
+    """Returns a mocked WiiM bridge answering the player status and metainfo."""
+    bridge = AsyncMock()
+    bridge.device = MagicMock()
+    bridge.device.manufacturer = MANUFACTURER_WIIM
+    bridge.device.controller = None
+
+    async def json_request(command: str) -> dict[Any, Any]:
+        if command == LinkPlayCommand.META_INFO:
+            return {"metaData": {"title": "Test"}}
+        return dict(status)
+
+    bridge.json_request.side_effect = json_request
+    return bridge
+
+
+async def test_player_update_status_skips_meta_info_for_same_track():
+    """Tests if the metainfo is not requested again while the track is unchanged."""
+    bridge = _wiim_player_bridge(
+        {PlayerAttribute.TITLE: "54657374", PlayerAttribute.TOTAL_LENGTH: "1000"}
+    )
+    player = LinkPlayPlayer(bridge)
+
+    await player.update_status()
+    await player.update_status()
+
+    assert bridge.json_request.call_count == 3
+    assert player.metainfo == {"metaData": {"title": "Test"}}
+
+
+async def test_player_update_status_requests_meta_info_on_track_change():
+    """Tests if the metainfo is requested again when the track changes."""
+    status = {PlayerAttribute.TITLE: "54657374", PlayerAttribute.PLAYLIST_INDEX: "1"}
+    bridge = _wiim_player_bridge(status)
+    player = LinkPlayPlayer(bridge)
+
+    await player.update_status()
+    status[PlayerAttribute.PLAYLIST_INDEX] = "2"
+    await player.update_status()
+
+    assert bridge.json_request.call_count == 4
+    bridge.json_request.assert_called_with(LinkPlayCommand.META_INFO)
+
+
+async def test_player_update_status_requests_expired_meta_info():
+    """Tests if the metainfo is requested again once it is too old."""
+    bridge = _wiim_player_bridge({PlayerAttribute.TITLE: "54657374"})
+    player = LinkPlayPlayer(bridge)
+    player.metainfo_max_age = 0
+
+    await player.update_status()
+    await player.update_status()
+
+    assert bridge.json_request.call_count == 4
+
+
+async def test_player_update_status_retries_failed_meta_info():
+    """Tests if a failed metainfo request is retried by the next poll."""
+    bridge = _wiim_player_bridge({PlayerAttribute.TITLE: "54657374"})
+    json_request = bridge.json_request.side_effect
+    bridge.json_request.side_effect = [
+        {PlayerAttribute.TITLE: "54657374"},
+        LinkPlayRequestException("Timeout"),
+    ]
+    player = LinkPlayPlayer(bridge)
+
+    with pytest.raises(LinkPlayRequestException):
+        await player.update_status()
+    assert player.metainfo_timestamp is None
+
+    bridge.json_request.side_effect = json_request
+    await player.update_status()
+
+    bridge.json_request.assert_called_with(LinkPlayCommand.META_INFO)
+    assert player.metainfo == {"metaData": {"title": "Test"}}
+    assert player.metainfo_timestamp is not None
+
+
+async def test_player_current_position_is_interpolated_while_playing():
+    """Tests if the current position advances locally while playing."""
+    bridge = AsyncMock()
+    bridge.json_request.return_value = {
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING,
+        PlayerAttribute.CURRENT_POSITION: "1000",
+        PlayerAttribute.TOTAL_LENGTH: "5000",
+    }
+    player = LinkPlayPlayer(bridge)
+
+    with patch("linkplay.bridge.time.monotonic", return_value=100.0):
+        await player.update_status()
+
+    with patch("linkplay.bridge.time.monotonic", return_value=102.5):
+        assert player.current_position == 3500
+        assert player.current_position_in_seconds == 3
+
+    with patch("linkplay.bridge.time.monotonic", return_value=110.0):
+        assert player.current_position == 5000
+
+
+async def test_player_current_position_is_frozen_while_paused():
+    """Tests if the current position does not advance while paused."""
+    bridge = AsyncMock()
+    bridge.json_request.return_value = {
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PAUSED,
+        PlayerAttribute.CURRENT_POSITION: "1000",
+        PlayerAttribute.TOTAL_LENGTH: "5000",
+    }
+    player = LinkPlayPlayer(bridge)
+
+    with patch("linkplay.bridge.time.monotonic", return_value=100.0):
+        await player.update_status()
+
+    with patch("linkplay.bridge.time.monotonic", return_value=102.5):
+        assert player.current_position == 1000
+
+
+async def test_player_update_status_detects_position_drift():
+    """Tests if a poll reporting a different position than interpolated is detected."""
+    status = {
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PLAYING,
+        PlayerAttribute.CURRENT_POSITION: "1000",
+        PlayerAttribute.TOTAL_LENGTH: "60000",
+    }
+    bridge = AsyncMock()
+    bridge.json_request.side_effect = lambda command: dict(status)
+    player = LinkPlayPlayer(bridge)
+
+    with patch("linkplay.bridge.time.monotonic", return_value=100.0):
+        await player.update_status()
+
+    status[PlayerAttribute.CURRENT_POSITION] = "20000"
+    with patch("linkplay.bridge.time.monotonic", return_value=105.0):
+        await player.update_status()
+        assert player.position_drift == 14000
+
+
+async def test_player_set_volume_updates_properties_optimistically():
+    """Tests if the volume is visible right after setting it."""
+    bridge = AsyncMock()
+    player = LinkPlayPlayer(bridge)
+
+    await player.set_volume(42)
+
+    assert player.volume == 42
+    assert player.confirmation_handle is not None
+
+
+async def test_player_optimistic_update_notifies_listeners():
+    """Tests if the listeners hear of an optimistic update, and only once."""
+    bridge = AsyncMock()
+    bridge.device.manufacturer = None
+    bridge.device.controller = None
+    bridge.json_request.side_effect = [
+        {PlayerAttribute.VOLUME: "10", PlayerAttribute.CURRENT_POSITION: "0"},
+        {PlayerAttribute.VOLUME: "42", PlayerAttribute.CURRENT_POSITION: "0"},
+    ]
+    player = LinkPlayPlayer(bridge)
+    player.confirmation_delay = None
+    await player.update_status()
+    listener = Mock()
+    player.add_listener(listener)
+
+    await player.set_volume(42)
+    await player.update_status(force=True)
+
+    listener.assert_called_once_with({PlayerAttribute.VOLUME: "42"})
+
+
+async def test_multiroom_set_volume_notifies_listeners():
+    """Tests if the listeners of the group members hear of the new volume."""
+    leader = LinkPlayBridge(endpoint=AsyncMock())
+    follower = LinkPlayBridge(endpoint=AsyncMock())
+    multiroom = LinkPlayMultiroom(leader)
+    multiroom.followers = [follower]
+    listeners = [Mock(), Mock()]
+    leader.player.add_listener(listeners[0])
+    follower.player.add_listener(listeners[1])
+
+    await multiroom.set_volume(30)
+
+    for listener in listeners:
+        listener.assert_called_once_with({PlayerAttribute.VOLUME: "30"})
+
+
+async def test_player_optimistic_update_rolls_back_on_failure():
+    """Tests if an optimistic update is rolled back when the command fails."""
+    bridge = AsyncMock()
+    bridge.request.side_effect = LinkPlayRequestException("Offline")
+    player = LinkPlayPlayer(bridge)
+    player.properties[PlayerAttribute.PLAYLIST_MODE] = LoopMode.PLAY_IN_ORDER
+
+    with pytest.raises(LinkPlayRequestException):
+        await player.set_loop_mode(LoopMode.RANDOM_PLAYBACK)
+
+    assert player.loop_mode == LoopMode.PLAY_IN_ORDER
+    assert player.confirmation_handle is None
+
+
+async def test_player_optimistic_rollback_notifies_listeners():
+    """Tests if the listeners hear of an optimistic update and of its rollback."""
+    bridge = AsyncMock()
+    bridge.request.side_effect = LinkPlayRequestException("Offline")
+    player = LinkPlayPlayer(bridge)
+    player.properties[PlayerAttribute.MUTED] = MuteMode.UNMUTED
+    listener = Mock()
+    player.add_listener(listener)
+
+    with pytest.raises(LinkPlayRequestException):
+        await player.mute()
+
+    assert [call.args[0] for call in listener.call_args_list] == [
+        {PlayerAttribute.MUTED: MuteMode.MUTED},
+        {PlayerAttribute.MUTED: MuteMode.UNMUTED},
+    ]
+
+
+async def test_player_optimistic_rollback_keeps_newer_values():
+    """Tests if a failed command does not roll back a newer optimistic value."""
+    bridge = AsyncMock()
+    failing = asyncio.Event()
+
+    async def request(command: str) -> None:
+        if command == LinkPlayCommand.MUTE:
+            await failing.wait()
+            raise LinkPlayRequestException("Offline")
+
+    bridge.request.side_effect = request
+    player = LinkPlayPlayer(bridge)
+    player.properties[PlayerAttribute.MUTED] = MuteMode.UNMUTED
+
+    mute = asyncio.create_task(player.mute())
+    await asyncio.sleep(0)
+    await player.unmute()
+    failing.set()
+    with pytest.raises(LinkPlayRequestException):
+        await mute
+
+    assert player.muted is False
+    player.close()
+
+
+async def test_player_optimistic_rollback_keeps_polled_properties():
+    """Tests if a failed command does not roll back properties polled meanwhile."""
+    bridge = AsyncMock()
+    failing = asyncio.Event()
+
+    async def request(command: str) -> None:
+        await failing.wait()
+        raise LinkPlayRequestException("Offline")
+
+    bridge.request.side_effect = request
+    player = LinkPlayPlayer(bridge)
+    player.properties[PlayerAttribute.MUTED] = MuteMode.UNMUTED
+
+    mute = asyncio.create_task(player.mute())
+    await asyncio.sleep(0)
+    player.properties = {PlayerAttribute.MUTED: MuteMode.MUTED}
+    failing.set()
+    with pytest.raises(LinkPlayRequestException):
+        await mute
+
+    assert player.muted is True
+
+
+async def test_player_confirmation_logs_unexpected_errors():
+    """Tests if the confirmation poll survives errors like a closed session."""
+    bridge = AsyncMock()
+    bridge.device.manufacturer = None
+    bridge.json_request.side_effect = RuntimeError("Session is closed")
+    player = LinkPlayPlayer(bridge)
+
+    await player._confirm()
+
+    assert player.confirmation_task is None
+
+
+async def test_player_close_cancels_confirmation():
+    """Tests if closing the player cancels the scheduled confirmation poll."""
+    bridge = AsyncMock()
+    player = LinkPlayPlayer(bridge)
+
+    await player.mute()
+    handle = player.confirmation_handle
+    player.close()
+
+    assert handle.cancelled()
+    assert player.confirmation_handle is None
+
+
+async def test_player_optimistic_update_schedules_confirmation_poll():
+    """Tests if a status poll reconciles the optimistic update."""
+    bridge = AsyncMock()
+    bridge.device.manufacturer = None
+    bridge.device.controller = None
+    bridge.json_request.return_value = {
+        PlayerAttribute.PLAYING_STATUS: PlayingStatus.PAUSED
+    }
+    player = LinkPlayPlayer(bridge)
+    player.confirmation_delay = 0
+
+    await player.resume()
+    assert player.status == PlayingStatus.PLAYING
+
+    await asyncio.sleep(0.01)
+
+    bridge.json_request.assert_called_once_with(LinkPlayCommand.PLAYER_STATUS)
+    assert player.status == PlayingStatus.PAUSED
+
+
+async def test_player_seek_updates_position_optimistically():
+    """Tests if seeking moves the current position right away."""
+    bridge = AsyncMock()
+    player = LinkPlayPlayer(bridge)
+    player.properties[PlayerAttribute.TOTAL_LENGTH] = "60000"
+
+    await player.seek(30)
+
+    bridge.request.assert_called_once_with(LinkPlayCommand.SEEK.format(30))
+    assert player.current_position == 30000
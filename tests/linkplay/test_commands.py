@@ -0,0 +1,84 @@
+"""Test the command registry."""
+
+import pytest
+from aiohttp import ClientSession, web
+from linkplay.commands import (
+    LinkPlayCommandUrls,
+    encode_command,
+    format_command,
+    get_command_urls,
+)
+from linkplay.consts import LinkPlayCommand, LoopMode
+from linkplay.utils import session_call_api_ok
+
+
+def test_format_command():
+    """Tests if parameters are converted and validated by their encoder."""
+    assert format_command(LinkPlayCommand.VOLUME, 42) == "setPlayerCmd:vol:42"
+    assert (
+        format_command(LinkPlayCommand.LOOP_MODE, LoopMode.CONTINOUS_PLAY_ONE_SONG)
+        == "setPlayerCmd:loopmode:-1"
+    )
+    assert (
+        format_command(LinkPlayCommand.MULTIROOM_JOIN, "1.2.3.4")
+        == "ConnectMasterAp:JoinGroupMaster:eth1.2.3.4:wifi0.0.0.0"
+    )
+
+    with pytest.raises(ValueError):
+        format_command(LinkPlayCommand.VOLUME, 101)
+    with pytest.raises(ValueError):
+        format_command(LinkPlayCommand.SEEK, "soon")
+
+
+def test_encode_command():
+    """Tests if commands are percent-encoded except for the separators."""
+    assert encode_command(LinkPlayCommand.PLAYER_STATUS) == "getPlayerStatusEx"
+    assert (
+        encode_command("setPlayerCmd:play:http://host/a b.mp3?x=1&y=é#start")
+        == "setPlayerCmd:play:http://host/a%20b.mp3?x=1%26y=%C3%A9%23start"
+    )
+    assert encode_command("setPlayerCmd:play:http://host/s.mp3?sig=ab+cd;e") == (
+        "setPlayerCmd:play:http://host/s.mp3?sig=ab%2Bcd%3Be"
+    )
+
+
+def test_command_urls():
+    """Tests if the URLs of constant commands are built once."""
+    urls = LinkPlayCommandUrls("http://1.2.3.4")
+
+    url = urls.url(LinkPlayCommand.PLAYER_STATUS)
+    assert str(url) == "http://1.2.3.4/httpapi.asp?command=getPlayerStatusEx"
+    assert urls.url(LinkPlayCommand.PLAYER_STATUS) is url
+
+    volume = format_command(LinkPlayCommand.VOLUME, 10)
+    assert urls.url(volume).query_string == "command=setPlayerCmd:vol:10"
+    assert list(urls.urls) == [LinkPlayCommand.PLAYER_STATUS]
+    assert get_command_urls("http://1.2.3.4") is get_command_urls("http://1.2.3.4")
+
+
+async def test_command_arrives_unchanged():
+    """Tests if the device receives the command parameters as they were given."""
+    received = []
+
+    async def handler(request: web.Request) -> web.Response:
+        received.append(request.query["command"])
+        return web.Response(text="OK")
+
+    app = web.Application()
+    app.router.add_get("/httpapi.asp", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    command = format_command(
+        LinkPlayCommand.PLAY, "http://host/a b.mp3?x=1&y=%41&sig=ab+cd;e"
+    )
+    try:
+        async with ClientSession() as session:
+            await session_call_api_ok(f"http://127.0.0.1:{port}", session, command)
+    finally:
+        await runner.cleanup()
+
+    assert received == [command]
@@ -1,10 +1,15 @@
+import asyncio
+import io
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aiohttp import ClientSession
 from linkplay.bridge import LinkPlayBridge, LinkPlayDevice, LinkPlayMultiroom
 from linkplay.controller import LinkPlayController
+from linkplay.events import LinkPlayEventType
 from linkplay.exceptions import LinkPlayInvalidDataException
+from linkplay.utils import compact_properties
 
 
 @pytest.fixture
@@ -252,3 +257,91 @@ async def test_discover_multirooms_new_multiroom_no_followers(controller, mock_b
 
             # Assert the bridge's multiroom is set to None
             assert mock_bridge.multiroom is None
+
+
+def test_memory_per_bridge(controller):
+    """Tests if the memory per bridge shares the interned attributes between bridges."""
+    assert controller.memory_per_bridge() == 0
+
+    for uuid in ("uuid-1", "uuid-2"):
+        bridge = LinkPlayBridge(endpoint=MagicMock())
+        # Built at runtime, so only interning shares the firmware between bridges
+        firmware = ".".join(["4", "6", "415145"])
+        bridge.device.properties = compact_properties(
+            {"uuid": uuid, "firmware": firmware}
+        )
+        controller.bridges.append(bridge)
+
+    single = LinkPlayController(controller.session)
+    single.bridges = controller.bridges[:1]
+
+    assert 0 < controller.memory_per_bridge() < single.memory_per_bridge()
+
+
+def test_export(controller):
+    """Tests if the state of all bridges is exported as columns and records."""
+    for number in range(2):
+        bridge = LinkPlayBridge(
+            endpoint=MagicMock(__str__=lambda _, number=number: f"http://{number}")
+        )
+        bridge.device.properties = compact_properties(
+            {"uuid": f"uuid-{number}", "DeviceName": f'Speaker "{number}"'}
+        )
+        bridge.player.properties = compact_properties({"vol": number * 10})
+        controller.bridges.append(bridge)
+
+    assert controller.export_columns(["uuid", "player.vol", "device.RSSI"]) == {
+        "uuid": ["uuid-0", "uuid-1"],
+        "player.vol": ["0", "10"],
+        "device.RSSI": ["", ""],
+    }
+    assert controller.export_column("endpoint") == ["http://0", "http://1"]
+
+    stream = io.StringIO()
+    assert controller.export_records(["uuid", "name", "player.vol"], stream) == 2
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"uuid": "uuid-0", "name": 'Speaker "0"', "player.vol": "0"},
+        {"uuid": "uuid-1", "name": 'Speaker "1"', "player.vol": "10"},
+    ]
+
+    with pytest.raises(ValueError):
+        controller.export_column("unknown")
+
+
+async def test_topology_changes_are_coalesced(controller, mock_bridge):
+    """Tests if topology changes during a discovery trigger one more discovery."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+    discoveries = 0
+
+    async def discover_multirooms() -> None:
+        nonlocal discoveries
+        discoveries += 1
+        started.set()
+        await release.wait()
+
+    await controller.add_bridge(mock_bridge)
+    callback = mock_bridge.device.set_callback.call_args.args[0]
+    with patch.object(controller, "discover_multirooms", discover_multirooms):
+        callback()
+        await started.wait()
+        callback()
+        callback()
+        release.set()
+        await controller.events.drain()
+        await controller._discovery
+
+    assert discoveries == 2
+
+
+async def test_bridge_callback_without_bridge(controller):
+    """Tests if the callback still works when created without a bridge."""
+    events = []
+    controller.events.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, events.append)
+
+    with patch.object(controller, "discover_multirooms", AsyncMock()) as discover:
+        controller.get_bridge_callback()()
+        await controller._discovery
+
+    discover.assert_awaited_once()
+    assert events[0].bridge is None
@@ -1,7 +1,14 @@
 """Test endpoint functionality."""
 
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from linkplay.commands import get_command_urls
+from linkplay.consts import STATUS_COMMANDS, LinkPlayCommand
 from linkplay.endpoint import LinkPlayApiEndpoint
+from linkplay.exceptions import LinkPlayCircuitOpenException, LinkPlayRequestException
+from linkplay.resilience import LinkPlayCircuitBreaker, LinkPlayRetryPolicy
 
 
 @pytest.mark.parametrize(
@@ -24,9 +31,81 @@ def test_api_endpoint_protocol_port_combination(
     assert f"{endpoint}" == expected
 
 
+def test_api_endpoint_preloads_status_urls() -> None:
+    """Tests if the endpoint builds the URLs of the status commands once."""
+    endpoint: LinkPlayApiEndpoint = LinkPlayApiEndpoint(
+        protocol="http", port=80, endpoint="1.2.3.4", session=None
+    )
+
+    for command in STATUS_COMMANDS:
+        assert command in endpoint.urls.urls
+    url = endpoint.urls.url(LinkPlayCommand.PLAYER_STATUS)
+    assert str(url) == "http://1.2.3.4/httpapi.asp?command=getPlayerStatusEx"
+    assert endpoint.urls.url(LinkPlayCommand.PLAYER_STATUS) is url
+
+
+def test_api_endpoint_urls_are_shared_with_requests() -> None:
+    """Tests if the requests to the endpoint use its preloaded URLs."""
+    endpoint: LinkPlayApiEndpoint = LinkPlayApiEndpoint(
+        protocol="http", port=8081, endpoint="1.2.3.4", session=None
+    )
+
+    assert get_command_urls("http://1.2.3.4:8081") is endpoint.urls
+
+
 def test_api_endpoint_protocol_raises_assertion_error() -> None:
     """Tests whether or not instantiating the LinkPlayApiEndpoint
     with an invalid protocol raises an AssertionError."""
 
     with pytest.raises(AssertionError):
         LinkPlayApiEndpoint(protocol="ftp", port=21, endpoint="1.2.3.4", session=None)
+
+
+async def test_api_endpoint_fails_fast_while_circuit_is_open() -> None:
+    """Tests if the endpoint stops requesting an unreachable device."""
+    endpoint: LinkPlayApiEndpoint = LinkPlayApiEndpoint(
+        protocol="http",
+        port=80,
+        endpoint="1.2.3.4",
+        session=None,
+        retry_policy=LinkPlayRetryPolicy(attempts=1),
+        circuit_breaker=LinkPlayCircuitBreaker(failure_threshold=2),
+    )
+
+    with patch(
+        "linkplay.endpoint.session_call_api_json",
+        new=AsyncMock(side_effect=LinkPlayRequestException("Timeout")),
+    ) as mock_api:
+        for _ in range(2):
+            with pytest.raises(LinkPlayRequestException):
+                await endpoint.json_request(LinkPlayCommand.PLAYER_STATUS)
+
+        with pytest.raises(LinkPlayCircuitOpenException):
+            await endpoint.json_request(LinkPlayCommand.PLAYER_STATUS)
+
+    assert mock_api.call_count == 2
+
+
+async def test_api_endpoint_limits_concurrent_requests() -> None:
+    """Tests if the endpoint bounds its requests in flight, whatever the session."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call_api(*args, **kwargs) -> dict[str, str]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {}
+
+    endpoint: LinkPlayApiEndpoint = LinkPlayApiEndpoint(
+        protocol="http", port=80, endpoint="1.2.3.4", session=None, concurrency=2
+    )
+
+    with patch("linkplay.endpoint.session_call_api_json", new=call_api):
+        await asyncio.gather(
+            *(endpoint.json_request(LinkPlayCommand.PLAYER_STATUS) for _ in range(5))
+        )
+
+    assert max_in_flight == 2
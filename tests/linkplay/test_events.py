@@ -0,0 +1,47 @@
+"""Test the event bus."""
+
+import asyncio
+from unittest.mock import MagicMock, Mock
+
+from linkplay.events import LinkPlayEvent, LinkPlayEventBus, LinkPlayEventType
+
+
+async def test_publish_schedules_async_handlers():
+    """Tests if async handlers run concurrently in tasks, after publishing."""
+    bus = LinkPlayEventBus()
+    started = []
+
+    async def handler(event: LinkPlayEvent) -> None:
+        started.append(event.bridge)
+        await asyncio.sleep(0)
+
+    bus.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, handler)
+    bus.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, handler)
+    bridge = MagicMock()
+    bus.publish(LinkPlayEvent(LinkPlayEventType.TOPOLOGY_CHANGED, bridge))
+
+    assert not started
+    assert len(bus.tasks) == 2
+    await bus.drain()
+    assert started == [bridge, bridge]
+    assert not bus.tasks
+
+
+async def test_publish_isolates_failing_handlers():
+    """Tests if failing handlers do not prevent the other handlers from running."""
+    bus = LinkPlayEventBus()
+    handler = Mock()
+
+    async def failing_async(event: LinkPlayEvent) -> None:
+        raise ValueError
+
+    bus.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, Mock(side_effect=ValueError))
+    bus.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, failing_async)
+    unsubscribe = bus.subscribe(LinkPlayEventType.TOPOLOGY_CHANGED, handler)
+
+    bus.publish(LinkPlayEvent(LinkPlayEventType.TOPOLOGY_CHANGED, MagicMock()))
+    await bus.drain()
+    unsubscribe()
+    bus.publish(LinkPlayEvent(LinkPlayEventType.TOPOLOGY_CHANGED, MagicMock()))
+
+    handler.assert_called_once()
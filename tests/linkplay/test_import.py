@@ -0,0 +1,65 @@
+"""Test import time of the linkplay package."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Budget for the time spent in the linkplay modules themselves, in microseconds
+LINKPLAY_IMPORT_BUDGET_US = 60_000
+IMPORT_RUNS = 5
+
+LAZY_DEPENDENCIES = [
+    "aiohttp",
+    "aiofiles",
+    "appdirs",
+    "async_timeout",
+    "async_upnp_client",
+    "deprecated",
+]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Runs a fresh interpreter able to import linkplay."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+@pytest.mark.parametrize(
+    "module", ["linkplay.bridge", "linkplay.controller", "linkplay.discovery"]
+)
+def test_import_defers_dependencies(module: str):
+    """Tests if importing the module does not load the lazily imported dependencies."""
+    result = _run_python(
+        "-c", f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    )
+    loaded = set(result.stdout.split())
+
+    assert not [dependency for dependency in LAZY_DEPENDENCIES if dependency in loaded]
+
+
+def _linkplay_import_time() -> int:
+    """Returns the time spent importing the linkplay modules of linkplay.bridge."""
+    result = _run_python("-X", "importtime", "-c", "import linkplay.bridge")
+
+    linkplay_self_time = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, module = line[len("import time:") :].split("|")
+        if module.strip().startswith("linkplay"):
+            linkplay_self_time += int(self_time)
+    return linkplay_self_time
+
+
+def test_import_time_budget():
+    """Tests if `python -X importtime -c 'import linkplay.bridge'` stays within budget.
+
+    The fastest of several imports is measured, the others are slowed down by
+    whatever else runs on the machine."""
+    linkplay_self_time = min(_linkplay_import_time() for _ in range(IMPORT_RUNS))
+
+    assert 0 < linkplay_self_time < LINKPLAY_IMPORT_BUDGET_US
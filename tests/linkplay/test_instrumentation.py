@@ -0,0 +1,161 @@
+"""Test request instrumentation."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from linkplay.consts import LinkPlayCommand
+from linkplay.endpoint import LinkPlayApiEndpoint
+from linkplay.exceptions import (
+    LinkPlayCircuitOpenException,
+    LinkPlayRequestException,
+    LinkPlayRequestRejectedException,
+    LinkPlayRequestTimeoutException,
+)
+from linkplay.instrumentation import (
+    LinkPlayInstrumentation,
+    LinkPlayRequestEvent,
+    LinkPlayRequestMetrics,
+    LinkPlayRequestStats,
+    get_command_name,
+)
+from linkplay.resilience import LinkPlayRetryPolicy
+
+
+def _endpoint(session, instrumentation: LinkPlayInstrumentation) -> LinkPlayApiEndpoint:
+    return LinkPlayApiEndpoint(
+        protocol="http",
+        port=80,
+        endpoint="1.2.3.4",
+        session=session,
+        retry_policy=LinkPlayRetryPolicy(attempts=1),
+        instrumentation=instrumentation,
+    )
+
+
+def _session(status: int, text: str) -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.text = AsyncMock(return_value=text)
+    session = MagicMock()
+    session.get = AsyncMock(return_value=response)
+    return session
+
+
+def _event(
+    latency: float, exception: type[BaseException] | None = None
+) -> LinkPlayRequestEvent:
+    event = LinkPlayRequestEvent(LinkPlayCommand.PLAYER_STATUS, "http://1.2.3.4")
+    event.latency = latency
+    event.exception = exception
+    return event
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (LinkPlayCommand.PLAYER_STATUS, LinkPlayCommand.PLAYER_STATUS),
+        (LinkPlayCommand.PAUSE, LinkPlayCommand.PAUSE),
+        (LinkPlayCommand.VOLUME.format(20), LinkPlayCommand.VOLUME),
+        (LinkPlayCommand.PLAY_PRESET.format(3), LinkPlayCommand.PLAY_PRESET),
+        ("unknownCommand", "unknownCommand"),
+    ],
+)
+def test_get_command_name(command: str, expected: str):
+    """Tests if formatted commands are grouped by their template."""
+    assert get_command_name(command) == expected
+
+
+async def test_instrumentation_reports_request():
+    """Tests if the hooks receive the details of a request."""
+    instrumentation = LinkPlayInstrumentation()
+    started: list[LinkPlayRequestEvent] = []
+    ended: list[LinkPlayRequestEvent] = []
+    instrumentation.add_request_start_hook(started.append)
+    instrumentation.add_request_end_hook(ended.append)
+
+    endpoint = _endpoint(_session(200, '{"vol": "20"}'), instrumentation)
+    await endpoint.json_request(LinkPlayCommand.PLAYER_STATUS)
+
+    assert started == ended
+    event = ended[0]
+    assert event.command == LinkPlayCommand.PLAYER_STATUS
+    assert event.endpoint == "http://1.2.3.4"
+    assert event.status == 200
+    assert event.bytes == 13
+    assert event.latency > 0
+    assert event.exception is None
+
+
+async def test_instrumentation_reports_failed_request():
+    """Tests if the hooks receive the exception class of a failed request."""
+    instrumentation = LinkPlayInstrumentation()
+    ended: list[LinkPlayRequestEvent] = []
+    instrumentation.add_request_end_hook(ended.append)
+
+    endpoint = _endpoint(_session(500, ""), instrumentation)
+    with pytest.raises(LinkPlayRequestException):
+        await endpoint.request(LinkPlayCommand.PAUSE)
+
+    assert ended[0].status == 500
+    assert ended[0].exception is LinkPlayRequestRejectedException
+
+
+async def test_instrumentation_disabled_without_hooks():
+    """Tests if requests are not wrapped once all hooks are removed."""
+    instrumentation = LinkPlayInstrumentation()
+    hook = MagicMock()
+    remove = instrumentation.add_request_end_hook(hook)
+    assert instrumentation.enabled
+
+    remove()
+    assert not instrumentation.enabled
+
+    instrumentation.instrument = AsyncMock()
+    endpoint = _endpoint(_session(200, "OK"), instrumentation)
+    await endpoint.request(LinkPlayCommand.PAUSE)
+
+    instrumentation.instrument.assert_not_called()
+    hook.assert_not_called()
+
+
+async def test_instrumentation_ignores_failing_hook():
+    """Tests if a failing hook does not fail the request."""
+    instrumentation = LinkPlayInstrumentation()
+    instrumentation.add_request_end_hook(MagicMock(side_effect=ValueError))
+
+    endpoint = _endpoint(_session(200, "OK"), instrumentation)
+    await endpoint.request(LinkPlayCommand.PAUSE)
+
+
+def test_request_metrics_percentiles_and_errors():
+    """Tests if the metrics count latencies, errors and timeouts."""
+    metrics = LinkPlayRequestMetrics()
+    for latency in range(1, 101):
+        metrics.observe(_event(latency / 1000))
+    metrics.observe(_event(3, LinkPlayRequestTimeoutException))
+    metrics.observe(_event(0, LinkPlayCircuitOpenException))
+
+    assert metrics.count == 101
+    assert metrics.errors == 2
+    assert metrics.timeouts == 1
+    assert metrics.percentile(0.5) == 0.051
+    assert metrics.percentile(0.99) == 0.1
+    assert metrics.bucket_counts[-1] == 0
+    assert sum(metrics.bucket_counts) == 101
+
+
+def test_request_stats_per_command_and_endpoint():
+    """Tests if the stats group requests per command and per endpoint."""
+    stats = LinkPlayRequestStats()
+    for endpoint, latency in (("http://1.2.3.4", 0.01), ("http://1.2.3.5", 0.5)):
+        event = LinkPlayRequestEvent(LinkPlayCommand.VOLUME.format(20), endpoint)
+        event.latency = latency
+        stats(event)
+
+    assert list(stats.commands) == [LinkPlayCommand.VOLUME]
+    assert stats.commands[LinkPlayCommand.VOLUME].count == 2
+    assert stats.slowest_endpoints() == [
+        ("http://1.2.3.5", 0.5),
+        ("http://1.2.3.4", 0.01),
+    ]
+    assert stats.to_dict()["endpoints"]["http://1.2.3.4"]["p99"] == 0.01
@@ -0,0 +1,149 @@
+"""Test the OpenMetrics exporter."""
+
+from contextlib import aclosing
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiohttp import ClientSession
+from linkplay.bridge import LinkPlayBridge
+from linkplay.consts import (
+    DeviceAttribute,
+    LinkPlayCommand,
+    PlayerAttribute,
+    TimedOperation,
+)
+from linkplay.controller import LinkPlayController
+from linkplay.exceptions import LinkPlayRequestTimeoutException
+from linkplay.instrumentation import LinkPlayInstrumentation, LinkPlayRequestEvent
+from linkplay.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    LinkPlayMetrics,
+    start_metrics_server,
+)
+
+
+def _bridge(uuid: str, rssi: str) -> MagicMock:
+    bridge = MagicMock()
+    bridge.device.uuid = uuid
+    bridge.device.name = f"Speaker {uuid}"
+    bridge.device.properties = {
+        DeviceAttribute.RSSI: rssi,
+        DeviceAttribute.WLAN_SNR: "30",
+        DeviceAttribute.WLAN_DATA_RATE: "",
+    }
+    return bridge
+
+
+def _metrics() -> LinkPlayMetrics:
+    instrumentation = LinkPlayInstrumentation()
+    leader, follower = _bridge("1", "-50"), _bridge("2", "-70")
+    multiroom = MagicMock()
+    multiroom.leader = leader
+    multiroom.followers = [follower]
+    controller = MagicMock()
+    controller.bridges = [leader, follower]
+    controller.multirooms = [multiroom]
+    metrics = LinkPlayMetrics(controller, instrumentation)
+
+    for latency, exception in ((0.02, None), (3.0, LinkPlayRequestTimeoutException)):
+        event = LinkPlayRequestEvent(LinkPlayCommand.PLAYER_STATUS, "http://1.2.3.4")
+        event.latency = latency
+        event.exception = exception
+        instrumentation._call_hooks(instrumentation.end_hooks, event)
+    return metrics
+
+
+def test_metrics_render():
+    """Tests if the metrics are rendered in the OpenMetrics text format."""
+    metrics = _metrics()
+    with metrics.time_poll_cycle():
+        pass
+    lines = metrics.render().splitlines()
+
+    assert lines[-1] == "# EOF"
+    assert (
+        'linkplay_request_duration_seconds_bucket{endpoint="http://1.2.3.4",le="0.025"} 1'
+        in lines
+    )
+    assert (
+        'linkplay_request_duration_seconds_bucket{endpoint="http://1.2.3.4",le="+Inf"} 2'
+        in lines
+    )
+    assert (
+        'linkplay_request_duration_seconds_count{endpoint="http://1.2.3.4"} 2' in lines
+    )
+    assert 'linkplay_request_errors_total{endpoint="http://1.2.3.4"} 1' in lines
+    assert 'linkplay_request_timeouts_total{endpoint="http://1.2.3.4"} 1' in lines
+    assert "linkplay_poll_cycle_duration_seconds_count 1" in lines
+    assert "linkplay_discovery_duration_seconds_count 0" in lines
+    assert "linkplay_multiroom_groups 1" in lines
+    assert 'linkplay_multiroom_followers{leader="1"} 1' in lines
+    assert 'linkplay_device_rssi_dbm{uuid="2",name="Speaker 2"} -70.0' in lines
+    assert 'linkplay_device_wlan_snr_db{uuid="1",name="Speaker 1"} 30.0' in lines
+    assert not [line for line in lines if line.startswith("linkplay_device_wlan_data")]
+
+
+def test_metrics_close_stops_collecting():
+    """Tests if closing the metrics removes the request hook."""
+    instrumentation = LinkPlayInstrumentation()
+    metrics = LinkPlayMetrics(instrumentation=instrumentation)
+    assert instrumentation.enabled
+
+    metrics.close()
+    assert not instrumentation.enabled
+
+
+def test_metrics_record_reported_durations():
+    """Tests if the durations reported to the instrumentation are collected."""
+    instrumentation = LinkPlayInstrumentation()
+    metrics = LinkPlayMetrics(instrumentation=instrumentation)
+
+    with instrumentation.measure(TimedOperation.POLL_CYCLE):
+        pass
+    with instrumentation.measure(TimedOperation.DISCOVERY):
+        pass
+    metrics.close()
+    with instrumentation.measure(TimedOperation.POLL_CYCLE):
+        pass
+
+    assert metrics.poll_cycles.count == 1
+    assert metrics.discoveries.count == 1
+    assert not instrumentation.duration_hooks
+
+
+async def test_metrics_measure_the_library_polls_and_discoveries():
+    """Tests if the poller and the controller discovery are measured by default."""
+    metrics = LinkPlayMetrics()
+    endpoint = AsyncMock()
+    endpoint.json_request.return_value = {PlayerAttribute.VOLUME: "10"}
+    controller = LinkPlayController(MagicMock(spec=ClientSession))
+    controller.bridges = [LinkPlayBridge(endpoint=endpoint)]
+    try:
+        async with aclosing(controller.watch_all(interval=0.01)) as stream:
+            await anext(stream)
+        with patch(
+            "linkplay.controller.discover_linkplay_bridges",
+            new=AsyncMock(return_value=[]),
+        ):
+            await controller.discover_bridges()
+    finally:
+        metrics.close()
+
+    assert metrics.poll_cycles.count >= 1
+    assert metrics.discoveries.count == 1
+
+
+async def test_metrics_server_is_scraped():
+    """Tests if a scraper can read the metrics from the metrics endpoint."""
+    metrics = _metrics()
+    runner = await start_metrics_server(metrics, port=0)
+    try:
+        host, port = runner.addresses[0][:2]
+        async with ClientSession() as session:
+            async with session.get(f"http://{host}:{port}/metrics") as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"] == OPENMETRICS_CONTENT_TYPE
+                body = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert body == metrics.render()
@@ -0,0 +1,78 @@
+"""Test the JSON response parser."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from linkplay.parsing import LinkPlayJsonParser, parse_batch
+
+
+def test_parse_batch() -> None:
+    """Tests if a batch decodes its valid texts and marks the invalid ones."""
+    assert parse_batch(['{"a": "1"}', "Failed", "[1]"]) == [{"a": "1"}, None, [1]]
+
+
+async def test_parser_disabled_decodes_right_away() -> None:
+    """Tests if a disabled parser decodes without batching."""
+    parser = LinkPlayJsonParser()
+
+    assert await parser.loads('{"status": "ok"}') == {"status": "ok"}
+    assert parser.pending == []
+    with pytest.raises(json.JSONDecodeError):
+        await parser.loads("Failed")
+
+
+async def test_parser_batches_below_threshold_on_the_loop() -> None:
+    """Tests if a small batch is decoded without the executor."""
+    parser = LinkPlayJsonParser()
+    parser.enable(threshold=10)
+
+    with patch.object(asyncio.get_running_loop(), "run_in_executor") as run_in_executor:
+        results = await asyncio.gather(
+            *(parser.loads(f'{{"volume": "{value}"}}') for value in range(3))
+        )
+
+    run_in_executor.assert_not_called()
+    assert results == [{"volume": str(value)} for value in range(3)]
+
+
+async def test_parser_offloads_large_batches() -> None:
+    """Tests if a batch reaching the threshold is decoded in the executor."""
+    parser = LinkPlayJsonParser()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        parser.enable(threshold=3, executor=executor)
+        loop = asyncio.get_running_loop()
+        with patch.object(
+            loop, "run_in_executor", wraps=loop.run_in_executor
+        ) as run_in_executor:
+            results = await asyncio.gather(
+                parser.loads('{"a": "1"}'),
+                parser.loads("null"),
+                parser.loads("Failed"),
+                return_exceptions=True,
+            )
+
+    run_in_executor.assert_called_once_with(
+        executor, parse_batch, ['{"a": "1"}', "null", "Failed"]
+    )
+    assert results[0] == {"a": "1"}
+    assert results[1] is None
+    assert isinstance(results[2], json.JSONDecodeError)
+
+
+async def test_parser_decodes_on_the_loop_when_the_executor_fails() -> None:
+    """Tests if the responses are still decoded when the offloading fails."""
+    parser = LinkPlayJsonParser()
+    parser.enable(threshold=1)
+
+    async def fail() -> None:
+        raise RuntimeError("Executor shut down")
+
+    with patch.object(
+        asyncio.get_running_loop(),
+        "run_in_executor",
+        side_effect=lambda *args: asyncio.ensure_future(fail()),
+    ):
+        assert await parser.loads('{"a": "1"}') == {"a": "1"}
@@ -0,0 +1,108 @@
+"""Test the state change recorder."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from linkplay.bridge import LinkPlayBridge
+from linkplay.consts import DeviceAttribute, PlayerAttribute
+from linkplay.exceptions import LinkPlayException
+from linkplay.recorder import DEVICE, PLAYER, LinkPlayRecord, LinkPlayRecorder
+
+
+def test_recorder_query_and_replay(tmp_path):
+    """Tests if records are queried by range and replayed across blocks."""
+    path = str(tmp_path / "state.log")
+    with LinkPlayRecorder(path, block_records=2) as recorder:
+        recorder.record("a", PLAYER, {"vol": "10", "Title": "One"}, timestamp=1)
+        recorder.record("b", PLAYER, {"vol": "20"}, timestamp=2)
+        recorder.record("a", PLAYER, {"vol": "30"}, timestamp=3)
+        recorder.record("a", PLAYER, {"Title": ""}, timestamp=4)
+        recorder.record("a", DEVICE, {"RSSI": "-50"}, timestamp=5)
+
+        assert recorder.pending == [LinkPlayRecord(5, "a", DEVICE, {"RSSI": "-50"})]
+        assert [record.timestamp for record in recorder.query(2, 4)] == [2, 3, 4]
+        assert recorder.replay("a", PLAYER, until=3) == {"vol": "30", "Title": "One"}
+
+    with LinkPlayRecorder(path) as recorder:
+        assert [record.timestamp for record in recorder.query(uuid="a")] == [
+            1,
+            3,
+            4,
+            5,
+        ]
+        assert recorder.replay("a", PLAYER) == {"vol": "30"}
+        assert recorder.replay("a", DEVICE) == {"RSSI": "-50"}
+        assert list(recorder.query(start=6)) == []
+
+
+def test_recorder_ignores_truncated_block(tmp_path):
+    """Tests if a block truncated by an interrupted write is ignored."""
+    path = tmp_path / "state.log"
+    with LinkPlayRecorder(str(path)) as recorder:
+        recorder.record("a", PLAYER, {"vol": "10"}, timestamp=1)
+        recorder.flush()
+        recorder.record("a", PLAYER, {"vol": "20"}, timestamp=2)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with LinkPlayRecorder(str(path)) as recorder:
+        assert recorder.replay("a", PLAYER) == {"vol": "10"}
+
+
+def test_recorder_appends_after_truncated_block(tmp_path):
+    """Tests if blocks appended after a truncated one can be read back."""
+    path = tmp_path / "state.log"
+    with LinkPlayRecorder(str(path), block_records=1) as recorder:
+        recorder.record("a", PLAYER, {"vol": "10"}, timestamp=1)
+        recorder.record("a", PLAYER, {"vol": "20"}, timestamp=2)
+    path.write_bytes(path.read_bytes()[:-5])
+
+    with LinkPlayRecorder(str(path), block_records=1) as recorder:
+        recorder.record("a", PLAYER, {"vol": "30"}, timestamp=3)
+        recorder.record("a", PLAYER, {"Title": "One"}, timestamp=4)
+
+    with LinkPlayRecorder(str(path)) as recorder:
+        assert [record.timestamp for record in recorder.query()] == [1, 3, 4]
+        assert recorder.replay("a", PLAYER) == {"vol": "30", "Title": "One"}
+
+
+def test_recorder_rejects_other_files(tmp_path):
+    """Tests if a file which is not a log is rejected."""
+    path = tmp_path / "other.log"
+    path.write_bytes(b"something else")
+
+    with pytest.raises(LinkPlayException):
+        LinkPlayRecorder(str(path))
+
+
+async def test_recorder_attach(tmp_path):
+    """Tests if the recorder records the changes of an attached bridge."""
+    endpoint = AsyncMock()
+    bridge = LinkPlayBridge(endpoint=endpoint)
+    endpoint.json_request.return_value = {DeviceAttribute.UUID: "uuid"}
+    await bridge.device.update_status()
+
+    with LinkPlayRecorder(str(tmp_path / "state.log")) as recorder:
+        detach = recorder.attach(bridge)
+        endpoint.json_request.return_value = {PlayerAttribute.VOLUME: "42"}
+        await bridge.player.update_status()
+        await bridge.player.update_status()
+        detach()
+        endpoint.json_request.return_value = {PlayerAttribute.VOLUME: "43"}
+        await bridge.player.update_status()
+
+        assert len(list(recorder.query())) == 1
+        assert recorder.replay("uuid", PLAYER)["vol"] == "42"
+
+
+async def test_recorder_attach_before_first_update(tmp_path):
+    """Tests if the records of a bridge attached before its first update are
+    stored under its uuid."""
+    endpoint = AsyncMock()
+    bridge = LinkPlayBridge(endpoint=endpoint)
+
+    with LinkPlayRecorder(str(tmp_path / "state.log")) as recorder:
+        recorder.attach(bridge)
+        endpoint.json_request.return_value = {DeviceAttribute.UUID: "uuid"}
+        await bridge.device.update_status()
+
+        assert [record.uuid for record in recorder.query()] == ["uuid"]
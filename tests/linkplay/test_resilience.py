@@ -0,0 +1,200 @@
+"""Test retry, circuit breaker and timeout policies."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from linkplay.consts import CommandClass, LinkPlayCommand
+from linkplay.exceptions import (
+    LinkPlayCircuitOpenException,
+    LinkPlayInvalidDataException,
+    LinkPlayRequestException,
+    LinkPlayRequestRejectedException,
+    LinkPlayRequestTimeoutException,
+)
+from linkplay.resilience import (
+    CircuitState,
+    LinkPlayAdaptiveTimeouts,
+    LinkPlayCircuitBreaker,
+    LinkPlayRetryPolicy,
+    call_with_policies,
+    get_command_class,
+    is_idempotent_command,
+)
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (LinkPlayCommand.PLAYER_STATUS, True),
+        (LinkPlayCommand.VOLUME.format(20), True),
+        (LinkPlayCommand.SEEK.format(20), True),
+        (LinkPlayCommand.REBOOT, False),
+        (LinkPlayCommand.NEXT, False),
+        (LinkPlayCommand.TOGGLE, False),
+        (LinkPlayCommand.PLAY.format("http://test"), False),
+    ],
+)
+def test_is_idempotent_command(command: str, expected: bool):
+    """Tests if commands are correctly classified as idempotent."""
+    assert is_idempotent_command(command) == expected
+
+
+def test_retry_policy_delay_is_bounded():
+    """Tests if the backoff delay never exceeds the maximum backoff."""
+    policy = LinkPlayRetryPolicy(backoff=1, max_backoff=3)
+
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= 3
+
+
+def test_circuit_breaker_opens_after_threshold():
+    """Tests if the circuit opens after consecutive failures and fails fast."""
+    breaker = LinkPlayCircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(LinkPlayCircuitOpenException):
+        breaker.before_request()
+
+
+def test_circuit_breaker_probes_after_reset_timeout():
+    """Tests if a single probe is let through after the reset timeout."""
+    breaker = LinkPlayCircuitBreaker(failure_threshold=1, reset_timeout=30)
+
+    with patch("linkplay.resilience.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+
+    with patch("linkplay.resilience.time.monotonic", return_value=131.0):
+        breaker.before_request()
+        assert breaker.state == CircuitState.HALF_OPEN
+        with pytest.raises(LinkPlayCircuitOpenException):
+            breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_request()
+
+
+async def test_call_with_policies_retries_idempotent_command():
+    """Tests if a failed idempotent command is retried."""
+    call = AsyncMock(side_effect=[LinkPlayRequestException("Timeout"), {"ok": "1"}])
+
+    result = await call_with_policies(
+        LinkPlayCommand.PLAYER_STATUS,
+        call,
+        LinkPlayRetryPolicy(backoff=0),
+        LinkPlayCircuitBreaker(),
+        LinkPlayAdaptiveTimeouts(),
+    )
+
+    assert result == {"ok": "1"}
+    assert call.call_count == 2
+
+
+async def test_call_with_policies_does_not_retry_non_idempotent_command():
+    """Tests if a failed non idempotent command is not sent again."""
+    call = AsyncMock(side_effect=LinkPlayRequestException("Timeout"))
+
+    with pytest.raises(LinkPlayRequestException):
+        await call_with_policies(
+            LinkPlayCommand.REBOOT,
+            call,
+            LinkPlayRetryPolicy(backoff=0),
+            LinkPlayCircuitBreaker(),
+            LinkPlayAdaptiveTimeouts(),
+        )
+
+    assert call.call_count == 1
+
+
+async def test_call_with_policies_invalid_data_closes_circuit():
+    """Tests if invalid data counts as the endpoint being reachable."""
+    breaker = LinkPlayCircuitBreaker()
+    breaker.record_failure()
+    call = AsyncMock(side_effect=LinkPlayInvalidDataException(data="Failed"))
+
+    with pytest.raises(LinkPlayInvalidDataException):
+        await call_with_policies(
+            LinkPlayCommand.META_INFO,
+            call,
+            LinkPlayRetryPolicy(),
+            breaker,
+            LinkPlayAdaptiveTimeouts(),
+        )
+
+    assert breaker.failures == 0
+
+
+async def test_call_with_policies_rejected_request_keeps_circuit_closed():
+    """Tests if a device rejecting commands is neither retried nor seen as down."""
+    breaker = LinkPlayCircuitBreaker(failure_threshold=3)
+    call = AsyncMock(side_effect=LinkPlayRequestRejectedException("Not OK"))
+
+    for _ in range(3):
+        with pytest.raises(LinkPlayRequestRejectedException):
+            await call_with_policies(
+                LinkPlayCommand.VOLUME.format(20),
+                call,
+                LinkPlayRetryPolicy(attempts=3, backoff=0),
+                breaker,
+                LinkPlayAdaptiveTimeouts(),
+            )
+
+    assert call.await_count == 3
+    assert breaker.failures == 0
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (LinkPlayCommand.PLAYER_STATUS, CommandClass.STATUS),
+        (LinkPlayCommand.META_INFO, CommandClass.STATUS),
+        (LinkPlayCommand.VOLUME.format(20), CommandClass.CONTROL),
+        (LinkPlayCommand.REBOOT, CommandClass.SLOW),
+        (LinkPlayCommand.MULTIROOM_JOIN.format("1.2.3.4"), CommandClass.SLOW),
+    ],
+)
+def test_get_command_class(command: str, expected: CommandClass):
+    """Tests if commands are correctly classified."""
+    assert get_command_class(command) == expected
+
+
+def test_adaptive_timeouts_follow_latency():
+    """Tests if the timeout adapts to the observed latencies within its bounds."""
+    timeouts = LinkPlayAdaptiveTimeouts()
+    assert timeouts.timeout(CommandClass.STATUS) == 3
+
+    for _ in range(20):
+        timeouts.record(CommandClass.STATUS, 0.2)
+    assert timeouts.timeout(CommandClass.STATUS) == pytest.approx(0.8)
+
+    for _ in range(20):
+        timeouts.record(CommandClass.STATUS, 0.01)
+    assert timeouts.timeout(CommandClass.STATUS) == pytest.approx(0.8)
+
+    for _ in range(50):
+        timeouts.record(CommandClass.STATUS, 0.01)
+    assert timeouts.timeout(CommandClass.STATUS) == 0.3
+    assert timeouts.timeout(CommandClass.SLOW) == 30
+
+
+async def test_call_with_policies_passes_adaptive_timeout():
+    """Tests if requests are called with the timeout of their command class."""
+    timeouts = LinkPlayAdaptiveTimeouts()
+    call = AsyncMock(side_effect=[LinkPlayRequestTimeoutException("Timeout"), {}])
+
+    await call_with_policies(
+        LinkPlayCommand.PLAYER_STATUS,
+        call,
+        LinkPlayRetryPolicy(backoff=0),
+        LinkPlayCircuitBreaker(),
+        timeouts,
+    )
+
+    call.assert_called_with(3)
+    assert timeouts.latencies[CommandClass.STATUS][0] == 3
+    assert len(timeouts.latencies[CommandClass.STATUS]) == 2
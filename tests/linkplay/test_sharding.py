@@ -0,0 +1,139 @@
+"""Test the sharded controller."""
+
+import asyncio
+import multiprocessing
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from linkplay.consts import PlayerAttribute
+from linkplay.exceptions import LinkPlayShardException
+from linkplay.sharding import LinkPlayShardedController, ShardStrategy, _ShardWorker
+from linkplay.simulator import LinkPlaySimulator
+
+
+def test_select_shard_hash_is_stable():
+    """Tests if the hash strategy always assigns a host to the same shard."""
+    controller = LinkPlayShardedController(shards=4)
+
+    assert controller.select_shard("10.0.0.1") is controller.select_shard("10.0.0.1")
+    assert len({controller.select_shard(f"10.0.0.{i}") for i in range(64)}) == 4
+
+
+def test_select_shard_subnet():
+    """Tests if the subnet strategy keeps a /24 subnet on one shard."""
+    controller = LinkPlayShardedController(shards=4, strategy=ShardStrategy.SUBNET)
+
+    shard = controller.select_shard("192.168.1.10")
+    assert controller.select_shard("192.168.1.200") is shard
+    assert controller.select_shard("speaker.local") is not None
+
+
+def test_select_shard_site():
+    """Tests if the site strategy keeps sites together and spreads them."""
+    controller = LinkPlayShardedController(shards=2, strategy=ShardStrategy.SITE)
+
+    first = controller.select_shard("10.0.0.1", "paris")
+    second = controller.select_shard("10.0.0.2", "london")
+
+    assert controller.select_shard("10.0.9.9", "paris") is first
+    assert first is not second
+
+
+async def test_command_to_unknown_bridge():
+    """Tests if a command to an unknown bridge raises."""
+    controller = LinkPlayShardedController(shards=1)
+
+    with pytest.raises(LinkPlayShardException):
+        await controller.command("unknown", "player", "pause")
+
+
+def test_failing_listener_does_not_stop_the_others():
+    """Tests if a listener raising does not prevent the state updates."""
+    controller = LinkPlayShardedController(shards=1)
+    listener = Mock()
+    controller.add_listener(Mock(side_effect=RuntimeError))
+    controller.add_listener(listener)
+
+    controller._on_state("1234", {"device": {}, "player": {}})
+
+    listener.assert_called_once_with("1234", {"device": {}, "player": {}})
+    assert "1234" in controller.states
+
+
+async def test_worker_handles_requests_in_tracked_tasks():
+    """Tests if the worker keeps its request tasks and sends their result."""
+    connection, worker_connection = multiprocessing.Pipe()
+    worker = _ShardWorker(worker_connection)
+    try:
+        connection.send((1, "stop_polling", ()))
+        worker._receive()
+        assert len(worker.tasks) == 1
+
+        await asyncio.gather(*worker.tasks)
+        assert not worker.tasks
+        assert await asyncio.to_thread(connection.recv) == (1, "result", None)
+    finally:
+        worker.writer.close()
+        connection.close()
+        worker_connection.close()
+
+
+async def test_worker_polling_survives_errors():
+    """Tests if the worker keeps polling after an unexpected error."""
+    _, worker_connection = multiprocessing.Pipe()
+    worker = _ShardWorker(worker_connection)
+    worker.op_poll = AsyncMock(side_effect=[RuntimeError("Session is closed"), 0, 0])
+    try:
+        await worker.op_start_polling(0)
+        while worker.op_poll.await_count < 3:
+            await asyncio.sleep(0)
+        await worker.op_stop_polling()
+    finally:
+        worker.writer.close()
+        worker_connection.close()
+
+
+async def test_worker_closes_removed_bridges():
+    """Tests if the worker cancels the background work of a removed bridge."""
+    _, worker_connection = multiprocessing.Pipe()
+    worker = _ShardWorker(worker_connection)
+    bridge = Mock()
+    worker.bridges["1234"] = bridge
+    try:
+        await worker.op_remove_bridge("1234")
+        await worker.op_remove_bridge("1234")
+    finally:
+        worker.writer.close()
+        worker_connection.close()
+
+    bridge.close.assert_called_once_with()
+    assert not worker.bridges
+
+
+async def test_sharded_controller():
+    """Tests if bridges are added, polled and commanded across shard processes."""
+    simulator = LinkPlaySimulator(seed=1)
+    simulator.add_devices(4)
+    updates: list[str] = []
+
+    async with simulator, LinkPlayShardedController(shards=2) as controller:
+        controller.add_listener(lambda uuid, state: updates.append(uuid))
+        uuids = [
+            await controller.add_bridge(device.host, port=device.port)
+            for device in simulator.devices
+        ]
+        assert uuids == [device.uuid for device in simulator.devices]
+        assert sum(len(shard.bridges) for shard in controller.shards) == 4
+
+        assert await controller.poll() == 0
+        state = await controller.command(uuids[0], "player", "set_volume", 42)
+
+        assert state["player"][PlayerAttribute.VOLUME] == "42"
+        assert controller.states[uuids[0]] == state
+        assert simulator.devices[0].player_status[PlayerAttribute.VOLUME] == "42"
+        assert set(updates) == set(uuids)
+
+        await controller.remove_bridge(uuids[0])
+        assert uuids[0] not in controller.states
+        with pytest.raises(LinkPlayShardException):
+            await controller.command(uuids[0], "player", "pause")
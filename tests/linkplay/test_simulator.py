@@ -0,0 +1,111 @@
+"""Test the simulated LinkPlay devices."""
+
+import pytest
+from aiohttp import ClientSession
+from linkplay.consts import LinkPlayCommand, PlayerAttribute, PlayingStatus
+from linkplay.controller import LinkPlayController
+from linkplay.exceptions import LinkPlayRequestException
+from linkplay.resilience import LinkPlayRetryPolicy
+from linkplay.simulator import LinkPlaySimulator
+
+
+async def test_simulator_serves_bridges():
+    """Tests if bridges can be created and controlled on simulated devices."""
+    simulator = LinkPlaySimulator(seed=1)
+    simulator.add_devices(3)
+
+    async with simulator, ClientSession() as session:
+        bridges = await simulator.bridges(session)
+
+        assert [bridge.device.uuid for bridge in bridges] == [
+            device.uuid for device in simulator.devices
+        ]
+        assert bridges[1].player.title == "Track 1"
+
+        await bridges[0].player.set_volume(42)
+        await bridges[0].player.resume()
+        await bridges[0].player.update_status()
+
+    assert bridges[0].player.volume == 42
+    assert bridges[0].player.status == PlayingStatus.PLAYING
+    assert simulator.devices[0].requests[LinkPlayCommand.VOLUME] == 1
+
+
+async def test_simulator_multiroom_topology():
+    """Tests if the controller discovers and changes simulated multiroom groups."""
+    simulator = LinkPlaySimulator(seed=1)
+    leader, follower, other = simulator.add_devices(3)
+    simulator.group(leader, [follower])
+
+    async with simulator, ClientSession() as session:
+        controller = LinkPlayController(session)
+        for bridge in await simulator.bridges(session):
+            await controller.add_bridge(bridge)
+
+        await controller.discover_multirooms()
+        assert len(controller.multirooms) == 1
+        multiroom = controller.multirooms[0]
+        assert [bridge.device.uuid for bridge in multiroom.followers] == [follower.uuid]
+
+        await multiroom.add_follower(controller.bridges[2])
+        assert other.leader is leader
+
+        await multiroom.ungroup()
+        await controller.discover_multirooms()
+
+    assert controller.multirooms == []
+    assert leader.followers == []
+
+
+async def test_simulator_follower_state_from_leader():
+    """Tests if followers get their player state from the leader's responses."""
+    simulator = LinkPlaySimulator(seed=1)
+    leader, follower = simulator.add_devices(2)
+    simulator.group(leader, [follower])
+    follower.player_status[PlayerAttribute.VOLUME] = "17"
+
+    async with simulator, ClientSession() as session:
+        controller = LinkPlayController(session)
+        for bridge in await simulator.bridges(session):
+            await controller.add_bridge(bridge)
+        leader_bridge, follower_bridge = controller.bridges
+        await controller.discover_multirooms()
+
+        assert follower_bridge.player.volume == 17
+        assert follower_bridge.player.title == leader_bridge.player.title
+        assert not follower_bridge.player.update_due
+        assert leader_bridge.player.update_due
+
+        await leader_bridge.player.resume()
+        await leader_bridge.player.update_status()
+
+    assert follower_bridge.player.status == PlayingStatus.PLAYING
+    assert follower.requests[LinkPlayCommand.PLAYER_STATUS] == 1
+
+
+async def test_simulator_failure_rate():
+    """Tests if simulated devices fail requests at the configured rate."""
+    simulator = LinkPlaySimulator(seed=1)
+    device = simulator.add_device(failure_rate=1)
+
+    async with simulator, ClientSession() as session:
+        endpoint = simulator.endpoint(
+            device, session, retry_policy=LinkPlayRetryPolicy(attempts=1)
+        )
+        with pytest.raises(LinkPlayRequestException):
+            await endpoint.json_request(LinkPlayCommand.PLAYER_STATUS)
+
+
+async def test_simulator_tcpuart():
+    """Tests if simulated devices answer TCPUART frames."""
+    simulator = LinkPlaySimulator(seed=1)
+    device = simulator.add_device(tcpuart=True)
+
+    async with simulator:
+        endpoint = await simulator.tcpuart_endpoint(device)
+        response = await endpoint.json_request(LinkPlayCommand.MULTIROOM_LIST)
+        await endpoint.request(LinkPlayCommand.PAUSE)
+        endpoint._connection[1].close()
+
+    assert response == {"slaves": 0, "slave_list": []}
+    assert device.requests[LinkPlayCommand.PAUSE] == 1
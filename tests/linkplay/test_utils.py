@@ -1,7 +1,35 @@
 """Test utility functions."""
 
-from linkplay.consts import PlayerAttribute, PlayingStatus
-from linkplay.utils import decode_hexstr, fixup_player_properties
+import json
+import os
+import ssl
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import web
+from linkplay.consts import (
+    CONNECTOR_KEEPALIVE_TIMEOUT,
+    MTLS_CERTIFICATE_CONTENTS,
+    STATUS_COMMANDS,
+    WATCH_INTERVAL,
+    LinkPlayCommand,
+    PlayerAttribute,
+    PlayingStatus,
+)
+from linkplay.parsing import PARSER
+from linkplay.utils import (
+    LinkPlayConnectionStats,
+    _load_cert_chain_from_memory,
+    async_create_unverified_client_session,
+    async_create_unverified_context,
+    compact_properties,
+    create_linkplay_connector,
+    decode_hexstr,
+    deep_sizeof,
+    fixup_player_properties,
+    get_unverified_context,
+    session_call_api_json,
+    session_call_api_ok,
+)
 
 
 def test_decode_hexstr():
@@ -38,3 +66,133 @@ def test_fixup_player_properties_fixes_playing_status():
     fixed_dict: dict[PlayerAttribute, str] = fixup_player_properties(test_dict)
 
     assert fixed_dict[PlayerAttribute.PLAYING_STATUS] == PlayingStatus.STOPPED
+
+
+def test_fixup_player_properties_reuses_decode_cache():
+    """Tests if unchanged hex strings are not decoded again."""
+    decode_cache: dict[PlayerAttribute, tuple[str, str]] = {}
+    fixup_player_properties({PlayerAttribute.TITLE: "556E6B6E6F776E"}, decode_cache)
+
+    with patch("linkplay.utils.cached_decode_hexstr") as decode_mock:
+        fixed_dict = fixup_player_properties(
+            {PlayerAttribute.TITLE: "556E6B6E6F776E"}, decode_cache
+        )
+
+    assert fixed_dict[PlayerAttribute.TITLE] == "Unknown"
+    assert decode_mock.call_count == 0
+
+
+def test_fixup_player_properties_decodes_changed_value():
+    """Tests if a changed hex string replaces the cached value."""
+    decode_cache: dict[PlayerAttribute, tuple[str, str]] = {}
+    fixup_player_properties({PlayerAttribute.TITLE: "556E6B6E6F776E"}, decode_cache)
+
+    fixed_dict = fixup_player_properties(
+        {PlayerAttribute.TITLE: "54657374"}, decode_cache
+    )
+
+    assert fixed_dict[PlayerAttribute.TITLE] == "Test"
+    assert decode_cache[PlayerAttribute.TITLE] == ("54657374", "Test")
+
+
+async def test_async_create_unverified_client_session_records_connection_reuse():
+    """Tests if the session reuses connections and records it in the stats."""
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text="OK")
+
+    app = web.Application()
+    app.router.add_get("/httpapi.asp", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    stats = LinkPlayConnectionStats()
+    try:
+        async with await async_create_unverified_client_session(stats) as session:
+            for _ in range(3):
+                await session_call_api_ok(f"http://127.0.0.1:{port}", session, "reboot")
+    finally:
+        await runner.cleanup()
+
+    assert stats.requests == 3
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 2
+
+
+async def test_create_linkplay_connector_keeps_connections_between_polls():
+    """Tests if idle connections outlive the poll interval."""
+    context = await async_create_unverified_context()
+
+    connector = create_linkplay_connector(context)
+    assert connector._keepalive_timeout == CONNECTOR_KEEPALIVE_TIMEOUT
+    assert connector._keepalive_timeout > WATCH_INTERVAL
+    await connector.close()
+
+    connector = create_linkplay_connector(context, poll_interval=60)
+    assert connector._keepalive_timeout == 120
+    await connector.close()
+
+
+async def test_async_create_unverified_context_is_cached():
+    """Tests if the SSL context is built once and shared."""
+    context = await async_create_unverified_context()
+
+    assert context is get_unverified_context()
+    assert context.verify_mode == ssl.CERT_NONE
+
+
+def test_load_cert_chain_from_memory_without_memfd(monkeypatch):
+    """Tests if the certificate chain loads on platforms without memfd_create."""
+    monkeypatch.delattr(os, "memfd_create", raising=False)
+    sslcontext = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+
+    _load_cert_chain_from_memory(sslcontext, MTLS_CERTIFICATE_CONTENTS)
+
+
+def test_compact_properties_interns_keys_and_given_values():
+    """Tests if keys and low cardinality values are shared between devices."""
+    payload = '{"firmware": "4.6.415145", "ssid": "", "RSSI": "-50"}'
+    first = compact_properties(json.loads(payload), {"firmware"})
+    second = compact_properties(json.loads(payload), {"firmware"})
+
+    assert first == {"firmware": "4.6.415145", "ssid": "", "RSSI": "-50"}
+    assert next(iter(first)) is next(iter(second))
+    assert first["firmware"] is second["firmware"]
+    assert first["RSSI"] is not second["RSSI"]
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    """Tests if objects shared between containers are counted once per seen set."""
+    shared = "x" * 1000
+    seen: set[int] = set()
+
+    first = deep_sizeof({"value": shared}, seen)
+    second = deep_sizeof({"value": shared}, seen)
+
+    assert first > 1000
+    assert second < 1000
+
+
+async def test_session_call_api_json_batches_status_commands_only() -> None:
+    """Tests if only the answers to the status commands go through the parser."""
+    assert LinkPlayCommand.WIIM_EQ_LOAD not in STATUS_COMMANDS
+
+    with (
+        patch(
+            "linkplay.utils.session_call_api",
+            new=AsyncMock(return_value='{"status": "OK"}'),
+        ),
+        patch.object(PARSER, "loads", wraps=PARSER.loads) as loads,
+    ):
+        await session_call_api_json(
+            "http://1.2.3.4", None, f"{LinkPlayCommand.WIIM_EQ_LOAD}:Flat"
+        )
+        loads.assert_not_called()
+
+        assert await session_call_api_json(
+            "http://1.2.3.4", None, LinkPlayCommand.PLAYER_STATUS
+        ) == {"status": "OK"}
+        loads.assert_called_once_with('{"status": "OK"}')
@@ -0,0 +1,150 @@
+"""Test the shared player state streams."""
+
+import asyncio
+from contextlib import aclosing
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientSession
+from linkplay.bridge import LinkPlayBridge
+from linkplay.consts import PlayerAttribute
+from linkplay.controller import LinkPlayController
+from linkplay.exceptions import (
+    LinkPlayRequestCancelledException,
+    LinkPlayRequestException,
+)
+from linkplay.watch import LinkPlaySubscription
+
+
+def _bridge(volumes: list[str]) -> LinkPlayBridge:
+    endpoint = AsyncMock()
+    endpoint.json_request.side_effect = [
+        {PlayerAttribute.VOLUME: volume} for volume in volumes
+    ]
+    return LinkPlayBridge(endpoint=endpoint)
+
+
+async def test_subscription_keeps_latest_state():
+    """Tests if a subscription only keeps the latest state of every player."""
+    subscription = LinkPlaySubscription()
+    first, second = MagicMock(), MagicMock()
+
+    subscription.push(first, {PlayerAttribute.VOLUME: "1"})
+    subscription.push(second, {PlayerAttribute.VOLUME: "2"})
+    subscription.push(first, {PlayerAttribute.VOLUME: "3"})
+
+    assert await subscription.get() == (second, {PlayerAttribute.VOLUME: "2"})
+    assert await subscription.get() == (first, {PlayerAttribute.VOLUME: "3"})
+    assert not subscription.states
+
+
+async def test_watch_yields_changed_states():
+    """Tests if watch only yields changed states and stops polling when closed."""
+    bridge = _bridge(["10", "10", "20", "30"])
+    volumes = []
+
+    async with aclosing(bridge.player.watch(interval=0)) as states:
+        async for state in states:
+            volumes.append(state[PlayerAttribute.VOLUME])
+            if len(volumes) == 3:
+                break
+
+    assert volumes == ["10", "20", "30"]
+    assert bridge.player.poller.task is None
+    assert not bridge.player.listeners
+
+
+async def test_watch_shares_polling():
+    """Tests if several consumers of a player share one poller."""
+    bridge = _bridge(["10", "20"] + ["20"] * 100)
+    bridge.player.properties = {PlayerAttribute.VOLUME: "5"}
+    bridge.player.status_timestamp = 0
+
+    async def consume() -> list[str]:
+        volumes = []
+        async with aclosing(bridge.player.watch(interval=0.01)) as states:
+            async for state in states:
+                volumes.append(state[PlayerAttribute.VOLUME])
+                if len(volumes) == 3:
+                    return volumes
+        return volumes
+
+    assert await asyncio.gather(consume(), consume()) == [["5", "10", "20"]] * 2
+    assert bridge.player.poller.task is None
+    assert bridge.endpoint.json_request.await_count == 2
+
+
+async def test_watch_survives_failed_polls():
+    """Tests if a failed poll does not end the stream."""
+    endpoint = AsyncMock()
+    endpoint.json_request.side_effect = [
+        LinkPlayRequestException("down"),
+        RuntimeError("Session is closed"),
+        {PlayerAttribute.VOLUME: "10"},
+    ]
+    bridge = LinkPlayBridge(endpoint=endpoint)
+
+    async with aclosing(bridge.player.watch(interval=0)) as states:
+        assert (await anext(states))[PlayerAttribute.VOLUME] == "10"
+
+
+async def test_watch_closed_during_a_request_stops_polling():
+    """Tests if closing a watch while a request is in flight ends its poller."""
+    started = asyncio.Event()
+    calls = 0
+
+    async def json_request(command: str) -> dict[str, str]:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError as error:
+                raise LinkPlayRequestCancelledException("Cancelled") from error
+        return {PlayerAttribute.VOLUME: str(calls)}
+
+    bridge = LinkPlayBridge(endpoint=AsyncMock())
+    bridge.endpoint.json_request.side_effect = json_request
+
+    async with aclosing(bridge.player.watch(interval=0)) as states:
+        await anext(states)
+        await started.wait()
+        first = bridge.player.poller.task
+    await asyncio.wait([first], timeout=1)
+    assert first.cancelled()
+
+    async with aclosing(bridge.player.watch(interval=0)) as states:
+        assert (await anext(states))[PlayerAttribute.VOLUME] == "1"
+        second = bridge.player.poller.task
+        assert (await anext(states))[PlayerAttribute.VOLUME] == "3"
+    await asyncio.wait([second], timeout=1)
+
+    assert second.cancelled()
+    assert bridge.player.poller.task is None
+
+
+async def test_watch_yields_copies_of_the_properties():
+    """Tests if the yielded states are not changed by later updates."""
+    bridge = _bridge(["10"] + ["10"] * 100)
+
+    async with aclosing(bridge.player.watch(interval=0.01)) as states:
+        state = await anext(states)
+        bridge.player.properties[PlayerAttribute.VOLUME] = "50"
+
+    assert state is not bridge.player.properties
+    assert state[PlayerAttribute.VOLUME] == "10"
+
+
+async def test_controller_watch_all():
+    """Tests if the controller yields the changed states of all bridges."""
+    controller = LinkPlayController(MagicMock(spec=ClientSession))
+    controller.bridges = [_bridge(["10"] * 100), _bridge(["20"] * 100)]
+    states = {}
+
+    async with aclosing(controller.watch_all(interval=0.01)) as stream:
+        async for bridge, state in stream:
+            states[bridge] = state[PlayerAttribute.VOLUME]
+            if len(states) == 2:
+                break
+
+    assert states == dict(zip(controller.bridges, ["10", "20"], strict=True))